@@ -0,0 +1,93 @@
+"""
+Accuracy and speed of the binned FFT kde of pandas-plots against seaborn's kde.
+
+seaborn (`histplot(kde=True)`, violins) evaluates scipy's gaussian_kde at every grid point for every value,
+O(n * grid). `helper._kde_binned` splits the values onto an even grid and smooths it with one FFT
+convolution, O(n + grid log grid). Both use Scott's bandwidth and the data range as support (cut=0),
+seaborn gets the same grid size (seaborn's own default is 200 points, it takes 200/512 of the time shown).
+
+The error is the largest difference of the densities on the shared grid, relative to the peak density.
+With `--check`, the script exits with 1 if any error is above `--max-error`.
+
+usage:
+    python benchmarks/bench_kde.py
+    python benchmarks/bench_kde.py --rows 10_000 100_000 1_000_000 --report bench_kde.json --check
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+from seaborn._statistics import KDE
+
+from pandas_plots.helper import KDE_GRID, _kde_binned
+
+# * name -> sample of n values
+DATA = {
+    "normal": lambda rng, n: rng.normal(10, 3, n),
+    "bimodal": lambda rng, n: np.concatenate([rng.normal(0, 1, n // 2), rng.normal(6, 0.5, n - n // 2)]),
+    "lognormal": lambda rng, n: rng.lognormal(0, 0.75, n),
+    "rounded": lambda rng, n: np.round(rng.exponential(2, n), 1),
+}
+
+
+def _timed(func):
+    start = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - start
+
+
+def bench(rows: list[int], max_seaborn_rows: int) -> list[dict]:
+    rng = np.random.default_rng(0)
+    results = []
+    for n in rows:
+        for name, make in DATA.items():
+            values = make(rng, n)
+            (coords, density), t_binned = _timed(lambda: _kde_binned(values))
+            result = {"data": name, "rows": n, "binned_s": t_binned, "seaborn_s": None, "error": None}
+            if n <= max_seaborn_rows:
+                (sb_density, _), t_seaborn = _timed(lambda: KDE(cut=0, gridsize=KDE_GRID)(values))
+                result["seaborn_s"] = t_seaborn
+                result["error"] = float(np.abs(density - sb_density).max() / sb_density.max())
+            results.append(result)
+            print(f"🧮 {name:<10} {n:>12_} {_fmt(result)}")
+    return results
+
+
+def _fmt(result: dict) -> str:
+    if result["seaborn_s"] is None:
+        return f"binned {result['binned_s']:8.3f}s | seaborn skipped"
+    speedup = result["seaborn_s"] / result["binned_s"]
+    return (
+        f"binned {result['binned_s']:8.3f}s | seaborn {result['seaborn_s']:8.3f}s | "
+        f"{speedup:8.1f}x faster | max error {result['error']:.2e} of peak"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare the binned FFT kde with seaborn's kde")
+    parser.add_argument("--rows", type=int, nargs="*", default=[10_000, 100_000, 1_000_000], help="Sample sizes")
+    parser.add_argument("--max-seaborn-rows", type=int, default=1_000_000, help="Skip seaborn above this size (default: 1_000_000)")
+    parser.add_argument("--report", default="bench_kde.json", help="Path of the json report (default: bench_kde.json)")
+    parser.add_argument("--max-error", type=float, default=1e-2, help="Largest error relative to the peak for --check")
+    parser.add_argument("--check", action="store_true", help="Exit with 1 if any error exceeds --max-error")
+    args = parser.parse_args()
+
+    results = bench(args.rows, args.max_seaborn_rows)
+    Path(args.report).write_text(json.dumps({"results": results}, indent=2))
+    print(f"💾 report: {args.report}")
+
+    if args.check:
+        violations = [r for r in results if r["error"] is not None and r["error"] > args.max_error]
+        for r in violations:
+            print(f"❌ {r['data']} with {r['rows']:_} rows is off by {r['error']:.2e} of the peak")
+        if violations:
+            sys.exit(1)
+        print(f"✅ all errors within {args.max_error:.0e} of the peak")
+
+
+if __name__ == "__main__":
+    main()
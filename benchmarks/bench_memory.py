@@ -0,0 +1,166 @@
+"""
+Peak memory benchmark for the input path of pandas-plots.
+
+Each function gets the 2-4 columns it works on, projected from a shared frame without copying.
+The peak allocation during the call (tracemalloc, covers numpy and python objects) is put in relation
+to the size of these projected columns. Every full copy of the input adds 1.0 to the ratio.
+The input is hashed before and after each call, functions must not mutate the caller's data.
+
+With `--check`, the ratios are compared against the budget file and the script exits with 1
+if any entry is over budget or mutated its input.
+
+usage:
+    python benchmarks/bench_memory.py
+    python benchmarks/bench_memory.py --rows 2_000_000 --report bench_memory.json --check
+    python benchmarks/bench_memory.py --cow --check
+"""
+
+import argparse
+import contextlib
+import gc
+import io
+import json
+import os
+import sys
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+HERE = Path(__file__).parent
+
+# * name -> (needed columns, call), the call gets `fn` and the projected frame `df` as positional args
+CALLS = {
+    "pls.plot_bars": (["cat", "cnt"], lambda fn, df: fn(df)),
+    "pls.plot_stacked_bars": (["cat", "col", "cnt"], lambda fn, df: fn(df)),
+    "pls.plot_facet_stacked_bars": (["cat", "col", "facet", "cnt"], lambda fn, df: fn(df)),
+    "pls.plot_boxes": (["cat", "num"], lambda fn, df: fn(df, plot=False, summary=False)),
+    "pls.plot_boxes_large": (["cat", "num"], lambda fn, df: fn(df, plot=False, summary=False)),
+    "pls.plot_quadrants": (["flag1", "flag2"], lambda fn, df: fn(df)),
+    "tbl.pivot_df": (["cat", "col", "cnt"], lambda fn, df: fn(df)),
+    "tbl.describe_df": (["cat", "col", "num", "cnt"], lambda fn, df: fn(df, use_plot=False)),
+    "tbl.print_summary": (["num", "num2"], lambda fn, df: fn(df)),
+    "hlp.get_sparse_df": (["col", "num"], lambda fn, df: fn(df)),
+}
+
+
+def make_frame(rows: int) -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    return pd.DataFrame(
+        {
+            "cat": rng.choice(np.array(["a", "b", "c", "d", None], dtype=object), rows),
+            "col": rng.choice(np.array(["x", "y", "z"], dtype=object), rows),
+            "facet": rng.choice(np.array(["f1", "f2"], dtype=object), rows),
+            "flag1": rng.choice(np.array(["yes", "no"], dtype=object), rows),
+            "flag2": rng.choice(np.array(["yes", "no"], dtype=object), rows),
+            "cnt": rng.integers(1, 10, rows),
+            "num": rng.normal(10, 3, rows),
+            "num2": rng.normal(5, 1, rows),
+        }
+    )
+
+
+def _hash(df: pd.DataFrame) -> int:
+    return int(pd.util.hash_pandas_object(df, index=True).sum())
+
+
+def _resolve(name: str):
+    import importlib
+
+    pkg, func = name.split(".")
+    return getattr(importlib.import_module(f"pandas_plots.{pkg}"), func)
+
+
+def bench(df: pd.DataFrame, names: list[str] = None) -> dict:
+    results = {}
+    for name, (columns, call) in CALLS.items():
+        if names and name not in names:
+            continue
+        fn = _resolve(name)
+        # * the projection is what the caller hands over, it shares the arrays of the full frame
+        data = pd.DataFrame({c: df[c] for c in columns}, copy=False)
+        # * shallow size: copying an object column costs its pointers, the strings are shared
+        projected = int(data.memory_usage(index=False).sum())
+        before = _hash(data)
+
+        # * warm-up: imports and caches must not count
+        with contextlib.redirect_stdout(io.StringIO()):
+            call(fn, data.head(1_000))
+        gc.collect()
+
+        tracemalloc.start()
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                call(fn, data)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        results[name] = {
+            "projected_mb": projected / 2**20,
+            "peak_mb": peak / 2**20,
+            "ratio": peak / projected,
+            "mutated": _hash(data) != before,
+        }
+        print(f"🧮 {name:<30} {_fmt(results[name])}")
+    return results
+
+
+def check_budget(report: dict, budget: dict) -> list[str]:
+    """Returns a list of violations. Entries without a budget fall back to the default."""
+    violations = []
+    default = budget.get("default")
+    for name, result in report["results"].items():
+        if result["mutated"]:
+            violations.append(f"{name} mutated its input")
+        limit = budget.get(name, default)
+        if limit is not None and result["ratio"] > limit:
+            violations.append(f"{name} peaked at {result['ratio']:.2f}x the projected columns, budget is {limit:.2f}x")
+    return violations
+
+
+def _fmt(result: dict) -> str:
+    mutated = " ❌ mutated input" if result["mutated"] else ""
+    return f"peak {result['peak_mb']:8.1f} MB / projected {result['projected_mb']:7.1f} MB = {result['ratio']:.2f}x{mutated}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure peak allocation of pandas-plots functions relative to their input columns")
+    parser.add_argument("--rows", type=int, default=1_000_000, help="Rows of the test frame (default: 1_000_000)")
+    parser.add_argument("--cow", action="store_true", help="Run with pandas copy-on-write enabled")
+    parser.add_argument("--report", default="bench_memory.json", help="Path of the json report (default: bench_memory.json)")
+    parser.add_argument("--budget", default=str(HERE / "memory_budget.json"), help="Path of the budget file")
+    parser.add_argument("--only", nargs="*", help="Restrict to these names, e.g. pls.plot_boxes")
+    parser.add_argument("--check", action="store_true", help="Exit with 1 if any entry exceeds the budget")
+    args = parser.parse_args()
+
+    os.environ["RENDERER"] = "json"
+    import matplotlib
+
+    matplotlib.use("Agg")
+    if args.cow:
+        pd.set_option("mode.copy_on_write", True)
+
+    df = make_frame(args.rows)
+    print(f"🟣 frame: {df.shape[0]:_} rows, {df.shape[1]} cols, {df.memory_usage().sum() / 2**20:.1f} MB")
+
+    report = {
+        "rows": args.rows,
+        "copy_on_write": args.cow,
+        "results": bench(df, args.only),
+    }
+    Path(args.report).write_text(json.dumps(report, indent=2))
+    print(f"💾 report: {args.report}")
+
+    if args.check:
+        violations = check_budget(report, json.loads(Path(args.budget).read_text()))
+        for v in violations:
+            print(f"❌ {v}")
+        if violations:
+            sys.exit(1)
+        print("✅ all entries within budget")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,289 @@
+"""
+Import-time and cold-start benchmark for pandas-plots.
+
+Every measurement runs in a fresh interpreter, so nothing is cached between samples:
+    - cold import cost of the package and its subpackages, broken down like `python -X importtime`
+    - first-call latency of each public function (lazy import of its backend + first call),
+      plus the plotly template and kaleido warm-up
+
+Results are written as json. With `--check`, the results are compared against the budget file
+and the script exits with 1 if any entry is over budget.
+
+usage:
+    python benchmarks/bench_startup.py
+    python benchmarks/bench_startup.py --repeat 5 --report bench_startup.json --check
+    python benchmarks/bench_startup.py --only-imports --check
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import textwrap
+from pathlib import Path
+
+HERE = Path(__file__).parent
+
+IMPORT_TARGETS = [
+    "pandas_plots",
+    "pandas_plots.pls",
+    "pandas_plots.tbl",
+    "pandas_plots.hlp",
+    "pandas_plots.cli.converter",
+]
+
+# * shared sample data for first-call runs, built before the clock starts
+SETUP = """
+import os, sys, time, tempfile
+os.environ["RENDERER"] = "json"
+os.chdir(tempfile.mkdtemp())
+import numpy as np
+import pandas as pd
+import matplotlib
+matplotlib.use("Agg")
+rng = np.random.default_rng(0)
+n = 5_000
+df = pd.DataFrame({
+    "cat": rng.choice(["a", "b", "c", None], n),
+    "col": rng.choice(["x", "y", "z"], n),
+    "facet": rng.choice(["f1", "f2"], n),
+    "cnt": rng.integers(1, 10, n),
+    "num": rng.normal(10, 3, n),
+    "num2": rng.normal(5, 1, n),
+})
+df_sankey = pd.DataFrame({
+    "id": rng.integers(0, 500, n).astype(str),
+    "date": pd.Timestamp("2020-01-01") + pd.to_timedelta(rng.integers(0, 900, n), unit="D"),
+    "event": rng.choice(["op", "st", "syst"], n),
+})
+"""
+
+# * name -> call, executed after `fn = <pkg>.<name>` has been resolved. covers every name of the `_FUNCTIONS`
+# * tables, functions that need the network, clinical tables or cli args (and classes) are only resolved
+RESOLVE_ONLY = "fn"
+FIRST_CALLS = {
+    "pls.plot_bars": "fn(df[['cat', 'cnt']])",
+    "pls.plot_stacked_bars": "fn(df[['cat', 'col', 'cnt']])",
+    "pls.plot_facet_stacked_bars": "fn(df[['cat', 'col', 'facet', 'cnt']])",
+    "pls.plot_histogram": "fn(df['num'])",
+    "pls.plot_histogram_large": "fn(df['num'])",
+    "pls.plot_box": "fn(df['num'])",
+    "pls.plot_box_large": "fn(df['num'])",
+    "pls.plot_boxes": "fn(df[['col', 'num']], summary=False)",
+    "pls.plot_boxes_large": "fn(df[['col', 'num']], summary=False)",
+    "pls.plot_joint": "fn(df[['num', 'num2']])",
+    "pls.plot_pie": "fn(df['col'])",
+    "pls.plot_quadrants": "fn(df[['cat', 'col']].dropna())",
+    "pls.plot_sankey": "fn(df_sankey)",
+    "pls.plot_upset": "fn(df[['cat', 'col']].isin(['a', 'x']))",
+    "pls.plot_uml_graph": "fn(df[['cat', 'col']].dropna().drop_duplicates())",
+    "pls.plot_venn2": "fn('t', set('abc'), 'a', set('bcd'), 'b')",
+    "pls.plot_venn3": "fn('t', set('abc'), 'a', set('bcd'), 'b', set('cde'), 'c')",
+    "pls.PlotData": RESOLVE_ONLY,
+    "tbl.describe_df": "fn(df, use_plot=True)",
+    "tbl.describe_db": "import duckdb; fn(duckdb.from_df(df))",
+    "tbl.print_summary": "fn(df)",
+    "tbl.pivot_df": "fn(df[['cat', 'col', 'cnt']])",
+    "tbl.show_num_df": "fn(df.pivot_table(index='cat', columns='col', values='cnt', aggfunc='sum'))",
+    "tbl.descr_db": "import duckdb; fn(duckdb.from_df(df))",
+    "hlp.mean_confidence_interval": "fn(df['num'])",
+    "hlp.to_series": "fn(df[['col', 'cnt']])",
+    "hlp.replace_delimiter_outside_quotes": "fn('a,\"b,c\",d')",
+    "hlp.wrap_text": "fn(list('abcdef'))",
+    "hlp.create_barcode_from_url": RESOLVE_ONLY,
+    "hlp.add_datetime_columns": "fn(df_sankey, 'date')",
+    "hlp.show_package_version": "fn()",
+    "hlp.OperatingSystem": RESOLVE_ONLY,
+    "hlp.get_os": "fn()",
+    "hlp.add_bitmask_label": "fn(df.assign(bits=df['cnt'] % 4), 'bits', ['a', 'b'])",
+    "hlp.find_cols": "fn(list(df.columns), ['num'])",
+    "hlp.add_measures_to_pyg_config": "open('pyg.json', 'w').write('{\"config\": [{}]}'); fn('pyg.json')",
+    "hlp.get_tum_details": RESOLVE_ONLY,
+    "hlp.get_sparse_df": "fn(df[['col', 'num']])",
+    "hlp.set_theme": "fn('dark')",
+    "hlp.set_cache": "fn(False)",
+    "hlp.get_duckdb_filter_n": "fn(show_filter=False)",
+    "hlp.print_filter": "fn('cnt > 5')",
+    "hlp.is_ipynb": "fn()",
+    "hlp.prepend_uv_header": "open('s.py', 'w').write(''); open('p.toml', 'w').write('[project]\\ndependencies = []'); fn('s.py', 'p.toml')",
+    "hlp.create_py_script": RESOLVE_ONLY,
+    "hlp.setup_rendering": "fn(static=False)",
+    "hlp.find_str_in_duckdb": "import duckdb; con = duckdb.connect(); con.sql('create table t as select * from df'); fn(con, 'a')",
+    "hlp.export_plot_data": "fn(df[['cat', 'col', 'cnt']])",
+}
+
+# * warm-up probes that are not bound to a single function
+WARMUPS = {
+    "warmup.plotly_template": "import plotly.io as pio; pio.templates[pio.templates.default]",
+    "warmup.kaleido": "import plotly.graph_objects as go; go.Figure(go.Bar(y=[1, 2])).write_image('probe.png')",
+}
+
+
+def _error(proc: subprocess.CompletedProcess) -> str:
+    lines = proc.stderr.strip().splitlines() or ["unknown error"]
+    return next((line for line in reversed(lines) if "Error" in line), lines[-1]).strip()
+
+
+def _run(code: str, args: list[str] = None, timeout: int = 300) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [sys.executable, *(args or []), "-c", code],
+        capture_output=True,
+        text=True,
+        timeout=timeout,
+        env={**os.environ, "PYTHONDONTWRITEBYTECODE": "1"},
+    )
+
+
+def _parse_importtime(stderr: str, module: str, top_n: int) -> dict:
+    """Parses `-X importtime` output into total time and the heaviest imports (in seconds)."""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cum_us, name = line[len("import time:") :].split("|")
+        rows.append((name.strip(), int(self_us), int(cum_us), len(name) - len(name.lstrip())))
+
+    total = next((cum for name, _, cum, _ in reversed(rows) if name == module), None)
+    heaviest = sorted(rows, key=lambda r: r[1], reverse=True)[:top_n]
+    return {
+        "total_s": None if total is None else total / 1e6,
+        "modules": len(rows),
+        "heaviest_self": [{"module": name, "self_s": s / 1e6, "cumulative_s": c / 1e6} for name, s, c, _ in heaviest],
+    }
+
+
+def bench_imports(repeat: int, top_n: int) -> dict:
+    results = {}
+    for module in IMPORT_TARGETS:
+        samples = []
+        for _ in range(repeat):
+            proc = _run(f"import {module}", args=["-X", "importtime"])
+            if proc.returncode != 0:
+                results[module] = {"error": _error(proc)}
+                break
+            samples.append(_parse_importtime(proc.stderr, module, top_n))
+        else:
+            totals = [s["total_s"] for s in samples]
+            results[module] = {
+                "median_s": statistics.median(totals),
+                "min_s": min(totals),
+                "modules": samples[0]["modules"],
+                "heaviest_self": samples[0]["heaviest_self"],
+            }
+        print(f"⏱️ import {module:<28} {_fmt(results[module])}")
+    return results
+
+
+def _first_call_code(name: str, call: str) -> str:
+    pkg, func = name.split(".")
+    return SETUP + textwrap.dedent(
+        f"""
+        import contextlib, io, json
+        t0 = time.perf_counter()
+        from pandas_plots import {pkg}
+        fn = {pkg}.{func}
+        t1 = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            {call}
+        t2 = time.perf_counter()
+        print(json.dumps({{"resolve_s": t1 - t0, "call_s": t2 - t1, "median_s": t2 - t0}}))
+        """
+    )
+
+
+def _warmup_code(code: str) -> str:
+    return SETUP + textwrap.dedent(
+        f"""
+        import json
+        t0 = time.perf_counter()
+        {code}
+        print(json.dumps({{"median_s": time.perf_counter() - t0}}))
+        """
+    )
+
+
+def bench_first_calls(repeat: int, names: list[str] = None) -> dict:
+    jobs = {**{k: _first_call_code(k, v) for k, v in FIRST_CALLS.items()}, **{k: _warmup_code(v) for k, v in WARMUPS.items()}}
+    results = {}
+    for name, code in jobs.items():
+        if names and name not in names:
+            continue
+        samples = []
+        for _ in range(repeat):
+            proc = _run(code)
+            if proc.returncode != 0:
+                results[name] = {"error": _error(proc)}
+                break
+            samples.append(json.loads(proc.stdout.strip().splitlines()[-1]))
+        else:
+            results[name] = {
+                key: statistics.median(s[key] for s in samples) for key in samples[0]
+            }
+        print(f"⏱️ first call {name:<36} {_fmt(results[name])}")
+    return results
+
+
+def check_budget(report: dict, budget: dict) -> list[str]:
+    """
+    Returns a list of violations. Entries without a budget fall back to the section default.
+    An entry that failed (e.g. a crashing import) is always a violation.
+    """
+    violations = []
+    for section in ("imports", "first_calls"):
+        limits = budget.get(section, {})
+        default = limits.get("default")
+        for name, result in report.get(section, {}).items():
+            if "error" in result:
+                violations.append(f"{section}: {name} failed: {result['error']}")
+                continue
+            limit = limits.get(name, default)
+            if limit is None:
+                continue
+            if result["median_s"] > limit:
+                violations.append(f"{section}: {name} took {result['median_s']:.3f}s, budget is {limit:.3f}s")
+    return violations
+
+
+def _fmt(result: dict) -> str:
+    if "error" in result:
+        return f"❌ {result['error']}"
+    return f"{result['median_s']:.3f}s"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure cold import and first-call latency of pandas-plots")
+    parser.add_argument("--repeat", type=int, default=3, help="Samples per entry, the median is reported (default: 3)")
+    parser.add_argument("--top", type=int, default=10, help="Number of heaviest imports to list per target (default: 10)")
+    parser.add_argument("--report", default="bench_startup.json", help="Path of the json report (default: bench_startup.json)")
+    parser.add_argument("--budget", default=str(HERE / "startup_budget.json"), help="Path of the budget file")
+    parser.add_argument("--only-imports", action="store_true", help="Skip the first-call benchmarks")
+    parser.add_argument("--only", nargs="*", help="Restrict first-call benchmarks to these names, e.g. pls.plot_bars")
+    parser.add_argument("--check", action="store_true", help="Exit with 1 if any entry exceeds the budget")
+    args = parser.parse_args()
+
+    report = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "repeat": args.repeat,
+        "imports": bench_imports(args.repeat, args.top),
+    }
+    if not args.only_imports:
+        report["first_calls"] = bench_first_calls(args.repeat, args.only)
+
+    Path(args.report).write_text(json.dumps(report, indent=2))
+    print(f"💾 report: {args.report}")
+
+    if args.check:
+        violations = check_budget(report, json.loads(Path(args.budget).read_text()))
+        for v in violations:
+            print(f"❌ {v}")
+        if violations:
+            sys.exit(1)
+        print("✅ all entries within budget")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""
+Scaling benchmark for the `workers=` option of `tbl.describe_df` and `tbl.print_summary` on wide frames.
+
+Each function runs on the same frame with 1, 2, 4, ... threads. The printed output of every run
+is compared to the serial run, it must not depend on the number of workers.
+Speedups depend on the share of work that releases the GIL (sorting, hashing, counting),
+on a single cpu there is none to gain.
+
+usage:
+    python benchmarks/bench_workers.py
+    python benchmarks/bench_workers.py --cols 1_000 --rows 50_000 --workers 1 2 4 8 --report bench_workers.json
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# * name -> call, gets the function and the frame
+CALLS = {
+    "tbl.describe_df": lambda fn, df, workers: fn(df, use_plot=False, workers=workers),
+    "tbl.print_summary": lambda fn, df, workers: fn(df, workers=workers),
+}
+
+
+def make_frame(rows: int, cols: int) -> pd.DataFrame:
+    """Mix of int, float, low cardinality str and bool columns."""
+    rng = np.random.default_rng(0)
+    labels = np.array([f"s{i}" for i in range(200)] + [None], dtype=object)
+    data = {}
+    for i in range(cols):
+        kind = i % 4
+        if kind == 0:
+            data[f"int_{i}"] = rng.integers(0, 1_000, rows)
+        elif kind == 1:
+            data[f"float_{i}"] = rng.normal(0, 1, rows)
+        elif kind == 2:
+            data[f"str_{i}"] = rng.choice(labels, rows)
+        else:
+            data[f"bool_{i}"] = rng.choice([True, False], rows)
+    return pd.DataFrame(data)
+
+
+def _resolve(name: str):
+    import importlib
+
+    pkg, func = name.split(".")
+    return getattr(importlib.import_module(f"pandas_plots.{pkg}"), func)
+
+
+def bench(df: pd.DataFrame, workers: list[int], repeat: int) -> dict:
+    results = {}
+    for name, call in CALLS.items():
+        fn = _resolve(name)
+        results[name] = {}
+        baseline = None
+        for n in workers:
+            times = []
+            for _ in range(repeat):
+                out = io.StringIO()
+                start = time.perf_counter()
+                with contextlib.redirect_stdout(out):
+                    call(fn, df, n)
+                times.append(time.perf_counter() - start)
+            baseline = out.getvalue() if baseline is None else baseline
+            results[name][n] = {
+                "seconds": min(times),
+                "same_output": out.getvalue() == baseline,
+            }
+        serial = results[name][workers[0]]["seconds"]
+        for n, result in results[name].items():
+            result["speedup"] = serial / result["seconds"]
+            same = "" if result["same_output"] else " ❌ output differs"
+            print(f"🧮 {name:<20} workers={n:<3} {result['seconds']:7.2f}s  x{result['speedup']:.2f}{same}")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure scaling of the column stats with workers= on a wide frame")
+    parser.add_argument("--rows", type=int, default=20_000, help="Rows of the test frame (default: 20_000)")
+    parser.add_argument("--cols", type=int, default=600, help="Columns of the test frame (default: 600)")
+    parser.add_argument("--workers", type=int, nargs="*", default=[1, 2, 4, 8], help="Thread counts, the first is the baseline")
+    parser.add_argument("--repeat", type=int, default=1, help="Runs per thread count, the fastest counts (default: 1)")
+    parser.add_argument("--report", default="bench_workers.json", help="Path of the json report (default: bench_workers.json)")
+    args = parser.parse_args()
+
+    os.environ["RENDERER"] = "json"
+    df = make_frame(args.rows, args.cols)
+    print(f"🟣 frame: {df.shape[0]:_} rows, {df.shape[1]} cols, {os.cpu_count()} cpus")
+
+    # * warm-up: imports must not count
+    with contextlib.redirect_stdout(io.StringIO()):
+        for name, call in CALLS.items():
+            call(_resolve(name), df.head(100), 1)
+
+    report = {
+        "rows": args.rows,
+        "cols": args.cols,
+        "cpus": os.cpu_count(),
+        "results": bench(df, args.workers, args.repeat),
+    }
+    Path(args.report).write_text(json.dumps(report, indent=2))
+    print(f"💾 report: {args.report}")
+    if not all(r["same_output"] for runs in report["results"].values() for r in runs.values()):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,19 @@
 """
 pandas-plots main module.
+
+Subpackages are cheap to import: they only hold a table of their functions, which are
+loaded (together with plotly, matplotlib, scipy, ...) on first use.
 """
 
 import os
 
 os.environ["BROWSER_PATH"] = "/Applications/Chromium.app/Contents/MacOS/Chromium"
 
-# Import modules
-from . import const, hlp, pls, tbl
+from .lazy import attach
 
 __all__ = ["const", "hlp", "pls", "tbl"]
+
+__getattr__, __dir__ = attach(__name__, submodules=__all__)
+
+# * hlp and pls register the chaining shims on pd.DataFrame, accessor adds df.pp / rel.pp
+from . import accessor, hlp, pls
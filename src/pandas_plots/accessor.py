@@ -0,0 +1,104 @@
+"""
+Chaining accessors for pandas-plots.
+
+    df.pp.plot_bars(...)        -> pls.plot_bars(df, ...)
+    df.pp.pivot(...)            -> tbl.pivot_df(df, ...)
+    ser.pp.plot_box(...)        -> pls.plot_box(ser, ...)
+    rel.pp.describe(...)        -> tbl.descr_db(rel, ...)  (duckdb relation)
+    rel.pp.profile(...)         -> tbl.describe_db(rel, ...)
+
+The target function (and its plotting backend) is only imported when the attribute is accessed.
+"""
+
+import functools
+import importlib
+
+import pandas as pd
+
+from .lazy import when_imported
+
+# * subpackage -> names that take the data object as first argument (pls.plot_venn* take sets)
+_TARGETS = {
+    "pls": [
+        "plot_bars",
+        "plot_stacked_bars",
+        "plot_facet_stacked_bars",
+        "plot_histogram",
+        "plot_histogram_large",
+        "plot_joint",
+        "plot_box",
+        "plot_box_large",
+        "plot_boxes",
+        "plot_boxes_large",
+        "plot_quadrants",
+        "plot_sankey",
+        "plot_pie",
+        "plot_upset",
+        "plot_uml_graph",
+    ],
+    "tbl": ["describe_df", "descr_db", "describe_db", "pivot_df", "print_summary", "show_num_df"],
+    "hlp": [
+        "to_series",
+        "add_bitmask_label",
+        "add_datetime_columns",
+        "find_cols",
+        "export_plot_data",
+        "get_sparse_df",
+        "mean_confidence_interval",
+    ],
+}
+_LOOKUP = {name: pkg for pkg, names in _TARGETS.items() for name in names}
+
+
+class _Accessor:
+    """Resolves `obj.pp.<name>` to the pandas-plots function of that name, bound to `obj`."""
+
+    # * short names, e.g. df.pp.pivot()
+    _aliases: dict[str, str] = {}
+
+    def __init__(self, obj):
+        self._obj = obj
+
+    def __getattr__(self, name: str):
+        target = self._aliases.get(name, name)
+        if target not in _LOOKUP:
+            raise AttributeError(f"'{type(self).__name__}' object has no attribute {name!r}")
+        func = getattr(importlib.import_module(f"pandas_plots.{_LOOKUP[target]}"), target)
+
+        @functools.wraps(func)
+        def bound(*args, **kwargs):
+            return func(self._obj, *args, **kwargs)
+
+        return bound
+
+    def __dir__(self):
+        return sorted({*_LOOKUP, *self._aliases})
+
+
+@pd.api.extensions.register_dataframe_accessor("pp")
+class DataFrameAccessor(_Accessor):
+    _aliases = {
+        "pivot": "pivot_df",
+        "describe": "describe_df",
+        "summary": "print_summary",
+        "show": "show_num_df",
+    }
+
+
+@pd.api.extensions.register_series_accessor("pp")
+class SeriesAccessor(_Accessor):
+    _aliases = {
+        "summary": "print_summary",
+    }
+
+
+class RelationAccessor(_Accessor):
+    _aliases = {
+        "describe": "descr_db",
+        "profile": "describe_db",
+    }
+
+
+# * duckdb has no accessor api, a property gives the same `rel.pp.<name>` syntax.
+# * it is set once duckdb is imported, importing pandas_plots does not load duckdb
+when_imported("duckdb", lambda ddb: setattr(ddb.DuckDBPyRelation, "pp", property(RelationAccessor)))
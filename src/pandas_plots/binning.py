@@ -0,0 +1,419 @@
+"""
+Histogram bins computed in python, the same bins plotly.js draws for `px.histogram`.
+
+plotly bins the raw values in the browser, so a histogram ships every value in the figure. Here the bins
+are found with the algorithm of plotly.js (`Axes.autoBin` for linear axes) and counted with numpy,
+the figure only needs one bar per bin.
+
+    start, size, n_bins = auto_bins(values, nbins=20)   # values of all traces of the bin group
+    counts = bin_counts(col_values, start, size, n_bins)
+    heights = normalize(counts, "percent", size)
+
+For data that does not fit into memory, the bins come from column stats and the counting runs in duckdb,
+in one scan for all columns. Only the counts per bin are fetched.
+
+    stats = db_column_stats(rel, ["a", "b"], precision=2)               # min/max pass
+    counts, bins, lower, upper = db_auto_bin_counts(rel, ["a", "b"], stats, nbins=20, precision=2)
+"""
+
+from __future__ import annotations
+
+import math
+from decimal import Decimal
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from .helper import _sql_name, _sql_round
+
+if TYPE_CHECKING:
+    import duckdb as ddb
+
+# * tolerance of plotly's findBin, values this close below an edge fall into the upper bin
+_BIN_ROUNDING = 1e-9
+# * nice bin sizes per decade (plotly's roundBase10)
+_ROUND_BASE10 = (2, 5, 10)
+# * max number of bins plotly draws
+MAX_BINS = 1_000_000
+# * max approx distinct values for which the smallest step is queried, the distinct values are sorted by duckdb
+STEP_MAX_DISTINCT = 1_000_000
+# * name of the relation in the smallest step query
+_VIEW = "__bins"
+
+
+def _js_str(x: float) -> str:
+    """Number to text like JavaScript's String(x): shortest round trip digits, exponent below 1e-6 and from 1e21."""
+    if x == 0 or not math.isfinite(x):
+        return "0" if x == 0 else str(x)
+    sign = "-" if x < 0 else ""
+    digits, exponent = Decimal(repr(abs(x))).normalize().as_tuple()[1:]
+    digits = "".join(map(str, digits))
+    k, n = len(digits), len(digits) + exponent
+    if k <= n <= 21:
+        return sign + digits + "0" * (n - k)
+    if 0 < n <= 21:
+        return sign + digits[:n] + "." + digits[n:]
+    if -6 < n <= 0:
+        return sign + "0." + "0" * -n + digits
+    mantissa = digits[0] + ("." + digits[1:] if k > 1 else "")
+    return f"{sign}{mantissa}e{'+' if n - 1 > 0 else '-'}{abs(n - 1)}"
+
+
+def _increment(value: float, step: float) -> float:
+    """value + step like plotly's Lib.increment, long float tails are cut to 12 significant digits."""
+    if not step:
+        return value
+    inv = 1 / abs(step)
+    result = (inv * value + inv * step) / inv if inv > 1 else value + step
+    length = len(_js_str(result))
+    if length > 16 and length >= len(_js_str(step)) + len(_js_str(value)):
+        # * toPrecision(12) keeps large numbers (exponent from 12) as they are
+        text = f"{result:.11e}"
+        if int(text.split("e")[1]) < 12:
+            result = float(text)
+    return result
+
+
+def _round_up(value: float, choices: tuple, reverse: bool = False) -> float:
+    """
+    Smallest of the sorted `choices` above `value`, ties go up (plotly's Lib.roundUp).
+    With `reverse`, the largest of the `choices` up to `value`.
+    """
+    low, high = 0, len(choices) - 1
+    while low < high:
+        mid = -(-(low + high) // 2) if reverse else (low + high) // 2
+        if choices[mid] <= value:
+            low = mid if reverse else mid + 1
+        else:
+            high = mid - 1 if reverse else mid
+    return choices[low]
+
+
+def _nice_size(rough: float) -> float:
+    """Bin size for a rough size, 2, 5 or 10 times a power of ten (plotly's autoTicks for linear axes)."""
+    base = math.pow(10, math.floor(math.log(rough) / math.log(10)))
+    size = base * _round_up(rough / base, _ROUND_BASE10)
+    return size or 1
+
+
+def _default_size(values: np.ndarray) -> float:
+    """Rough bin size without nbins: the smallest distinct step, at least 2 std / n**0.4 (plotly's default)."""
+    uniques = np.unique(values)
+    span = (uniques[-1] - uniques[0]) or 1
+    tolerance = span / (len(uniques) - 1 or 1) / 1e4
+    diffs = np.diff(uniques)
+    if (diffs > tolerance).all():
+        min_diff = min(span, diffs.min()) if len(diffs) else span
+    else:
+        # * values closer than the tolerance count as one, plotly chains them from the last kept value
+        min_diff, last = span, uniques[0]
+        for value in uniques[1:]:
+            if value - last > tolerance:
+                min_diff, last = min(min_diff, value - last), value
+    rough = max(_min_size(min_diff), 2 * values.std() / math.pow(len(values), 0.4))
+    return rough if math.isfinite(rough) else 1
+
+
+def _min_size(min_diff: float) -> float:
+    """Lower bound of the rough bin size, just below the smallest distinct step."""
+    scale = math.pow(10, math.floor(math.log(min_diff) / math.log(10)))
+    return scale * _round_up(min_diff / scale, (0.9, 1.9, 4.9, 9.9), reverse=True)
+
+
+def _shift_start(start: float, values: np.ndarray, size: float, lo: float, hi: float) -> float:
+    """Moves the first edge off the data: half a unit for integer data, half a bin if many values sit on edges."""
+
+    def near_edge(v):
+        return np.fmod(1 + (v - start) * 100 / size, 100) < 2
+
+    n = len(values)
+    if (np.fmod(values, 1) == 0).all():
+        if size < 1:
+            return lo - 0.5 * size
+        start -= 0.5
+        return start + size if start + size < lo else start
+    edges = np.count_nonzero(near_edge(values))
+    mids = np.count_nonzero(near_edge(values + size / 2))
+    if mids < n * 0.1 and (edges > n * 0.3 or near_edge(lo) or near_edge(hi)):
+        half = size / 2
+        return start + (half if start + half < lo else -half)
+    return start
+
+
+def auto_bins(values: np.ndarray, nbins: int = 0) -> tuple[float, float, int]:
+    """
+    Bins of a plotly histogram on a linear axis.
+
+    Args:
+        values (np.ndarray): Values without missing of all traces that share the bins (px: all columns).
+        nbins (int): Max number of bins like `nbins` of px.histogram, 0 lets plotly choose.
+
+    Returns:
+        tuple[float, float, int]: First edge, bin size and number of bins.
+    """
+    lo, hi = float(values.min()), float(values.max())
+    rough = (hi - lo) / nbins if nbins and hi > lo else _default_size(values)
+    size = _nice_size(rough)
+    start = _shift_start(_first_edge(lo, hi, size), values, size, lo, hi)
+    return start, size, _n_bins(start, size, hi)
+
+
+def _first_edge(lo: float, hi: float, size: float) -> float:
+    """First tick of the axis below the data, one bin further down."""
+    first = math.ceil((lo - (hi - lo) * 1e-4) / size) * size
+    return _increment(first, -size)
+
+
+def _n_bins(start: float, size: float, hi: float) -> int:
+    return min(1 + math.floor((hi - start) / size), MAX_BINS)
+
+
+def stats_bins(stats: dict[str, np.ndarray], nbins: int = 0, min_step: float = None) -> tuple[float, float, int]:
+    """
+    auto_bins() from the column stats of `db_column_stats`, all columns share the bins.
+
+    `min_step` is the smallest step between distinct values (`db_min_step`). If it is None, it is taken as 1
+    for integer data and ignored otherwise. There is no half bin shift for values on edges, see `db_auto_bin_counts`.
+    """
+    n = stats["count"].sum()
+    lo, hi = float(np.nanmin(stats["min"])), float(np.nanmax(stats["max"]))
+    integer = bool(stats["integer"].all())
+    if nbins and hi > lo:
+        rough = (hi - lo) / nbins
+    else:
+        # * pooled std of all columns, from count, mean and std per column
+        counts = stats["count"][stats["count"] > 0]
+        means, stds = stats["mean"][stats["count"] > 0], np.nan_to_num(stats["std"][stats["count"] > 0])
+        mean = (counts * means).sum() / n
+        var = ((counts - 1) * stds**2 + counts * (means - mean) ** 2).sum() / max(n - 1, 1)
+        rough = 2 * math.sqrt(var) / math.pow(n, 0.4)
+        if min_step is not None:
+            rough = max(rough, _min_size(min_step))
+        elif integer or hi == lo or not rough:
+            rough = max(rough, 0.9)
+    size = _nice_size(rough)
+    start = _first_edge(lo, hi, size)
+    if integer:
+        if size < 1:
+            start = lo - 0.5 * size
+        else:
+            start -= 0.5
+            start = start + size if start + size < lo else start
+    return start, size, _n_bins(start, size, hi)
+
+
+def bin_counts(values: np.ndarray, start: float, size: float, n_bins: int) -> np.ndarray:
+    """Number of values per bin, bins include their lower edge (plotly's findBin)."""
+    idx = np.floor((values - start) / size + _BIN_ROUNDING)
+    inside = (idx >= 0) & (idx < n_bins)
+    return np.bincount(idx[inside].astype(np.intp), minlength=n_bins)
+
+
+def normalize(counts: np.ndarray, histnorm: str | None, size: float) -> np.ndarray:
+    """Bar heights for plotly's `histnorm`: None (counts), "percent", "probability", "density", "probability density"."""
+    total = counts.sum()
+    if histnorm == "percent":
+        return counts * (100 / total)
+    if histnorm == "probability":
+        return counts / total
+    if histnorm == "density":
+        return counts * (1 / size)
+    if histnorm == "probability density":
+        return counts * (1 / size) / total
+    return counts
+
+
+def numpy_bins(stats: dict[str, np.ndarray], nbins: int = 0) -> tuple[float, float, int]:
+    """
+    Bins like np.histogram_bin_edges(bins=nbins or "auto") from the stats of `db_column_stats` (first column).
+    "auto" takes the smaller width of Freedman-Diaconis (from the approximate IQR) and Sturges.
+    """
+    n, lo, hi = stats["count"][0], stats["min"][0], stats["max"][0]
+    if nbins <= 0:
+        width = (hi - lo) / (math.log2(n) + 1)
+        fd = 2 * (stats["q75"][0] - stats["q25"][0]) * n ** (-1 / 3)
+        if fd > 0:
+            width = min(width, fd)
+        nbins = min(math.ceil((hi - lo) / width), MAX_BINS) if width else 1
+    if hi == lo:
+        lo, hi = lo - 0.5, hi + 0.5
+    return lo, (hi - lo) / nbins, nbins
+
+
+def _as_float(values) -> np.ndarray:
+    """Query results as float array, NULL becomes NaN."""
+    return np.array([np.nan if v is None else v for v in values], dtype=float)
+
+
+def _db_value(col: str, precision: int = None) -> str:
+    """Column as double, rounded to `precision` like the in memory values. NaN counts as missing, like in pandas."""
+    c = f"{_sql_name(col)}::DOUBLE"
+    if precision is not None:
+        c = _sql_round(c, precision)
+    return f"nullif({c}, 'NaN'::DOUBLE)"
+
+
+def db_column_stats(rel: ddb.DuckDBPyRelation, columns: list[str], precision: int = None) -> dict[str, np.ndarray]:
+    """
+    Stats per column from one scan: count, min, max, mean, std, q25, median, q75 (approx_quantile),
+    approx distinct count and whether all values are integers. Columns without values get NaN, "rows" is the number of rows.
+    """
+    exprs = ["count(*)"]
+    for col in columns:
+        c = _db_value(col, precision)
+        exprs += [
+            f"count({c})",
+            f"min({c})",
+            f"max({c})",
+            f"avg({c})",
+            f"stddev_samp({c})",
+            f"approx_quantile({c}, [0.25, 0.5, 0.75])",
+            f"coalesce(bool_and({c} = floor({c})), true)",
+            f"approx_count_distinct({c})",
+        ]
+    row = rel.aggregate(", ".join(exprs)).fetchone()
+    per_col = [row[1 + i * 8 : 1 + (i + 1) * 8] for i in range(len(columns))]
+    quartiles = [s[5] or [None] * 3 for s in per_col]
+    return {
+        "rows": row[0],
+        "count": np.array([s[0] for s in per_col], dtype=np.int64),
+        "min": _as_float(s[1] for s in per_col),
+        "max": _as_float(s[2] for s in per_col),
+        "mean": _as_float(s[3] for s in per_col),
+        "std": _as_float(s[4] for s in per_col),
+        "q25": _as_float(q[0] for q in quartiles),
+        "median": _as_float(q[1] for q in quartiles),
+        "q75": _as_float(q[2] for q in quartiles),
+        "integer": np.array([s[6] for s in per_col], dtype=bool),
+        "distinct": np.array([s[7] for s in per_col], dtype=np.int64),
+    }
+
+
+def db_min_step(rel: ddb.DuckDBPyRelation, columns: list[str], stats: dict[str, np.ndarray], precision: int = None) -> float | None:
+    """
+    Smallest step between the sorted distinct values of all columns, plotly's lower bound of the bin size.
+    None if there are more than `STEP_MAX_DISTINCT` distinct values (approx count of `db_column_stats`).
+
+    Steps up to plotly's tolerance (span / distinct values / 1e4) are skipped. plotly measures from the last
+    value it kept, so near duplicates can give it a slightly larger step than this one.
+    """
+    if stats["distinct"].sum() > STEP_MAX_DISTINCT:
+        return None
+    lo, hi = float(np.nanmin(stats["min"])), float(np.nanmax(stats["max"]))
+    span = (hi - lo) or 1
+    values = " UNION ALL ".join(f"SELECT {_db_value(col, precision)} AS v FROM {_VIEW}" for col in columns)
+    (step,) = rel.query(
+        _VIEW,
+        f"""
+        WITH v AS (SELECT DISTINCT v FROM ({values}) WHERE v IS NOT NULL),
+        d AS (SELECT v - lag(v) OVER (ORDER BY v) AS d, count(*) OVER () AS n FROM v)
+        SELECT min(d) FILTER (WHERE d > {span!r} / greatest(n - 1, 1) / 1e4) FROM d
+        """,
+    ).fetchone()
+    return span if step is None else min(span, step)
+
+
+def _db_bin_scan(
+    rel: ddb.DuckDBPyRelation,
+    columns: list[str],
+    start: float,
+    size: float,
+    n_bins: int,
+    precision: int = None,
+    stats: dict[str, np.ndarray] = None,
+    clip: bool = False,
+    extra: list[str] = (),
+) -> tuple[np.ndarray, np.ndarray, np.ndarray, tuple]:
+    """db_bin_counts() with `extra` aggregates in the same scan, their results are returned last."""
+    exprs = []
+    for i, col in enumerate(columns):
+        c = _db_value(col, precision)
+        idx = f"floor(({c} - {start!r}) / {size!r} + {_BIN_ROUNDING!r})::BIGINT"
+        if clip:
+            # * least() skips NULL, missing values must not land in the last bin
+            exprs.append(f"histogram(least({idx}, {n_bins - 1})) FILTER (WHERE {c} IS NOT NULL)")
+        else:
+            exprs.append(f"histogram({idx})")
+        if stats is not None and stats["count"][i]:
+            q1, q3 = stats["q25"][i], stats["q75"][i]
+            exprs += [f"min({c}) FILTER (WHERE {c} >= {2.5 * q1 - 1.5 * q3!r})", f"max({c}) FILTER (WHERE {c} <= {2.5 * q3 - 1.5 * q1!r})"]
+        else:
+            exprs += ["NULL", "NULL"]
+    row = rel.aggregate(", ".join(exprs + list(extra))).fetchone()
+
+    counts = np.zeros((len(columns), n_bins), dtype=np.int64)
+    for i in range(len(columns)):
+        hist = row[3 * i] or {}
+        keys = np.fromiter(hist.keys(), dtype=np.int64, count=len(hist))
+        inside = (keys >= 0) & (keys < n_bins)
+        counts[i, keys[inside]] = np.fromiter(hist.values(), dtype=np.int64, count=len(hist))[inside]
+    n_cols = 3 * len(columns)
+    return counts, _as_float(row[1:n_cols:3]), _as_float(row[2:n_cols:3]), row[n_cols:]
+
+
+def db_bin_counts(
+    rel: ddb.DuckDBPyRelation,
+    columns: list[str],
+    start: float,
+    size: float,
+    n_bins: int,
+    precision: int = None,
+    stats: dict[str, np.ndarray] = None,
+    clip: bool = False,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Counts per bin of all columns from one scan with duckdb's histogram(), bins like bin_counts().
+    With `clip`, values right of the last bin are counted in it (numpy's closed last bin).
+
+    With `stats` of db_column_stats, the same scan finds the whisker ends per column: the outermost values
+    within 1.5 IQR of the quartiles. Returns the counts (columns x bins) and the lower and upper whisker ends.
+    """
+    counts, lower, upper, _ = _db_bin_scan(rel, columns, start, size, n_bins, precision, stats, clip)
+    return counts, lower, upper
+
+
+def db_auto_bin_counts(
+    rel: ddb.DuckDBPyRelation,
+    columns: list[str],
+    stats: dict[str, np.ndarray],
+    nbins: int = 0,
+    precision: int = None,
+) -> tuple[np.ndarray, tuple[float, float, int], np.ndarray, np.ndarray]:
+    """
+    db_bin_counts() on the bins of stats_bins(), with plotly's half bin shift if many values sit on bin edges.
+    Unless the data are integers, the scan counts half bins and the values near bin edges and middles,
+    a bin of the (maybe shifted) bins then is the sum of two half bins.
+
+    Returns the counts (columns x bins), the bins (first edge, size, number) and the whisker ends.
+    """
+    if not stats["count"].any():
+        nan = np.full(len(columns), np.nan)
+        return np.zeros((len(columns), 0), dtype=np.int64), (0.0, 1.0, 0), nan, nan
+    start, size, n_bins = stats_bins(stats, nbins, None if nbins else db_min_step(rel, columns, stats, precision))
+    if stats["integer"].all():
+        counts, lower, upper, _ = _db_bin_scan(rel, columns, start, size, n_bins, precision, stats)
+        return counts, (start, size, n_bins), lower, upper
+
+    def near_edge(expr: str) -> str:
+        return f"count(*) FILTER (WHERE fmod(1 + ({expr} - {start!r}) * 100 / {size!r}, 100) < 2)"
+
+    half = size / 2
+    extra = []
+    for col in columns:
+        c = _db_value(col, precision)
+        extra += [near_edge(c), near_edge(f"{c} + {half!r}")]
+    halves, lower, upper, near = _db_bin_scan(rel, columns, start - half, half, 2 * n_bins + 2, precision, stats, extra=extra)
+
+    # * plotly's rule of _shift_start(), for the values of all columns
+    n, edges, mids = stats["count"].sum(), sum(near[0::2]), sum(near[1::2])
+    lo, hi = float(np.nanmin(stats["min"])), float(np.nanmax(stats["max"]))
+    on_edge = [math.fmod(1 + (v - start) * 100 / size, 100) < 2 for v in (lo, hi)]
+    shift = 0
+    if mids < n * 0.1 and (edges > n * 0.3 or any(on_edge)):
+        shift = 1 if start + half < lo else -1
+    start += shift * half
+    n_bins = _n_bins(start, size, hi)
+    # * bin k holds the half bins 2k + 1 + shift and 2k + 2 + shift
+    first = 1 + shift
+    counts = halves[:, first : first + 2 * n_bins : 2] + halves[:, first + 1 : first + 2 * n_bins : 2]
+    return counts, (start, size, n_bins), lower, upper
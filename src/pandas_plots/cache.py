@@ -0,0 +1,215 @@
+"""
+Opt-in cache for the aggregation stage of plot and table functions.
+
+Results are keyed by a content fingerprint of the input data plus the aggregation parameters,
+so repeated calls on the same data (other cosmetic flags, other theme, re-executed notebook) skip the groupby.
+
+Configured via env variables, so kernels started by the converter inherit the settings (see `hlp.set_cache()`):
+    `CACHE`:      "1" enables the cache
+    `CACHE_SIZE`: size cap of the in-memory LRU in MB (default 256)
+    `CACHE_DIR`:  if set, results are also stored there as parquet (+ json for the metadata)
+"""
+
+from __future__ import annotations
+
+import functools
+import hashlib
+import inspect
+import json
+import os
+from collections import OrderedDict
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import numpy as np
+import pandas as pd
+
+from .plot_data import PlotData
+
+if TYPE_CHECKING:
+    import duckdb as ddb
+
+DEFAULT_SIZE_MB = 256
+
+# * key -> (result, size in bytes), most recently used last
+_memory: OrderedDict = OrderedDict()
+_memory_bytes = 0
+
+
+def is_enabled() -> bool:
+    return os.getenv("CACHE") == "1"
+
+
+def clear() -> None:
+    """Empties the in-memory cache. Files in `CACHE_DIR` are kept."""
+    global _memory_bytes
+    _memory.clear()
+    _memory_bytes = 0
+
+
+def fingerprint(data: pd.DataFrame | pd.Series) -> str:
+    """
+    Hashes names, dtypes and values of all columns (not the index).
+    Values are hashed vectorized by pandas, the row hashes are folded into one digest.
+    """
+    if isinstance(data, pd.Series):
+        data = data.to_frame()
+    h = hashlib.blake2b(digest_size=16)
+    h.update(repr([(str(name), str(dtype)) for name, dtype in data.dtypes.items()]).encode())
+    h.update(str(len(data)).encode())
+    for name in data.columns:
+        h.update(pd.util.hash_pandas_object(data[name], index=False).to_numpy().tobytes())
+    return h.hexdigest()
+
+
+def cached(func=None, *, ignore: tuple = ()):
+    """
+    Decorator for compute stages that take the input data as first argument.
+    Other arguments make up the key, except the ones in `ignore` (e.g. a connection).
+    Only pandas inputs are cached, other inputs (e.g. duckdb relations) always run.
+    """
+    if func is None:
+        return functools.partial(cached, ignore=ignore)
+
+    data_arg = next(iter(inspect.signature(func).parameters))
+    kind = f"{func.__module__}.{func.__qualname__}"
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        data = args[0] if args else kwargs[data_arg]
+        if not is_enabled() or not isinstance(data, (pd.DataFrame, pd.Series)):
+            return func(*args, **kwargs)
+
+        params = {k: v for k, v in kwargs.items() if k != data_arg and k not in ignore}
+        key = hashlib.blake2b(
+            repr((kind, fingerprint(data), [repr(a) for a in args[1:]], sorted(params.items()))).encode(),
+            digest_size=16,
+        ).hexdigest()
+
+        result = _get(key)
+        if result is None:
+            result = func(*args, **kwargs)
+            if result is not None:
+                _put(key, result)
+        # * frames are mutable, hand out a copy. PlotData is frozen
+        return result.copy() if isinstance(result, (pd.DataFrame, pd.Series)) else result
+
+    return wrapper
+
+
+def _get(key: str):
+    if key in _memory:
+        _memory.move_to_end(key)
+        return _memory[key][0]
+    result = _read(key)
+    if result is not None:
+        _remember(key, result)
+    return result
+
+
+def _put(key: str, result) -> None:
+    _remember(key, result)
+    _write(key, result)
+
+
+def _remember(key: str, result) -> None:
+    global _memory_bytes
+    frame = result.frame if isinstance(result, PlotData) else result
+    size = frame.memory_usage(deep=True)
+    size = int(size.sum()) if isinstance(size, pd.Series) else int(size)
+    limit = float(os.getenv("CACHE_SIZE") or DEFAULT_SIZE_MB) * 2**20
+    if size > limit:
+        return
+    if key in _memory:
+        _memory_bytes -= _memory.pop(key)[1]
+    _memory[key] = (result, size)
+    _memory_bytes += size
+    while _memory_bytes > limit:
+        _memory_bytes -= _memory.popitem(last=False)[1][1]
+
+
+def _json_default(value):
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, (tuple, set, np.ndarray, pd.Index)):
+        return list(value)
+    raise TypeError(f"not serializable: {type(value)}")
+
+
+def _write(key: str, result) -> None:
+    """Stores the frame as parquet and everything else as json. Results that can not be stored are skipped."""
+    cache_dir = os.getenv("CACHE_DIR")
+    if not cache_dir:
+        return
+    path = Path(cache_dir)
+    path.mkdir(parents=True, exist_ok=True)
+
+    if isinstance(result, PlotData):
+        frame = result.frame
+        meta = {
+            "type": "PlotData",
+            "kind": result.kind,
+            "color_map": dict(result.color_map),
+            "category_orders": dict(result.category_orders),
+            "title_parts": dict(result.title_parts),
+            "columns": list(result.columns.items()),
+            "n": result.n,
+            "meta": dict(result.meta),
+        }
+    else:
+        frame = result.to_frame() if isinstance(result, pd.Series) else result
+        meta = {
+            "type": type(result).__name__,
+            "name": result.name if isinstance(result, pd.Series) else None,
+            "columns": list(frame.columns),
+            "columns_name": frame.columns.name,
+        }
+    # * the index is stored as leading columns
+    meta["index"] = list(frame.index.names)
+    frame = frame.reset_index()
+    meta["frame_columns"] = list(frame.columns)
+
+    import duckdb as ddb
+
+    try:
+        # * parquet needs str column names, the original names are restored from json
+        ddb.from_df(frame.set_axis([f"c{i}" for i in range(frame.shape[1])], axis=1)).write_parquet(
+            str(path / f"{key}.parquet")
+        )
+        (path / f"{key}.json").write_text(json.dumps(meta, default=_json_default))
+    except (ddb.Error, TypeError, ValueError, OSError):
+        (path / f"{key}.parquet").unlink(missing_ok=True)
+
+
+def _read(key: str):
+    cache_dir = os.getenv("CACHE_DIR")
+    if not cache_dir:
+        return None
+    path = Path(cache_dir)
+    if not (path / f"{key}.json").exists() or not (path / f"{key}.parquet").exists():
+        return None
+
+    import duckdb as ddb
+
+    meta = json.loads((path / f"{key}.json").read_text())
+    frame = ddb.read_parquet(str(path / f"{key}.parquet")).df()
+    frame.columns = meta["frame_columns"]
+    frame = frame.set_index(list(frame.columns[: len(meta["index"])]))
+    frame.index.names = meta["index"]
+
+    if meta["type"] == "PlotData":
+        return PlotData(
+            kind=meta["kind"],
+            frame=frame,
+            color_map=meta["color_map"],
+            category_orders=meta["category_orders"],
+            title_parts=meta["title_parts"],
+            columns=dict(meta["columns"]),
+            n=meta["n"],
+            meta=meta["meta"],
+        )
+
+    frame.columns = pd.Index(meta["columns"], name=meta["columns_name"])
+    if meta["type"] == "Series":
+        return frame.iloc[:, 0].rename(meta["name"])
+    return frame
@@ -3,6 +3,7 @@ import os
 import re
 import shutil
 import subprocess
+import tempfile
 from typing import Literal
 
 import dataframe_image as dfi
@@ -823,7 +824,8 @@ def jupyter_to_md(
         `GIT_HOST`: if `gitlab`, fix the TOC html tags
         `OVERRIDE`: this forces the notebook to not override theme / renderer
 
-    If theme="system": forces `execute`, overrides theme
+    If theme="system": forces `execute`, overrides theme.
+        Both runs share an on-disk aggregation cache (`CACHE`, `CACHE_DIR`), unless `CACHE` is already set.
 
     Args:
         path (str): The path to the Jupyter notebook file.
@@ -866,43 +868,61 @@ def jupyter_to_md(
     os.environ["OVERRIDE"] = "1"
 
     if theme == "system":
-        # Run 1: dark — execute, convert, then stash images in _files_dark
-        print("[1/2] dark theme ..")
-        os.environ["THEME"] = "dark"
-        _single_run(
-            path=path,
-            to=to,
-            center_df=center_df,
-            chrome_path=chrome_path,
-            output_dir=output_dir,
-            no_input=no_input,
-            execute=True,
-            root=root,
-        )
-        _files_dir = os.path.join(output_dir, root + "_files")
-        _dark_files_dir = os.path.join(output_dir, root + "_files_dark")
-        if os.path.exists(_files_dir):
-            if os.path.exists(_dark_files_dir):
-                shutil.rmtree(_dark_files_dir)
-            os.rename(_files_dir, _dark_files_dir)
-
-        # Run 2: light — execute, convert; _files stays as the default referenced by the markdown
-        print("[2/2] light theme ..")
-        os.environ["THEME"] = "light"
-        _single_run(
-            path=path,
-            to=to,
-            center_df=center_df,
-            chrome_path=chrome_path,
-            output_dir=output_dir,
-            no_input=no_input,
-            execute=True,
-            root=root,
-        )
-        _reconcile_dark_filenames(
-            light_dir=os.path.join(output_dir, root + "_files"),
-            dark_dir=os.path.join(output_dir, root + "_files_dark"),
-        )
+        # * the light run reuses the aggregations of the dark run, only the rendering differs
+        _cache_dir = None
+        _cache_env = {key: os.environ.get(key) for key in ("CACHE", "CACHE_DIR")}
+        if _cache_env["CACHE"] is None:
+            _cache_dir = tempfile.mkdtemp(prefix="pp_cache_")
+            os.environ["CACHE"] = "1"
+            os.environ["CACHE_DIR"] = _cache_dir
+
+        try:
+            # Run 1: dark — execute, convert, then stash images in _files_dark
+            print("[1/2] dark theme ..")
+            os.environ["THEME"] = "dark"
+            _single_run(
+                path=path,
+                to=to,
+                center_df=center_df,
+                chrome_path=chrome_path,
+                output_dir=output_dir,
+                no_input=no_input,
+                execute=True,
+                root=root,
+            )
+            _files_dir = os.path.join(output_dir, root + "_files")
+            _dark_files_dir = os.path.join(output_dir, root + "_files_dark")
+            if os.path.exists(_files_dir):
+                if os.path.exists(_dark_files_dir):
+                    shutil.rmtree(_dark_files_dir)
+                os.rename(_files_dir, _dark_files_dir)
+
+            # Run 2: light — execute, convert; _files stays as the default referenced by the markdown
+            print("[2/2] light theme ..")
+            os.environ["THEME"] = "light"
+            _single_run(
+                path=path,
+                to=to,
+                center_df=center_df,
+                chrome_path=chrome_path,
+                output_dir=output_dir,
+                no_input=no_input,
+                execute=True,
+                root=root,
+            )
+            _reconcile_dark_filenames(
+                light_dir=os.path.join(output_dir, root + "_files"),
+                dark_dir=os.path.join(output_dir, root + "_files_dark"),
+            )
+        finally:
+            # * also if a run fails: remove the temp cache and restore the caller's settings
+            if _cache_dir:
+                shutil.rmtree(_cache_dir, ignore_errors=True)
+                for key, value in _cache_env.items():
+                    if value is None:
+                        os.environ.pop(key, None)
+                    else:
+                        os.environ[key] = value
     else:
         if theme is not None:
             os.environ["THEME"] = theme
@@ -1,10 +1,20 @@
+from __future__ import annotations
+
+import os
+import re
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import TYPE_CHECKING, Literal
+
 import numpy as np
 import pandas as pd
-import plotly.express as px
-from IPython.display import display, Markdown
 
 from .const import OTHER_LABEL
 
+if TYPE_CHECKING:
+    import duckdb as ddb
+
 
 # * cleanse all variations of None
 def _clean_set(_set: set) -> set:
@@ -59,6 +69,98 @@ def _create_details(
     return df, details
 
 
+def _project(data: pd.DataFrame | pd.Series, columns: list = None, names: list = None) -> pd.DataFrame:
+    """
+    Selects columns of the input without copying their data, the result holds references to the caller's arrays.
+
+    Replacing columns of the result (`df[col] = ...`, `df = df.fillna(...)`) never reaches the caller,
+    with or without copy-on-write. Writing into the values (`df.iloc[:, 0] = ...`, `inplace=True` on a column) would,
+    so functions working on a projection only replace whole columns.
+
+    Args:
+        data (pd.DataFrame | pd.Series): The caller's data. A Series becomes a single column.
+        columns (list, optional): Column labels to select. Defaults to all columns.
+        names (list, optional): New column names, same length as `columns`. Defaults to the original names.
+
+    Returns:
+        pd.DataFrame: A new frame on the same index.
+    """
+    if isinstance(data, pd.Series):
+        data = data.to_frame()
+    positions = range(data.shape[1]) if columns is None else [data.columns.get_loc(c) for c in columns]
+    names = [data.columns[i] for i in positions] if names is None else names
+    # * copy=False keeps the columns as separate blocks, nothing is consolidated (= copied)
+    return pd.DataFrame({name: data.iloc[:, i] for name, i in zip(names, positions)}, index=data.index, copy=False)
+
+
+def _map_ordered(func, items, workers: int = 1) -> list:
+    """
+    Applies `func` to each item, on a thread pool if `workers` > 1 (-1 = one thread per cpu).
+    Results are in the order of `items`, so output built from them does not depend on `workers`.
+    """
+    items = list(items)
+    if workers == -1:
+        workers = os.cpu_count() or 1
+    if workers <= 1 or len(items) <= 1:
+        return [func(item) for item in items]
+    with ThreadPoolExecutor(max_workers=min(workers, len(items))) as pool:
+        return list(pool.map(func, items))
+
+
+def _fillna(df: pd.DataFrame, value) -> pd.DataFrame:
+    """Like `df.fillna(value)` on a projection, but only columns that contain nulls are replaced (and copied)."""
+    for col in df.columns[[df[col].hasnans for col in df.columns]]:
+        df[col] = df[col].fillna(value)
+    return df
+
+
+def _factorize_axis(ser: pd.Series, null_label: str) -> tuple[np.ndarray, pd.Index]:
+    """
+    Factorizes a column into integer codes over its sorted labels, nulls are labelled as `null_label`.
+    The label order is the same as `ser.fillna(null_label)` gets in a sorted groupby.
+    """
+    codes, labels = pd.factorize(ser, sort=True)
+    if (codes == -1).any():
+        # * merge null_label into the sorted labels, it may already be present as a value
+        remap, labels = pd.factorize(labels.append(pd.Index([null_label], dtype=object)), sort=True)
+        # * -1 (null) picks the last entry of remap, which is null_label
+        codes = remap[codes]
+    return codes, labels
+
+
+def _top_codes(sums: np.ndarray, present: np.ndarray, top_n: int, sort_values: bool, dtype) -> np.ndarray:
+    """
+    Selects the codes to keep on one axis.
+
+    With `sort_values`, the top_n codes by group sum are picked via partial selection,
+    otherwise the first top_n present codes in label order. 0 means take all.
+    """
+    codes = np.flatnonzero(present)
+    if top_n <= 0 or top_n >= len(codes):
+        return codes
+    if not sort_values:
+        return codes[:top_n]
+    values = sums[codes]
+    kth = values[np.argpartition(values, len(values) - top_n)[len(values) - top_n]]
+    candidates = codes[values >= kth]
+    if len(candidates) > top_n:
+        # * ties at the cutoff: break them exactly like Series.sort_values(ascending=False) does
+        return codes[pd.Series(values.astype(dtype)).sort_values(ascending=False).index[:top_n]]
+    return candidates
+
+
+def _sum_by_code(codes: np.ndarray, weights: np.ndarray, minlength: int) -> np.ndarray:
+    """
+    Sums of `weights` per code like `np.bincount(codes, weights)`. Integer weights are summed in their own
+    dtype, bincount would return float64 and lose precision above 2**53.
+    """
+    if weights.dtype.kind == "f":
+        return np.bincount(codes, weights=weights, minlength=minlength)
+    sums = np.zeros(minlength, dtype=weights.dtype)
+    np.add.at(sums, codes, weights)
+    return sums
+
+
 def _aggregate_data(
     df: pd.DataFrame,
     top_n_index: int,
@@ -73,6 +175,10 @@ def _aggregate_data(
     """
     Aggregates the data, ensuring each combination of 'index', 'col', and 'facet' is unique with summed 'value'.
 
+    Each axis is factorized once into integer codes, all sums are computed with `_sum_by_code` on the
+    combined code. top_n and the "(other)" bucket are then resolved on the (small) group level arrays,
+    so the input rows are scanned only once. The input df is not modified.
+
     Args:
         df (pd.DataFrame): Input DataFrame.
         top_n_index (int): top N values of the first column to keep. 0 means take all.
@@ -85,50 +191,316 @@ def _aggregate_data(
     Returns:
         pd.DataFrame: Aggregated and filtered dataset (but not sorted!)
     """
+    columns = ["index", "col", "facet", "value"]
+    if df.empty:
+        return pd.DataFrame({col: df[col].iloc[:0] for col in columns})
+
+    code_i, labels_i = _factorize_axis(df["index"], null_label)
+    code_c, labels_c = _factorize_axis(df["col"], null_label)
+    code_f, labels_f = _factorize_axis(df["facet"], null_label)
+    n_i, n_c, n_f = len(labels_i), len(labels_c), len(labels_f)
+
+    # * nulls are skipped in sums (as in groupby.sum), integers are summed as (u)int64 like groupby.sum does
+    value = df["value"]
+    if pd.api.types.is_bool_dtype(value) or pd.api.types.is_integer_dtype(value):
+        sum_dtype = "uint64" if value.dtype.kind == "u" else "int64"
+        weights = value.to_numpy(dtype=sum_dtype, na_value=0)
+    else:
+        sum_dtype = "float64"
+        weights = value.to_numpy(dtype=sum_dtype, na_value=np.nan)
+        weights = np.where(np.isnan(weights), 0.0, weights)
+
+    # * combined code, its order equals the sorted groupby on [index, col, facet]
+    combined = (code_i.astype("int64") * n_c + code_c) * n_f + code_f
+    n_combined = n_i * n_c * n_f
+    if n_combined <= max(len(df), 1 << 20):
+        present = np.bincount(combined, minlength=n_combined) > 0
+        group_codes = np.flatnonzero(present)
+        group_sums = _sum_by_code(combined, weights, n_combined)[group_codes]
+    else:
+        # * too many combinations for a dense array, number only the observed ones
+        group_id, group_codes = pd.factorize(combined, sort=True)
+        group_sums = _sum_by_code(group_id, weights, len(group_codes))
+    g_i, rest = np.divmod(group_codes, n_c * n_f)
+    g_c, g_f = np.divmod(rest, n_f)
+
+    # * top n index
+    top_i = _top_codes(
+        _sum_by_code(g_i, group_sums, n_i),
+        np.ones(n_i, bool),
+        top_n_index,
+        sort_values_index,
+        sum_dtype,
+    )
+    keep = np.isin(g_i, top_i)
+
+    # * top n color, on the index-filtered groups
+    top_c = _top_codes(
+        _sum_by_code(g_c[keep], group_sums[keep], n_c),
+        np.bincount(g_c[keep], minlength=n_c) > 0,
+        top_n_color,
+        sort_values_color,
+        sum_dtype,
+    )
+    is_other = ~np.isin(g_c, top_c)
+    keep &= ~is_other
+
+    rows_i, rows_f, rows_sum = g_i[keep], g_f[keep], group_sums[keep]
+    rows_c = labels_c.take(g_c[keep])
+    rows_pos = np.flatnonzero(keep)
+
+    # * "(other)" folds all groups outside the top colors by [index, facet]
+    if show_other and top_n_color > 0 and is_other.any():
+        other_code = g_i[is_other] * n_f + g_f[is_other]
+        other_sums = _sum_by_code(other_code, group_sums[is_other], n_i * n_f)
+        other_codes = np.flatnonzero(np.bincount(other_code, minlength=n_i * n_f) > 0)
+        other_i, other_f = np.divmod(other_codes, n_f)
+        rows_i = np.concatenate([rows_i, other_i])
+        rows_f = np.concatenate([rows_f, other_f])
+        rows_sum = np.concatenate([rows_sum, other_sums[other_codes]])
+        rows_c = rows_c.append(pd.Index([OTHER_LABEL] * len(other_codes), dtype=object))
+        rows_pos = np.arange(len(rows_i))
+
+    # * top n facet, on the remaining rows incl. "(other)"
+    top_f = _top_codes(
+        _sum_by_code(rows_f, rows_sum, n_f),
+        np.bincount(rows_f, minlength=n_f) > 0,
+        top_n_facet,
+        sort_values_facet,
+        sum_dtype,
+    )
+    keep = np.isin(rows_f, top_f)
+
+    # * restore the dtype groupby.sum would return
+    if pd.api.types.is_bool_dtype(value):
+        sums = pd.array(rows_sum[keep], dtype="int64")
+    elif pd.api.types.is_integer_dtype(value):
+        sums = pd.array(rows_sum[keep], dtype=value.dtype)
+    else:
+        sums = pd.array(rows_sum[keep], dtype=value.dtype)
+
+    return pd.DataFrame(
+        {
+            "index": labels_i.take(rows_i[keep]),
+            "col": rows_c[keep],
+            "facet": labels_f.take(rows_f[keep]),
+            "value": sums,
+        },
+        index=rows_pos[keep],
+    )
+
+
+_DB_INTEGER_TYPES = {
+    "BOOLEAN",
+    "TINYINT",
+    "SMALLINT",
+    "INTEGER",
+    "BIGINT",
+    "HUGEINT",
+    "UTINYINT",
+    "USMALLINT",
+    "UINTEGER",
+    "UBIGINT",
+}
+
+
+_NUMERIC_TYPES = {
+    "tinyint",
+    "smallint",
+    "integer",
+    "bigint",
+    "hugeint",
+    "utinyint",
+    "usmallint",
+    "uinteger",
+    "ubigint",
+    "uhugeint",
+    "float",
+    "double",
+    "decimal",
+}
+
+
+def _to_relation(data, con: ddb.DuckDBPyConnection = None) -> ddb.DuckDBPyRelation:
+    """
+    Returns the input as duckdb relation: a relation is taken as is, a str is run as sql query and
+    a DataFrame is scanned in place. Both use `con` if given, else the default connection.
+    """
+    import duckdb as ddb
 
-    for col in ["index", "col", "facet"]:  # Skip 'value' column (numeric)
-        df[col] = df[col].fillna(null_label)
+    if isinstance(data, ddb.DuckDBPyRelation):
+        return data
+    if isinstance(data, str):
+        return ddb.sql(data, connection=con)
+    return ddb.from_df(data, connection=con)
 
-    # Aggregate data to ensure unique combinations
-    aggregated_df = df.groupby(["index", "col", "facet"], as_index=False)["value"].sum()
 
-    # * Reduce data based on top_n parameters
-    if sort_values_index:
-        top_indexes = (
-            aggregated_df.groupby("index")["value"].sum().sort_values(ascending=False)[: top_n_index or None].index
-        )
+def _resolve_relation(data, con: ddb.DuckDBPyConnection = None) -> ddb.DuckDBPyRelation | None:
+    """Relation as is, a str is read as parquet file (if it looks like one) or as table/view name."""
+    import duckdb as ddb
 
-    else:
-        top_indexes = aggregated_df["index"].sort_values().unique()[: top_n_index or None]
+    if isinstance(data, ddb.DuckDBPyRelation):
+        return data
+    if not isinstance(data, (str, Path)):
+        return None
+    name = str(data)
+    if name.lower().endswith(".parquet") or "*" in name or Path(name).is_file():
+        return ddb.read_parquet(name, connection=con)
+    try:
+        return ddb.table(name, connection=con)
+    except ddb.CatalogException:
+        return None
 
-    aggregated_df = aggregated_df[aggregated_df["index"].isin(top_indexes)]
 
-    if sort_values_color:
-        top_colors = (
-            aggregated_df.groupby("col")["value"].sum().sort_values(ascending=False)[: top_n_color or None].index
-        )
-    else:
-        top_colors = aggregated_df["col"].sort_values().unique()[: top_n_color or None]
-
-    others_df = df[~df["col"].isin(top_colors)]
-    aggregated_df = aggregated_df[aggregated_df["col"].isin(top_colors)]
-    if show_other and top_n_color > 0 and not others_df.empty:
-        other_agg = others_df.groupby(["index", "facet"], as_index=False)["value"].sum()
-        other_agg["col"] = OTHER_LABEL
-        other_agg = other_agg[["index", "col", "facet", "value"]]
-        aggregated_df = pd.concat([aggregated_df, other_agg], ignore_index=True)
-        top_colors = [*top_colors, OTHER_LABEL]
-
-    if sort_values_facet:
-        top_facets = (
-            aggregated_df.groupby("facet")["value"].sum().sort_values(ascending=False)[: top_n_facet or None].index
-        )
+def _is_relation(data) -> bool:
+    """isinstance check for a duckdb relation without importing duckdb, a relation exists only if duckdb is loaded."""
+    ddb = sys.modules.get("duckdb")
+    return ddb is not None and isinstance(data, ddb.DuckDBPyRelation)
+
+
+def _sql_name(name: str) -> str:
+    return '"' + str(name).replace('"', '""') + '"'
+
+
+def _sql_str(value: str) -> str:
+    return "'" + str(value).replace("'", "''") + "'"
+
+
+def _sql_round(expr: str, precision: int) -> str:
+    """
+    SQL for `expr` rounded like numpy/pandas: scaled by 10 ** precision, rounded half to even and scaled back.
+    duckdb's round() rounds half away from zero and round_even(x, precision) rounds the unscaled value.
+    """
+    scale = 10.0 ** abs(int(precision))
+    if precision >= 0:
+        return f"(round_even(({expr}) * {scale!r}, 0) / {scale!r})"
+    return f"(round_even(({expr}) / {scale!r}, 0) * {scale!r})"
+
+
+def _aggregate_data_db(
+    rel: ddb.DuckDBPyRelation,
+    index: str,
+    col: str,
+    facet: str = None,
+    value: str = None,
+    top_n_index: int = 0,
+    top_n_color: int = 0,
+    top_n_facet: int = 0,
+    null_label: str = "(NA)",
+    show_other: bool = False,
+    sort_values_index: bool = False,
+    sort_values_color: bool = False,
+    sort_values_facet: bool = False,
+    dropna: bool = False,
+    strip: bool = False,
+    precision: int = None,
+    total: str = None,
+    fill_index: bool = False,
+) -> tuple[pd.DataFrame, float]:
+    """
+    Same as `_aggregate_data`, but pushed down into a single duckdb query on the relation.
+    Only the aggregated result is fetched. Labels are returned as text, ties at a top_n cutoff are broken by label.
+
+    Args:
+        rel (ddb.DuckDBPyRelation): Input relation.
+        index (str): Column for the index axis.
+        col (str): Column for the color axis.
+        facet (str): Column for the facets. None puts all rows into one facet labelled `null_label`.
+        value (str): Column to sum. None counts rows.
+        top_n_index (int): top N values of the index to keep. 0 means take all.
+        top_n_color (int): top N values of the color to keep. 0 means take all.
+        top_n_facet (int): top N values of the facet to keep. 0 means take all.
+        null_label (str): Label for null values.
+        show_other (bool): Whether to include "(other)" for columns not in top_n_color. Defaults to False.
+        sort_values_index (bool): Whether top_n_index picks by group sum instead of label order.
+        sort_values_color (bool): Whether top_n_color picks by group sum instead of label order.
+        sort_values_facet (bool): Whether top_n_facet picks by group sum instead of label order.
+        dropna (bool): Whether to drop rows with nulls in the label columns instead of labelling them.
+        strip (bool): Whether to strip whitespaces from text labels.
+        precision (int): If set, non-integer values are rounded to this precision before summing.
+        total (str): "index" or "col". Adds a " Total" category on this axis, summed over the other axis.
+        fill_index (bool): Whether to add zero rows for all index x facet combinations, labelled `null_label` on the color.
+
+    Returns:
+        tuple[pd.DataFrame, float]: Columns index, col, facet, value (not sorted!) and n, the sum over all rows.
+    """
+    types = dict(zip(rel.columns, map(str, rel.types)))
+    is_integer = value is None or types[value] in _DB_INTEGER_TYPES
+    na = _sql_str(null_label)
+
+    def _label(name: str) -> str:
+        expr = _sql_name(name)
+        if types[name] != "VARCHAR":
+            expr = f"CAST({expr} AS VARCHAR)"
+        elif strip:
+            expr = f"trim({expr})"
+        return f"coalesce({expr}, {na})"
+
+    if value is None:
+        value_expr = "1"
+    elif is_integer:
+        value_expr = f"CAST({_sql_name(value)} AS BIGINT)"
+    elif precision is not None:
+        value_expr = _sql_round(f"CAST({_sql_name(value)} AS DOUBLE)", precision)
     else:
-        top_facets = aggregated_df["facet"].sort_values().unique()[: top_n_facet or None]
+        value_expr = f"CAST({_sql_name(value)} AS DOUBLE)"
 
-    aggregated_df = aggregated_df[aggregated_df["facet"].isin(top_facets)]
+    label_cols = [name for name in (index, col, facet) if name is not None]
+    where = f"WHERE {' AND '.join(f'{_sql_name(name)} IS NOT NULL' for name in label_cols)}" if dropna else ""
 
-    return aggregated_df
+    def _top(axis: str, source: str, top_n: int, sort_values: bool, where: str = "") -> str:
+        if top_n <= 0:
+            return f"SELECT DISTINCT {axis} FROM {source} {where}"
+        order = f"sum(v) DESC, {axis}" if sort_values else axis
+        return f"SELECT {axis} FROM {source} {where} GROUP BY {axis} QUALIFY row_number() OVER (ORDER BY {order}) <= {top_n}"
+
+    fill = (
+        f"UNION ALL SELECT i, {na}, f, 0 FROM (SELECT DISTINCT i FROM src) CROSS JOIN (SELECT DISTINCT f FROM src)"
+        if fill_index
+        else ""
+    )
+    if total == "index":
+        grouping = "CASE WHEN grouping(i) = 1 THEN ' Total' ELSE i END AS i, c, f, sum(v) AS v FROM base GROUP BY GROUPING SETS ((i, c, f), (c, f))"
+    elif total == "col":
+        grouping = "i, CASE WHEN grouping(c) = 1 THEN ' Total' ELSE c END AS c, f, sum(v) AS v FROM base GROUP BY GROUPING SETS ((i, c, f), (i, f))"
+    else:
+        grouping = "i, c, f, sum(v) AS v FROM base GROUP BY i, c, f"
+    other = (
+        f"UNION ALL SELECT 1, i, {_sql_str(OTHER_LABEL)}, f, sum(v) FROM grouped WHERE c NOT IN (SELECT c FROM top_c) GROUP BY i, f"
+        if show_other and top_n_color > 0
+        else ""
+    )
+    value_type = "BIGINT" if is_integer else "DOUBLE"
+
+    # * labelling, grouping (incl. total), top n ranking and "(other)" folding in one statement
+    query = f"""
+        WITH src AS (
+            SELECT {_label(index)} AS i, {_label(col)} AS c, {_label(facet) if facet else na} AS f, {value_expr} AS v
+            FROM rel {where}
+        ),
+        base AS (SELECT * FROM src {fill}),
+        grouped AS (SELECT i, c, f, sum(v) AS v FROM (SELECT {grouping}) GROUP BY i, c, f),
+        top_i AS ({_top("i", "grouped", top_n_index, sort_values_index)}),
+        top_c AS ({_top("c", "grouped", top_n_color, sort_values_color, "WHERE i IN (SELECT i FROM top_i)")}),
+        combined AS (
+            SELECT 0 AS part, i, c, f, v FROM grouped
+            WHERE i IN (SELECT i FROM top_i) AND c IN (SELECT c FROM top_c)
+            {other}
+        ),
+        top_f AS ({_top("f", "combined", top_n_facet, sort_values_facet)})
+        SELECT
+            i AS "index",
+            c AS col,
+            f AS facet,
+            CAST(v AS {value_type}) AS value,
+            (SELECT CAST(sum(v) AS {value_type}) FROM src) AS n
+        FROM combined
+        WHERE f IN (SELECT f FROM top_f)
+        ORDER BY part, i, c, f
+    """
+    df = rel.query("rel", query).df()
+    n = df.pop("n").iloc[0] if len(df) else 0
+    return df, n.item() if hasattr(n, "item") else n
 
 
 def _assign_column_colors(columns, color_palette, null_label, first_col_grey=False, sort_columns=True):
@@ -147,6 +519,8 @@ def _assign_column_colors(columns, color_palette, null_label, first_col_grey=Fal
     Returns:
         dict: Mapping of column values to colors.
     """
+    import plotly.express as px
+
     if isinstance(color_palette, list):
         palette = color_palette
     elif hasattr(px.colors.qualitative, color_palette):
@@ -209,9 +583,9 @@ def _group_kkr(df: pd.DataFrame, kkr_col: str) -> pd.DataFrame:
     ]
 
     # --- 1. Validation and Column Identification ---
-    df_processed = df.copy()  # Work on a copy
-    if kkr_col not in df_processed.columns:
+    if kkr_col not in df.columns:
         raise ValueError(f"Column '{kkr_col}' not found in the DataFrame.")
+    df_processed = _project(df)
 
     # Identify the single mandatory other_col
     other_cols_potential = [c for c in df_processed.columns if c != kkr_col]
@@ -266,5 +640,384 @@ def _group_kkr(df: pd.DataFrame, kkr_col: str) -> pd.DataFrame:
     return result_df
 
 def _add_alt_text(text: str) -> None:
+    from IPython.display import display, Markdown
+
     if text:
         display(Markdown(f"<!-- ALT_TEXT:{text}-->"))
+
+
+# * backend="auto" switches to matplotlib above this number of bars (segments)
+AUTO_BACKEND_MARKS = 2_000
+# * matplotlib draws no bar texts above this number of bars per axis, they would overlap anyway
+_MPL_MAX_LABELED_BARS = 100
+# * max number of category ticks per axis, every n-th category is labelled above
+_MPL_MAX_TICKS = 60
+
+
+def _use_matplotlib(backend: str, marks: int) -> bool:
+    """Resolves `backend` ("plotly", "matplotlib", "auto") for a chart with `marks` bars (segments)."""
+    if backend == "auto":
+        return marks > AUTO_BACKEND_MARKS
+    if backend not in ("plotly", "matplotlib"):
+        raise ValueError(f"Invalid backend: {backend}")
+    return backend == "matplotlib"
+
+
+def _mpl_color(color: str):
+    """Converts plotly color strings like "rgb(1, 2, 3)" to matplotlib colors, hex and names pass through."""
+    match = re.fullmatch(r"rgba?\(([^)]*)\)", str(color).replace(" ", ""))
+    if not match:
+        return color
+    parts = [float(p) for p in match.group(1).split(",")]
+    return tuple([p / 255 for p in parts[:3]] + parts[3:4])
+
+
+def _mpl_text(text: str) -> str:
+    """Plotly html to plain text: <br> becomes a line break, other tags are dropped."""
+    return re.sub(r"<[^>]+>", "", str(text).replace("<br>", "\n"))
+
+
+def _mpl_figure(width: int, height: int, nrows: int = 1, ncols: int = 1):
+    """Creates a figure in the current theme, size in px like the plotly functions."""
+    from matplotlib import pyplot as plt
+
+    plt.style.use("dark_background" if os.getenv("THEME") == "dark" else "default")
+    scale_factor = 100
+    return plt.subplots(nrows, ncols, figsize=(width / scale_factor, height / scale_factor), squeeze=False)
+
+
+def _set_category_ticks(ax, labels: list, orientation: str) -> None:
+    """Labels the category axis, thinned out to every n-th category if there are too many."""
+    n = len(labels)
+    step = max(1, -(-n // _MPL_MAX_TICKS))
+    positions = np.arange(0, n, step)
+    labels = [str(labels[i]) for i in positions]
+    if orientation == "v":
+        ax.set_xticks(positions, labels, rotation=90 if len(labels) > 12 else 0)
+        ax.set_xlim(-0.5, n - 0.5)
+    else:
+        ax.set_yticks(positions, labels)
+        ax.set_ylim(-0.5, n - 0.5)
+
+
+def _draw_stacked_bars_mpl(
+    ax,
+    frame: pd.DataFrame,
+    index_order: list,
+    color_order: list,
+    color_map: dict,
+    orientation: str,
+    text: str = None,
+) -> np.ndarray:
+    """
+    Draws stacked bars from a tidy frame (columns `index`, `col`, `value`) on a matplotlib axis.
+    Values are scattered into a (color x index) matrix, then each color is drawn for all bars in one call.
+
+    Args:
+        ax: The matplotlib axis.
+        frame (pd.DataFrame): Aggregated data, one row per segment.
+        index_order (list): Order of the bars.
+        color_order (list): Order of the segments within a bar, first is at the base.
+        color_map (dict): `col` category -> color (plotly or matplotlib format).
+        orientation (str): "v" or "h".
+        text (str, optional): Column of `frame` with the segment labels.
+
+    Returns:
+        np.ndarray: Bar totals in `index_order`.
+    """
+    i = pd.Index(index_order).get_indexer(frame["index"])
+    c = pd.Index(color_order).get_indexer(frame["col"])
+    keep = (i >= 0) & (c >= 0)
+    i, c = i[keep], c[keep]
+
+    values = np.zeros((len(color_order), len(index_order)))
+    np.add.at(values, (c, i), frame["value"].to_numpy(dtype=float)[keep])
+    bottoms = np.vstack([np.zeros(len(index_order)), values.cumsum(axis=0)[:-1]])
+
+    labels = None
+    if text is not None and len(index_order) <= _MPL_MAX_LABELED_BARS:
+        labels = np.full(values.shape, "", dtype=object)
+        labels[c, i] = frame[text].to_numpy(dtype=object)[keep]
+
+    positions = np.arange(len(index_order))
+    draw = ax.bar if orientation == "v" else ax.barh
+    for k, color in enumerate(color_order):
+        offset = {"bottom": bottoms[k]} if orientation == "v" else {"left": bottoms[k]}
+        bars = draw(positions, values[k], 0.8, color=_mpl_color(color_map.get(color, "lightgray")), label=str(color), **offset)
+        if labels is not None:
+            ax.bar_label(bars, labels=list(labels[k]), label_type="center", fontsize=8)
+
+    _set_category_ticks(ax, index_order, orientation)
+    return values.sum(axis=0)
+
+
+def _show_mpl(fig, png_path: Path | str = None) -> None:
+    """Shows a matplotlib figure, saves it if `png_path` is given, then closes it and resets the style."""
+    from matplotlib import pyplot as plt
+
+    fig.tight_layout()
+    # * save first, the inline backend clears the figure on show
+    if png_path is not None:
+        fig.savefig(Path(png_path).as_posix(), format="png", transparent=False, bbox_inches="tight")
+    plt.show()
+    plt.close(fig)
+    plt.style.use("default")
+
+
+# * mode="auto" draws boxes and histograms from precomputed stats above this number of values
+AUTO_STATS_ROWS = 100_000
+# * max number of points per box in stats mode, evenly spaced over the sorted points
+STATS_MAX_POINTS = 1_000
+
+
+def _use_stats(mode: str, rows: int) -> bool:
+    """Resolves `mode` ("raw", "stats", "auto") for a box plot or histogram of `rows` values."""
+    if mode == "auto":
+        return rows > AUTO_STATS_ROWS
+    if mode not in ("raw", "stats"):
+        raise ValueError(f"Invalid mode: {mode}")
+    return mode == "stats"
+
+
+def _set_box_stats(fig, box: dict, points) -> None:
+    """
+    Turns the traces of a px.box stub figure into boxes from precomputed stats.
+
+    The stub holds one value per box, the index of the box in `box` (see `tbl.print_summary._box_stats`),
+    so facets, colors and layout come from px as usual. The values of a trace are replaced by the
+    quartiles, whisker ends and the sampled points, the figure payload grows with boxes, not rows.
+    """
+    for trace in fig.data:
+        # * marginal boxes of px.histogram carry no orientation, only the values on one axis
+        letter = "x" if trace.orientation == "h" or (trace.orientation is None and trace.y is None) else "y"
+        ids = np.asarray(trace[letter], dtype=float).astype(np.intp)
+        # * an empty sample is sent as [nan], plotly reads the first sample to tell 1-d from 2-d data
+        samples = [box["points"][i] if len(box["points"][i]) else np.array([np.nan]) for i in ids] if points else None
+        trace.update(
+            {
+                letter: samples,
+                "q1": box["q25"][ids],
+                "median": box["median"][ids],
+                "q3": box["q75"][ids],
+                "lowerfence": box["lowerfence"][ids],
+                "upperfence": box["upperfence"][ids],
+                # * plotly shows all points for precomputed stats by default, px.box shows outliers
+                "boxpoints": points or False,
+                "orientation": "h" if letter == "x" else "v",
+            }
+        )
+        if trace.notched:
+            # * plotly derives the notch from the number of points, which are only a sample here
+            trace.notchspan = 1.57 * (box["q75"][ids] - box["q25"][ids]) / np.sqrt(np.maximum(box["count"][ids], 1))
+
+
+# * grid points of the binned kernel densities (violins, histograms)
+KDE_GRID = 512
+# * line color of boxes and violins drawn with matplotlib
+_MPL_BOX_LINE = "#3f3f3f"
+
+
+def _kde_binned(
+    values: np.ndarray,
+    cut: float = 0.0,
+    gridsize: int = KDE_GRID,
+    bw_method: Literal["scott", "silverman"] | float = "scott",
+    weights: np.ndarray = None,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Gaussian kernel density of values on an even grid, from linear binning and an FFT convolution.
+
+    Every value is split between its two neighbouring grid points, the grid counts are convolved with the
+    kernel sampled on the grid. The cost is one pass over the values plus O(gridsize log gridsize).
+    The bandwidth follows scipy.stats.gaussian_kde: the std times Scott's factor n**-1/5, Silverman's
+    (3n/4)**-1/5 or a given factor. The grid spans the data range extended by `cut` bandwidths like seaborn.
+    `weights` are frequencies, e.g. the counts of bin centers, n is their sum.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: Grid coordinates and density values.
+    """
+    if weights is None:
+        n = len(values)
+        std = np.std(values, ddof=1) if n > 1 else 0.0
+    else:
+        values, weights = values[weights > 0], weights[weights > 0]
+        n = weights.sum()
+        mean = np.average(values, weights=weights)
+        std = np.sqrt((weights * (values - mean) ** 2).sum() / (n - 1)) if n > 1 else 0.0
+    if bw_method == "scott":
+        factor = n ** (-1 / 5)
+    elif bw_method == "silverman":
+        factor = (n * 3 / 4) ** (-1 / 5)
+    elif isinstance(bw_method, (int, float)):
+        factor = bw_method
+    else:
+        raise ValueError(f"Invalid bw_method: {bw_method}")
+    bw = factor * std
+    lo, hi = values.min() - cut * bw, values.max() + cut * bw
+    if not bw > 0 or not hi > lo:
+        return np.array([values.min(), values.max()], dtype=float), np.zeros(2)
+
+    delta = (hi - lo) / (gridsize - 1)
+    pos = (values - lo) / delta
+    i = np.minimum(pos.astype(np.intp), gridsize - 2)
+    w = pos - i
+    if weights is not None:
+        counts = np.bincount(i, weights * (1 - w), gridsize) + np.bincount(i + 1, weights * w, gridsize)
+    else:
+        counts = np.bincount(i, 1 - w, gridsize) + np.bincount(i + 1, w, gridsize)
+
+    m = min(int(np.ceil(4 * bw / delta)), 4 * gridsize)
+    kernel = np.exp(-0.5 * (np.arange(-m, m + 1) * delta / bw) ** 2)
+    # * linear convolution via zero padded real FFTs
+    n_fft = 1 << (gridsize + 2 * m).bit_length()
+    smoothed = np.fft.irfft(np.fft.rfft(counts, n_fft) * np.fft.rfft(kernel, n_fft), n_fft)[m : m + gridsize]
+    # * round-off of the FFT can leave tiny negative values in empty regions
+    density = np.maximum(smoothed, 0) / (n * bw * np.sqrt(2 * np.pi))
+    return np.linspace(lo, hi, gridsize), density
+
+
+def _kde_binned_2d(
+    x: np.ndarray,
+    y: np.ndarray,
+    cut: float = 3.0,
+    gridsize: int = 200,
+    bw_method: Literal["scott", "silverman"] | float = "scott",
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Bivariate gaussian kernel density on an even grid, the 2-d counterpart of `_kde_binned`.
+
+    The kernel covariance is the data covariance times the squared factor of scipy.stats.gaussian_kde
+    (Scott's n**-1/6, Silverman's is the same in 2-d), so correlated data gets a tilted kernel like in seaborn.
+    The grid spans the data range extended by `cut` bandwidths per axis, seaborn's default for kdeplot.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray, np.ndarray]: Grid coordinates of x and y, density of shape (len(x), len(y)).
+    """
+    n = len(x)
+    if bw_method in ("scott", "silverman"):
+        factor = n ** (-1 / 6)
+    elif isinstance(bw_method, (int, float)):
+        factor = bw_method
+    else:
+        raise ValueError(f"Invalid bw_method: {bw_method}")
+    cov = np.cov(x, y) * factor**2 if n > 1 else np.zeros((2, 2))
+    det = np.linalg.det(cov)
+    bw = np.sqrt(np.diag(cov))
+    lo = np.array([x.min(), y.min()]) - cut * bw
+    hi = np.array([x.max(), y.max()]) + cut * bw
+    if not det > 0 or not (hi > lo).all():
+        return np.linspace(lo[0], hi[0], 2), np.linspace(lo[1], hi[1], 2), np.zeros((2, 2))
+
+    delta = (hi - lo) / (gridsize - 1)
+    # * every point is split between the four corners of its grid cell
+    pos_x, pos_y = (x - lo[0]) / delta[0], (y - lo[1]) / delta[1]
+    i, j = np.minimum(pos_x.astype(np.intp), gridsize - 2), np.minimum(pos_y.astype(np.intp), gridsize - 2)
+    wx, wy = pos_x - i, pos_y - j
+    cell = i * gridsize + j
+    size = gridsize * gridsize
+    counts = (
+        np.bincount(cell, (1 - wx) * (1 - wy), size)
+        + np.bincount(cell + gridsize, wx * (1 - wy), size)
+        + np.bincount(cell + 1, (1 - wx) * wy, size)
+        + np.bincount(cell + gridsize + 1, wx * wy, size)
+    ).reshape(gridsize, gridsize)
+
+    m = np.minimum(np.ceil(4 * bw / delta).astype(int), 4 * gridsize)
+    dx, dy = np.meshgrid(np.arange(-m[0], m[0] + 1) * delta[0], np.arange(-m[1], m[1] + 1) * delta[1], indexing="ij")
+    inv = np.linalg.inv(cov)
+    kernel = np.exp(-0.5 * (inv[0, 0] * dx**2 + 2 * inv[0, 1] * dx * dy + inv[1, 1] * dy**2))
+    # * linear convolution via zero padded real FFTs
+    shape = [1 << int(gridsize + 2 * k).bit_length() for k in m]
+    smoothed = np.fft.irfft2(np.fft.rfft2(counts, shape) * np.fft.rfft2(kernel, shape), shape)
+    smoothed = smoothed[m[0] : m[0] + gridsize, m[1] : m[1] + gridsize]
+    density = np.maximum(smoothed, 0) / (n * 2 * np.pi * np.sqrt(det))
+    return np.linspace(lo[0], hi[0], gridsize), np.linspace(lo[1], hi[1], gridsize), density
+
+
+def _draw_boxes_mpl(
+    ax,
+    box: dict,
+    labels: list,
+    colors: list,
+    orientation: str,
+    width: float,
+    violin: bool = False,
+    inner: bool = True,
+    cut: float = 0.0,
+    showfliers: bool = True,
+    flierprops: dict = None,
+    bw_method: Literal["scott", "silverman"] | float = "scott",
+) -> None:
+    """
+    Draws boxes (Axes.bxp) or violins (Axes.violin) from precomputed stats, one per category in `labels`.
+
+    `box` comes from `tbl.print_summary._box_stats` (with "points" for the fliers, "sorted" for violins).
+    Violins are scaled by area like seaborn: the widest one gets `width`, the others their share of the peak density.
+    `orientation` is "v" or "h", categories without values are left empty.
+    """
+    mpl_orientation = "vertical" if orientation == "v" else "horizontal"
+    drawn = np.flatnonzero(box["count"] > 0)
+    positions = drawn.astype(float)
+
+    if violin:
+        stats = []
+        for j in drawn:
+            coords, vals = _kde_binned(box["sorted"][j], cut=cut, bw_method=bw_method)
+            stats.append(
+                {
+                    "coords": coords,
+                    "vals": vals,
+                    "mean": box["mean"][j],
+                    "median": box["median"][j],
+                    "min": box["min"][j],
+                    "max": box["max"][j],
+                }
+            )
+        peaks = np.array([s["vals"].max() for s in stats])
+        widths = width * peaks / peaks.max() if len(peaks) and peaks.max() > 0 else width
+        parts = ax.violin(stats, positions, orientation=mpl_orientation, widths=widths, showextrema=False)
+        for body, j in zip(parts["bodies"], drawn):
+            body.set_facecolor(colors[j])
+            body.set_edgecolor(_MPL_BOX_LINE)
+            body.set_alpha(1)
+        if inner:
+            lines = ax.vlines if orientation == "v" else ax.hlines
+            lines(positions, box["lowerfence"][drawn], box["upperfence"][drawn], color=_MPL_BOX_LINE, linewidth=1.5)
+            lines(positions, box["q25"][drawn], box["q75"][drawn], color=_MPL_BOX_LINE, linewidth=6)
+            xy = (positions, box["median"][drawn]) if orientation == "v" else (box["median"][drawn], positions)
+            ax.scatter(*xy, color="white", s=6, zorder=3)
+    else:
+        stats = [
+            {
+                "label": str(labels[j]),
+                "med": box["median"][j],
+                "q1": box["q25"][j],
+                "q3": box["q75"][j],
+                "whislo": box["lowerfence"][j],
+                "whishi": box["upperfence"][j],
+                "mean": box["mean"][j],
+                "fliers": box["points"][j] if "points" in box else [],
+            }
+            for j in drawn
+        ]
+        parts = ax.bxp(
+            stats,
+            positions,
+            widths=width,
+            orientation=mpl_orientation,
+            patch_artist=True,
+            showfliers=showfliers,
+            flierprops={"markeredgecolor": _MPL_BOX_LINE, "markeredgewidth": 0.75, **(flierprops or {})},
+            boxprops={"edgecolor": _MPL_BOX_LINE},
+            whiskerprops={"color": _MPL_BOX_LINE},
+            capprops={"color": _MPL_BOX_LINE},
+            medianprops={"color": _MPL_BOX_LINE},
+            manage_ticks=False,
+        )
+        for patch, j in zip(parts["boxes"], drawn):
+            patch.set_facecolor(colors[j])
+
+    _set_category_ticks(ax, labels, orientation)
+    # * first category on top, like seaborn
+    if orientation == "h":
+        ax.invert_yaxis()
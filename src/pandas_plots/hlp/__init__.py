@@ -2,56 +2,55 @@
 Helper functions module for pandas-plots.
 
 This module contains various helper functions that were previously in hlp.py.
+Functions (and their backends) are imported on first use.
 """
 
 import pandas as pd
 
-from .mean_confidence_interval import mean_confidence_interval
-from .to_series import to_series
-from .replace_delimiter_outside_quotes import replace_delimiter_outside_quotes
-from .wrap_text import wrap_text
-from .create_barcode_from_url import create_barcode_from_url
-from .add_datetime_columns import add_datetime_columns
-from .show_package_version_get_os import show_package_version, OperatingSystem, get_os
-from .add_bitmask_label import add_bitmask_label
-from .find_cols import find_cols
-from .add_measures_to_pyg_config import add_measures_to_pyg_config
-from .get_tum_details import get_tum_details
-from .get_sparse_df import get_sparse_df
-from .set_theme import set_theme
-from .get_duckdb_filter_n import get_duckdb_filter_n
-from .print_filter import print_filter
-from .is_ipynb import is_ipynb
-from .prepend_uv_header import prepend_uv_header
-from .create_py_script import create_py_script
-from .setup_rendering import setup_rendering
-from .find_str_in_duckdb import find_str_in_duckdb
-from .export_plot_data import export_plot_data
-
-__all__ = [
-    "mean_confidence_interval",
-    "to_series",
-    "replace_delimiter_outside_quotes",
-    "wrap_text", 
-    "create_barcode_from_url",
-    "add_datetime_columns",
-    "show_package_version",
-    "OperatingSystem",
-    "get_os",
-    "add_bitmask_label",
-    "find_cols",
-    "add_measures_to_pyg_config",
-    "get_tum_details",
-    "get_sparse_df",
-    "set_theme",
-    "get_duckdb_filter_n",
-    "print_filter",
-    "is_ipynb",
-    "prepend_uv_header",
-    "create_py_script",
-    "setup_rendering",
-    "find_str_in_duckdb",
-    "export_plot_data",
-]
-
-pd.DataFrame.export_plot_data = export_plot_data
+from ..lazy import attach, lazy_method, when_imported
+
+# * public name -> defining module, resolved on first access
+_FUNCTIONS = {
+    "mean_confidence_interval": ".mean_confidence_interval",
+    "to_series": ".to_series",
+    "replace_delimiter_outside_quotes": ".replace_delimiter_outside_quotes",
+    "wrap_text": ".wrap_text",
+    "create_barcode_from_url": ".create_barcode_from_url",
+    "add_datetime_columns": ".add_datetime_columns",
+    "show_package_version": ".show_package_version_get_os",
+    "OperatingSystem": ".show_package_version_get_os",
+    "get_os": ".show_package_version_get_os",
+    "add_bitmask_label": ".add_bitmask_label",
+    "find_cols": ".find_cols",
+    "add_measures_to_pyg_config": ".add_measures_to_pyg_config",
+    "get_tum_details": ".get_tum_details",
+    "get_sparse_df": ".get_sparse_df",
+    "set_theme": ".set_theme",
+    "set_cache": ".set_cache",
+    "get_duckdb_filter_n": ".get_duckdb_filter_n",
+    "print_filter": ".print_filter",
+    "is_ipynb": ".is_ipynb",
+    "prepend_uv_header": ".prepend_uv_header",
+    "create_py_script": ".create_py_script",
+    "setup_rendering": ".setup_rendering",
+    "find_str_in_duckdb": ".find_str_in_duckdb",
+    "export_plot_data": ".export_plot_data",
+}
+
+__all__ = list(_FUNCTIONS)
+
+__getattr__, __dir__ = attach(__name__, functions=_FUNCTIONS)
+
+# * extend objects to enable chaining, the shims import the function on first call
+pd.DataFrame.export_plot_data = lazy_method(__name__, "export_plot_data")
+pd.DataFrame.add_bitmask_label = lazy_method(__name__, "add_bitmask_label")
+pd.DataFrame.add_datetime_columns = lazy_method(__name__, "add_datetime_columns")
+pd.DataFrame.find_cols = lazy_method(__name__, "find_cols")
+pd.DataFrame.to_series = lazy_method(__name__, "to_series")
+pd.Series.to_series = lazy_method(__name__, "to_series")
+
+# * duckdb is heavy, relations get their shim once duckdb is imported by the caller (or by a function)
+when_imported(
+    "duckdb",
+    lambda ddb: setattr(ddb.DuckDBPyRelation, "add_bitmask_label", lazy_method(__name__, "add_bitmask_label")),
+)
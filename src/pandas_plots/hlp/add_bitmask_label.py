@@ -88,8 +88,3 @@ def add_bitmask_label(
         return con.from_df(data)
 
     return data
-
-
-# * extend objects to enable chaining
-pd.DataFrame.add_bitmask_label = add_bitmask_label
-ddb.DuckDBPyRelation.add_bitmask_label = add_bitmask_label
\ No newline at end of file
@@ -56,6 +56,3 @@ def add_datetime_columns(df: pd.DataFrame, date_column: str = None) -> pd.DataFr
     )
 
     return df_
-
-# * extend objects to enable chaining
-pd.DataFrame.add_datetime_columns = add_datetime_columns
\ No newline at end of file
@@ -2,40 +2,49 @@ import os
 import re
 import pandas as pd
 
+from ..plot_data import PlotData
 
-def export_plot_data(df: pd.DataFrame, title: str | None = None, verbose: bool = False) -> pd.DataFrame:
+
+def export_plot_data(
+    df: pd.DataFrame | PlotData, title: str | None = None, verbose: bool = False
+) -> pd.DataFrame | PlotData:
     """
     Aggregates a DataFrame and exports it to ./data/<name>.csv. Chainable.
 
     Groups by all columns except the last. If the last column is numeric, sums its values;
     otherwise counts rows per group as 'cnt'.
+    A `PlotData` (e.g. from `pls.plot_stacked_bars(..., return_data=True)`) is already aggregated,
+    it is exported as plotted, incl. top n and "(other)".
 
     The filename defaults to output_{cell_execution_count}_0 (matching Jupyter's image naming).
     If title is provided, spaces become underscores and all characters except [a-zA-Z0-9_-] are removed.
 
     Args:
-        df: Input DataFrame to aggregate and export.
+        df: Input DataFrame to aggregate and export, or PlotData to export as is.
         title: Optional filename stem. Spaces become underscores; special chars (except _ and -) are stripped.
                 Defaults to None, which uses the Jupyter execution count for naming.
         verbose: If True, prints the exported filepath. Defaults to False.
 
     Returns:
-        The original unmodified DataFrame (for chaining).
+        The original unmodified DataFrame or PlotData (for chaining).
     """
-    cols = df.columns.tolist()
-    last_col = cols[-1]
-    group_cols = cols[:-1]
-
-    if pd.api.types.is_numeric_dtype(df[last_col]):
-        if group_cols:
-            result = df.groupby(group_cols, as_index=False)[last_col].sum()
-        else:
-            result = pd.DataFrame({last_col: [df[last_col].sum()]})
+    if isinstance(df, PlotData):
+        result = df.to_frame()
     else:
-        if group_cols:
-            result = df.groupby(group_cols, as_index=False).size().rename(columns={"size": "cnt"})
+        cols = df.columns.tolist()
+        last_col = cols[-1]
+        group_cols = cols[:-1]
+
+        if pd.api.types.is_numeric_dtype(df[last_col]):
+            if group_cols:
+                result = df.groupby(group_cols, as_index=False)[last_col].sum()
+            else:
+                result = pd.DataFrame({last_col: [df[last_col].sum()]})
         else:
-            result = pd.DataFrame({"cnt": [len(df)]})
+            if group_cols:
+                result = df.groupby(group_cols, as_index=False).size().rename(columns={"size": "cnt"})
+            else:
+                result = pd.DataFrame({"cnt": [len(df)]})
 
     try:
         from IPython import get_ipython
@@ -46,7 +46,3 @@ def find_cols(all_cols: list[str], stubs: list[str] = None) -> list[str]:
         result.extend([col for col in all_cols if stub.lower() in col.lower()])
     
     return result
-
-
-# * extend objects to enable chaining
-pd.DataFrame.find_cols = find_cols
\ No newline at end of file
@@ -1,6 +1,8 @@
 import pandas as pd
 from typing import Optional
 
+from ..helper import _project
+
 def get_sparse_df(df: Optional[pd.DataFrame] = None) -> Optional[pd.DataFrame]:
     """
     Pivots a DataFrame to a sparse wide format by inferring the columns
@@ -75,7 +77,8 @@ def get_sparse_df(df: Optional[pd.DataFrame] = None) -> Optional[pd.DataFrame]:
     val_column = numeric_cols[0]
 
     # Core Pivoting Logic
-    df_copy = df[[col_to_pivot, val_column]].copy()
+    # * projection shares the caller's arrays, adding a column does not touch them
+    df_copy = _project(df, [col_to_pivot, val_column])
 
     # Create a unique, sequential index within each group.
     df_copy['sequence'] = df_copy.groupby(col_to_pivot).cumcount()
@@ -0,0 +1,28 @@
+import os
+from pathlib import Path
+
+
+def set_cache(enabled: bool = True, max_mb: int = 256, path: str | Path = None):
+    """
+    Enables or disables the aggregation cache of plot and table functions.
+
+    Results of the compute stage are keyed by a fingerprint of the input data and the aggregation parameters,
+    so calls that only change cosmetic flags (theme, size, renderer, labels) skip the aggregation.
+    The settings are stored as env variables (`CACHE`, `CACHE_SIZE`, `CACHE_DIR`), so child kernels inherit them.
+
+    Args:
+        enabled (bool, optional): Whether to use the cache. Disabling also empties the in-memory cache. Defaults to True.
+        max_mb (int, optional): Size cap of the in-memory cache in MB, least recently used results are dropped. Defaults to 256.
+        path (str | Path, optional): Folder to persist results as parquet, e.g. to share them between notebook runs. Defaults to None.
+    """
+    os.environ["CACHE"] = "1" if enabled else "0"
+    os.environ["CACHE_SIZE"] = str(max_mb)
+    if path:
+        os.environ["CACHE_DIR"] = Path(path).as_posix()
+    else:
+        os.environ.pop("CACHE_DIR", None)
+
+    if not enabled:
+        from ..cache import clear
+
+        clear()
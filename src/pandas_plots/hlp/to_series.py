@@ -50,7 +50,3 @@ def to_series(df) -> pd.Series | None:
         s.index.name = _idx_col.name
         s.name = _data_col.name
         return s
-
-# * extend objects to enable chaining
-pd.DataFrame.to_series = to_series
-pd.Series.to_series = to_series
\ No newline at end of file
@@ -0,0 +1,81 @@
+"""
+Vectorized text labels for bar charts.
+
+Every distinct number is formatted once (python format spec, so the text is the same as with f-strings),
+the strings are spread to all bars by index and joined as numpy object arrays. There is no per-row python work,
+which matters once a chart has thousands of bars.
+
+    cnt = fmt_number(df["value"], precision=1)                       # "1_234.5"
+    pct = fmt_pct(df["value"] / n, precision=1)                      # "12.3%"
+    df["text"] = join_labels(cnt, pct, "<br>", mask=is_visible(df["value"] / n))  # "1_234.5<br>(12.3%)"
+"""
+
+import numpy as np
+import pandas as pd
+
+# * minimum share of a segment (in %) to get a pct label, smaller segments are too narrow to show it
+MIN_PCT_LABEL = 5
+
+
+def _fmt_unique(values, spec: str, decimal: str = ".") -> np.ndarray:
+    """Formats each distinct value once and spreads the strings to all positions."""
+    codes, uniques = pd.factorize(np.asarray(values, dtype=float), use_na_sentinel=False)
+    texts = [format(x, spec) for x in uniques.tolist()]
+    if decimal != ".":
+        texts = [t.replace(".", decimal) for t in texts]
+    return np.array(texts, dtype=object)[codes]
+
+
+def fmt_number(values, precision: int = 0, sep: str = "_", decimal: str = ".") -> np.ndarray:
+    """
+    Formats numbers with a fixed precision and a thousands separator, e.g. 1234.5 -> "1_234.5".
+
+    Args:
+        values (array-like): Numbers to format.
+        precision (int): Number of decimals.
+        sep (str): Thousands separator, "_" or "," (python format spec) or "" for none.
+        decimal (str): Decimal point, e.g. "," for german labels.
+
+    Returns:
+        np.ndarray: Object array of str, same length as `values`.
+    """
+    return _fmt_unique(values, f"{sep}.{precision}f", decimal)
+
+
+def fmt_pct(shares, precision: int = 1, decimal: str = ".") -> np.ndarray:
+    """
+    Formats shares (0-1) as percentages, e.g. 0.123 -> "12.3%".
+
+    Args:
+        shares (array-like): Shares to format, 1 = 100%.
+        precision (int): Number of decimals of the percentage.
+        decimal (str): Decimal point, e.g. "," for german labels.
+
+    Returns:
+        np.ndarray: Object array of str, same length as `shares`.
+    """
+    return _fmt_unique(shares, f".{precision}%", decimal)
+
+
+def is_visible(shares, min_pct: float = MIN_PCT_LABEL) -> np.ndarray:
+    """Returns a bool array, True where a share (0-1) is large enough to show a pct label."""
+    return np.asarray(shares, dtype=float) * 100 >= min_pct
+
+
+def join_labels(base, extra, divider: str = " ", mask=None, brackets: str = "()") -> np.ndarray:
+    """
+    Joins two label arrays to `base{divider}(extra)`, e.g. "1_234<br>(12.3%)".
+
+    Args:
+        base (array-like): Main labels.
+        extra (array-like): Labels to append in brackets.
+        divider (str): Text between both labels, e.g. " " or "<br>".
+        mask (array-like, optional): Where False, only `base` is kept. Defaults to None (join all).
+        brackets (str): Opening and closing bracket around `extra`.
+
+    Returns:
+        np.ndarray: Object array of str.
+    """
+    base = np.asarray(base, dtype=object)
+    joined = base + f"{divider}{brackets[0]}" + np.asarray(extra, dtype=object) + brackets[1]
+    return joined if mask is None else np.where(mask, joined, base)
@@ -0,0 +1,134 @@
+"""
+Lazy loading for pandas-plots.
+
+Subpackages only keep a table of their public names. The module behind a name (and its
+plotting backend like plotly, seaborn or scipy) is imported on first attribute access.
+"""
+
+import importlib
+import importlib.abc
+import sys
+import types
+
+# * module name -> callbacks that run once the module is imported, see `when_imported()`
+_pending: dict[str, list] = {}
+
+
+class _LazyModule(types.ModuleType):
+    """Module type that keeps lazily resolved functions from being shadowed by their submodules."""
+
+    def __setattr__(self, name, value):
+        # * importing pls/plot_bars.py binds the submodule to pls.plot_bars, keep the function name free
+        if isinstance(value, types.ModuleType) and name in self.__dict__.get("_lazy_names", ()):
+            return
+        super().__setattr__(name, value)
+
+
+def attach(module_name: str, submodules: list[str] = (), functions: dict[str, str] = None):
+    """
+    Creates module level `__getattr__` and `__dir__` for lazily imported names.
+
+    Args:
+        module_name (str): `__name__` of the module to attach to.
+        submodules (list[str]): Names of submodules/subpackages that are imported on first access.
+        functions (dict[str, str]): Maps each public function name to the relative module that defines it.
+
+    Returns:
+        tuple: (`__getattr__`, `__dir__`) to be assigned in the calling module.
+    """
+    functions = functions or {}
+    module = sys.modules[module_name]
+    module.__dict__["_lazy_names"] = frozenset([*submodules, *functions])
+    module.__class__ = _LazyModule
+
+    def __getattr__(name: str):
+        if name in submodules:
+            value = importlib.import_module(f".{name}", module_name)
+        elif name in functions:
+            value = getattr(importlib.import_module(functions[name], module_name), name)
+        else:
+            raise AttributeError(f"module {module_name!r} has no attribute {name!r}")
+        # * cache, so __getattr__ is hit only once per name
+        module.__dict__[name] = value
+        return value
+
+    def __dir__():
+        return sorted({*module.__dict__, *submodules, *functions})
+
+    return __getattr__, __dir__
+
+
+def lazy_method(module_name: str, name: str):
+    """
+    Creates a thin shim for chaining (e.g. `pd.DataFrame.plot_bars`) that imports the target on first call.
+
+    Args:
+        module_name (str): Module that exposes the function, e.g. `pandas_plots.pls`.
+        name (str): Function name.
+
+    Returns:
+        Callable: The shim, passing `self` as first positional argument.
+    """
+
+    def method(*args, **kwargs):
+        return getattr(importlib.import_module(module_name), name)(*args, **kwargs)
+
+    method.__name__ = method.__qualname__ = name
+    method.__doc__ = f"Chaining shim for `{module_name}.{name}()`, loaded on first call."
+    return method
+
+
+class _CallbackLoader(importlib.abc.Loader):
+    """Wraps the loader of a module, runs the registered callbacks after the module is executed."""
+
+    def __init__(self, loader):
+        self._loader = loader
+
+    def create_module(self, spec):
+        return self._loader.create_module(spec)
+
+    def exec_module(self, module):
+        self._loader.exec_module(module)
+        # * callbacks leave the queue only now, a find_spec() probe without import keeps them registered
+        for callback in _pending.pop(module.__name__, []):
+            callback(module)
+
+    def __getattr__(self, name: str):
+        # * resource readers etc. come from the wrapped loader
+        return getattr(self._loader, name)
+
+
+class _ImportHook(importlib.abc.MetaPathFinder):
+    """Finds the spec of a pending module with the other finders and wraps its loader."""
+
+    def find_spec(self, fullname, path, target=None):
+        if fullname not in _pending:
+            return None
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, "find_spec"):
+                continue
+            spec = finder.find_spec(fullname, path, target)
+            if spec is not None and spec.loader is not None:
+                spec.loader = _CallbackLoader(spec.loader)
+                return spec
+        return None
+
+
+_hook = _ImportHook()
+
+
+def when_imported(module_name: str, callback) -> None:
+    """
+    Calls `callback(module)` as soon as the top level module `module_name` is imported, right away if it already is.
+    Used to extend classes of heavy optional backends (e.g. duckdb relations) without importing them.
+
+    Args:
+        module_name (str): Name of the module, e.g. `duckdb`.
+        callback (Callable): Receives the imported module.
+    """
+    if module_name in sys.modules:
+        callback(sys.modules[module_name])
+        return
+    _pending.setdefault(module_name, []).append(callback)
+    if _hook not in sys.meta_path:
+        sys.meta_path.insert(0, _hook)
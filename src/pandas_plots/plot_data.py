@@ -0,0 +1,67 @@
+"""
+Aggregated plot data, shared between the compute and the render stage of a plot function.
+
+    data = pls.plot_stacked_bars(df, top_n_index=10, return_data=True)   # compute + render
+    pls.plot_stacked_bars(data, renderer="svg")                           # render only
+    hlp.export_plot_data(data)                                            # export the aggregated data
+"""
+
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import Any, Mapping
+
+import pandas as pd
+
+
+@dataclass(frozen=True)
+class PlotData:
+    """
+    Immutable result of the compute stage of a plot function.
+
+    Passing it back to the function that created it skips the compute stage, so the raw data is not touched again.
+    Only render parameters (size, renderer, orientation, labels, png_path, alt_text) apply then.
+
+    Attributes:
+        kind (str): Name of the plot function that created it, e.g. "plot_stacked_bars".
+        frame (pd.DataFrame): Tidy aggregated data, one row per bar (segment).
+        color_map (Mapping[str, str]): Category of the color axis -> color.
+        category_orders (Mapping[str, tuple]): Axis name -> order of its categories.
+        title_parts (Mapping[str, str]): Parts of the title. `text` holds the complete title.
+        columns (Mapping[str, str]): Column of `frame` -> column name in the input data. These make up `to_frame()`.
+        n (float): Total of all values before top n filtering.
+        meta (Mapping[str, Any]): Compute options the render stage depends on.
+    """
+
+    kind: str
+    frame: pd.DataFrame
+    color_map: Mapping[str, str] = field(default_factory=dict)
+    category_orders: Mapping[str, tuple] = field(default_factory=dict)
+    title_parts: Mapping[str, str] = field(default_factory=dict)
+    columns: Mapping[str, str] = field(default_factory=dict)
+    n: float = 0
+    meta: Mapping[str, Any] = field(default_factory=dict)
+
+    def __post_init__(self):
+        # * detach from the caller's objects, so nothing can change the result afterwards
+        object.__setattr__(self, "frame", self.frame.copy())
+        object.__setattr__(self, "color_map", MappingProxyType(dict(self.color_map)))
+        object.__setattr__(
+            self, "category_orders", MappingProxyType({k: tuple(v) for k, v in self.category_orders.items()})
+        )
+        object.__setattr__(self, "title_parts", MappingProxyType(dict(self.title_parts)))
+        object.__setattr__(self, "columns", MappingProxyType(dict(self.columns)))
+        object.__setattr__(self, "meta", MappingProxyType(dict(self.meta)))
+
+    @property
+    def title(self) -> str:
+        return self.title_parts.get("text", "")
+
+    def to_frame(self) -> pd.DataFrame:
+        """Returns a copy of the aggregated data, reduced to `columns` and named like the input data."""
+        return self.frame[list(self.columns)].rename(columns=dict(self.columns)).reset_index(drop=True)
+
+    def _check_kind(self, kind: str) -> bool:
+        if self.kind != kind:
+            print(f"❌ data was computed by {self.kind}(), it can not be rendered by {kind}()")
+            return False
+        return True
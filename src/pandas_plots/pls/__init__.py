@@ -2,59 +2,51 @@
 pandas-plots pls module.
 
 This module contains all the plotting functions previously in the single pls.py file.
+Functions (and their plotting backends) are imported on first use.
 """
 
-from .plot_bars import plot_bars
-from .plot_box import plot_box
-from .plot_box_large import plot_box_large
-from .plot_boxes import plot_boxes
-from .plot_boxes_large import plot_boxes_large
-from .plot_facet_stacked_bars import plot_facet_stacked_bars
-from .plot_histogram import plot_histogram
-from .plot_histogram_large import plot_histogram_large
-from .plot_joint import plot_joint
-from .plot_pie import plot_pie
-from .plot_quadrants import plot_quadrants
-from .plot_sankey import plot_sankey
-from .plot_stacked_bars import plot_stacked_bars
-from .plot_upset import plot_upset
-from .plot_uml_graph import plot_uml_graph
-from .plot_venn2 import plot_venn2
-from .plot_venn3 import plot_venn3
+from ..lazy import attach, lazy_method
+
+# * public name -> defining module, resolved on first access
+_FUNCTIONS = {
+    "plot_quadrants": ".plot_quadrants",
+    "plot_stacked_bars": ".plot_stacked_bars",
+    "plot_bars": ".plot_bars",
+    "plot_histogram": ".plot_histogram",
+    "plot_histogram_large": ".plot_histogram_large",
+    "plot_joint": ".plot_joint",
+    "plot_box": ".plot_box",
+    "plot_box_large": ".plot_box_large",
+    "plot_boxes": ".plot_boxes",
+    "plot_boxes_large": ".plot_boxes_large",
+    "plot_facet_stacked_bars": ".plot_facet_stacked_bars",
+    "plot_sankey": ".plot_sankey",
+    "plot_pie": ".plot_pie",
+    "plot_upset": ".plot_upset",
+    "plot_uml_graph": ".plot_uml_graph",
+    "plot_venn2": ".plot_venn2",
+    "plot_venn3": ".plot_venn3",
+    # * result of return_data=True, can be passed back for re-rendering
+    "PlotData": "..plot_data",
+}
 
 # Re-export all functions to maintain the same interface
-__all__ = [
-    "plot_quadrants",
-    "plot_stacked_bars",
-    "plot_bars",
-    "plot_histogram",
-    "plot_histogram_large",
-    "plot_joint",
-    "plot_box",
-    "plot_box_large",
-    "plot_boxes",
-    "plot_boxes_large",
-    "plot_facet_stacked_bars",
-    "plot_sankey",
-    "plot_pie",
-    "plot_upset",
-    "plot_uml_graph",
-    "plot_venn2",
-    "plot_venn3",
-]
+__all__ = list(_FUNCTIONS)
+
+__getattr__, __dir__ = attach(__name__, functions=_FUNCTIONS)
 
 # Add methods to pandas DataFrame to enable chaining
 import pandas as pd
 
-pd.DataFrame.plot_bars = plot_bars
-pd.DataFrame.plot_stacked_bars = plot_stacked_bars
-pd.DataFrame.plot_facet_stacked_bars = plot_facet_stacked_bars
-pd.DataFrame.plot_stacked_box = plot_box
-pd.DataFrame.plot_stacked_boxes = plot_boxes
-pd.DataFrame.plot_quadrants = plot_quadrants
-pd.DataFrame.plot_histogram = plot_histogram
-pd.DataFrame.plot_joint = plot_joint
-pd.DataFrame.plot_sankey = plot_sankey
-pd.DataFrame.plot_pie = plot_pie
-pd.DataFrame.plot_upset = plot_upset
-pd.DataFrame.plot_uml_graph = plot_uml_graph
+pd.DataFrame.plot_bars = lazy_method(__name__, "plot_bars")
+pd.DataFrame.plot_stacked_bars = lazy_method(__name__, "plot_stacked_bars")
+pd.DataFrame.plot_facet_stacked_bars = lazy_method(__name__, "plot_facet_stacked_bars")
+pd.DataFrame.plot_stacked_box = lazy_method(__name__, "plot_box")
+pd.DataFrame.plot_stacked_boxes = lazy_method(__name__, "plot_boxes")
+pd.DataFrame.plot_quadrants = lazy_method(__name__, "plot_quadrants")
+pd.DataFrame.plot_histogram = lazy_method(__name__, "plot_histogram")
+pd.DataFrame.plot_joint = lazy_method(__name__, "plot_joint")
+pd.DataFrame.plot_sankey = lazy_method(__name__, "plot_sankey")
+pd.DataFrame.plot_pie = lazy_method(__name__, "plot_pie")
+pd.DataFrame.plot_upset = lazy_method(__name__, "plot_upset")
+pd.DataFrame.plot_uml_graph = lazy_method(__name__, "plot_uml_graph")
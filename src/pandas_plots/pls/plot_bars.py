@@ -1,18 +1,35 @@
 import os
+from dataclasses import replace
 from pathlib import Path
 from typing import Literal
 
+import numpy as np
 import pandas as pd
 import plotly.express as px
+import plotly.graph_objects as go
 
 from pandas_plots import const
 
-from ..helper import _add_alt_text, _assign_column_colors, _set_caption
-from ..hlp import *
+from ..helper import (
+    _MPL_MAX_LABELED_BARS,
+    _add_alt_text,
+    _assign_column_colors,
+    _mpl_color,
+    _mpl_figure,
+    _mpl_text,
+    _set_caption,
+    _set_category_ticks,
+    _show_mpl,
+    _use_matplotlib,
+)
+from ..hlp.mean_confidence_interval import mean_confidence_interval
+from ..cache import cached
+from ..labels import fmt_number, fmt_pct, join_labels
+from ..plot_data import PlotData
 
 
 def plot_bars(
-    df_in: pd.Series | pd.DataFrame,
+    df_in: pd.Series | pd.DataFrame | PlotData,
     caption: str = None,
     caption_only_n: bool = False,
     top_n_index: int = 0,
@@ -32,12 +49,16 @@ def plot_bars(
     renderer: Literal["png", "svg", None] = None,
     png_path: Path | str = None,
     alt_text: str = None,
-) -> None:
+    return_data: bool = False,
+    backend: Literal["plotly", "matplotlib", "auto"] = "plotly",
+) -> PlotData | None:
     """
     A function to plot a bar chart based on a *categorical* column (must be string or bool) and a numerical value.
     Accepts:
         - a dataframe w/ exactly 2 columns: string and numerical OR
         - a series, then value_counts() is applied upon to form the numercal, and use_ci is set to false
+        - a `PlotData` from a previous call, then it is rendered again without aggregating
+          (only orientation, null_label, precision, height, width, renderer, png_path and alt_text apply)
 
     Args:
         df_in: df or series.
@@ -67,9 +88,77 @@ def plot_bars(
         renderer: A string indicating the renderer to use for displaying the chart. It can be "png", "svg", or None. Default is None.
         png_path (Path | str, optional): The path to save the image as a png file. Defaults to None.
         alt_text (str, optional): Custom alt text for accessibility. Defaults to title or caption if not provided.
+        return_data (bool, optional): If True, returns the aggregated `PlotData` for re-rendering or `hlp.export_plot_data()`.
+        backend (Literal["plotly", "matplotlib", "auto"], optional): "matplotlib" renders a static image from the same data, colors
+            and labels, without plotly json and kaleido (`renderer` does not apply). "auto" uses matplotlib above
+            `helper.AUTO_BACKEND_MARKS` bars (segments). Defaults to "plotly".
 
-    Returns: None
+    Returns:
+        PlotData | None: The aggregated data if `return_data` is True.
     """
+    if backend not in ("plotly", "matplotlib", "auto"):
+        print(f"❌ backend must be one of 'plotly', 'matplotlib', 'auto', got '{backend}'")
+        return
+    if isinstance(df_in, PlotData):
+        data = df_in
+        if not data._check_kind("plot_bars"):
+            return
+    else:
+        data = _compute_bars(
+            df_in=df_in,
+            top_n_index=top_n_index,
+            top_n_minvalue=top_n_minvalue,
+            dropna=dropna,
+            sort_values=sort_values,
+            use_ci=use_ci,
+            ci_agg=ci_agg,
+        )
+        if data is None:
+            return
+        # * title and labels are applied to the (cached) aggregation, changing them never reruns the groupby
+        data = _decorate_bars(data, caption=caption, caption_only_n=caption_only_n, title=title, normalize=normalize)
+
+    render_args = dict(
+        orientation=orientation,
+        null_label=null_label,
+        precision=precision,
+        height=height,
+        width=width,
+    )
+
+    # * set axis title
+    alt_text = alt_text or title or caption
+    _add_alt_text(alt_text)
+
+    if _use_matplotlib(backend, len(data.frame)):
+        _show_mpl(_render_bars_mpl(data, **render_args), png_path)
+        return data if return_data else None
+
+    _fig = _render_bars(data, **render_args)
+    _fig.show(
+        renderer=renderer or os.getenv("RENDERER"),
+        width=width,
+        height=height,
+    )
+
+    # * save to png if path is provided
+    if png_path is not None:
+        _fig.write_image(Path(png_path).as_posix())
+
+    return data if return_data else None
+
+
+@cached
+def _compute_bars(
+    df_in: pd.Series | pd.DataFrame,
+    top_n_index: int,
+    top_n_minvalue: int,
+    dropna: bool,
+    sort_values: bool,
+    use_ci: bool,
+    ci_agg: Literal["mean", "median"],
+) -> PlotData | None:
+    """Compute stage of plot_bars: grouping, top n and sorting. Title and labels are added by `_decorate_bars`."""
     # * if series, apply value_counts, deselect use_ci
     if isinstance(df_in, pd.Series):
         if df_in.dtype.kind not in ["O", "b"]:
@@ -102,8 +191,6 @@ def plot_bars(
     col_index = df_in.columns[0]
     col_name = df_in.columns[1]
 
-    color_palette = const.COLOR_BLUE_LIGHT if os.getenv("THEME") == "dark" else const.COLOR_BLUE_DARK
-
     # * ensure df is grouped to prevent false aggregations, reset index to return df
     if use_ci:
         # * grouping is smoother on df than on series
@@ -124,9 +211,7 @@ def plot_bars(
             )
             .reset_index()
         )
-        # * enforce vertical bars **when using ci**, normalize=False, dropna=True, set empty margin to 0 to avoid dropping the bar
-        orientation = "v"
-        normalize = False
+        # * enforce vertical bars **when using ci** (see render), normalize=False (see _decorate_bars), dropna=True, set empty margin to 0 to avoid dropping the bar
         dropna = True
         df["margin"] = df["margin"].fillna(0)
     else:
@@ -147,26 +232,8 @@ def plot_bars(
     # * after grouping add cols for pct and formatting
     df["pct"] = df[df.columns[1]] / n
 
-    # * format output
-    df["cnt_str"] = df[df.columns[1]].apply(lambda x: f"{x:_.{precision}f}")
-
-    divider = "<br>" if orientation == "v" else " "
-    df["cnt_pct_str"] = df.apply(lambda row: f"{row['cnt_str']}{divider}({row['pct']:.1%})", axis=1)
-    # * format output for ci
-    df["ci_str"] = (
-        None
-        if not use_ci
-        else df.apply(
-            lambda row: (
-                f"{row['cnt_str']}{divider}[{row['mean'] - row['margin']:_.{precision}f};{row['mean'] + row['margin']:_.{precision}f}]"
-            ),
-            axis=1,
-        )
-    )
-
     # * set col vars according to config
     col_value = "pct" if not use_ci else df.columns[1]
-    col_value_str = "ci_str" if use_ci else "cnt_pct_str" if normalize else "cnt_str"
     # return df
 
     # * if top n selected
@@ -181,13 +248,6 @@ def plot_bars(
     if top_n_minvalue > 0:
         df = df[df.iloc[:, 1] >= top_n_minvalue]
 
-    # * get longest bar
-    bar_length_multiplier = 1.1 if normalize else 1.05
-    bar_max = (
-        df.groupby(col_index, dropna=False)[col_value].sum().sort_values(ascending=False).iloc[0]
-        * bar_length_multiplier
-    )
-
     # * are TOP n selected? include in default title
     _title_str_top = f"TOP {top_n_index} " if top_n_index > 0 else ""
 
@@ -200,19 +260,84 @@ def plot_bars(
     # * title str na
     _title_str_null = ", NULL excluded" if dropna else ""
 
-    if caption_only_n:
-        title_str = _title_str_n
-    elif title:
-        title_str = f"{title}, {_title_str_n}"
-    else:
-        title_str = f"{_set_caption(caption)}{_title_str_minval}{_title_str_top}[{col_name}] by [{col_index}]{_title_str_null}, {_title_str_n}"
-
     # * sort df
     df = df.sort_values(
         col_value if sort_values else col_index,
         ascending=False if sort_values else True,
     )
 
+    return PlotData(
+        kind="plot_bars",
+        frame=df,
+        category_orders={"index": df[col_index].unique().tolist()},
+        title_parts={
+            "top": _title_str_top,
+            "minval": _title_str_minval,
+            "subject": f"[{col_name}] by [{col_index}]",
+            "null": _title_str_null,
+            "n": _title_str_n,
+        },
+        columns={col_index: col_index, **({"mean": "mean", "margin": "margin"} if use_ci else {col_name: col_name})},
+        n=n,
+        meta={
+            "col_value": col_value,
+            "use_ci": use_ci,
+            "ci_agg": ci_agg,
+        },
+    )
+
+
+def _decorate_bars(data: PlotData, caption: str, caption_only_n: bool, title: str, normalize: bool) -> PlotData:
+    """Cosmetic part of the compute stage of plot_bars: title and the normalize flag of the labels."""
+    parts = data.title_parts
+    if caption_only_n:
+        title_str = parts["n"]
+    elif title:
+        title_str = f"{title}, {parts['n']}"
+    else:
+        title_str = f"{_set_caption(caption)}{parts['minval']}{parts['top']}{parts['subject']}{parts['null']}, {parts['n']}"
+
+    return replace(
+        data,
+        title_parts={"text": title_str, "caption": _set_caption(caption), **parts},
+        # * ci enforces absolute values
+        meta={**data.meta, "normalize": normalize and not data.meta["use_ci"]},
+    )
+
+
+def _render_bars(
+    data: PlotData,
+    orientation: Literal["h", "v"],
+    null_label: str,
+    precision: int,
+    height: int,
+    width: int,
+) -> go.Figure:
+    """Render stage of plot_bars, builds the figure from the aggregated data."""
+    df = data.frame.copy()
+    col_index = df.columns[0]
+    col_value = data.meta["col_value"]
+    normalize = data.meta["normalize"]
+    use_ci = data.meta["use_ci"]
+    ci_agg = data.meta["ci_agg"]
+
+    # * ci enforces vertical bars
+    if use_ci:
+        orientation = "v"
+
+    # * bar colors follow the theme, so they are resolved here and not in the compute stage
+    color_palette = const.COLOR_BLUE_LIGHT if os.getenv("THEME") == "dark" else const.COLOR_BLUE_DARK
+
+    divider = "<br>" if orientation == "v" else " "
+    col_value_str = _add_text_columns(df, precision, divider, normalize, use_ci)
+
+    # * get longest bar
+    bar_length_multiplier = 1.1 if normalize else 1.05
+    bar_max = (
+        df.groupby(col_index, dropna=False)[col_value].sum().sort_values(ascending=False).iloc[0]
+        * bar_length_multiplier
+    )
+
     # * assign colors AFTER sorting, so palette order matches bar order
     colors_unique = df[col_index].unique().tolist()
     color_map = _assign_column_colors(
@@ -227,7 +352,7 @@ def plot_bars(
         text=col_value_str,
         orientation=orientation,
         # * retrieve the original columns from series
-        title=title_str,
+        title=data.title,
         # * retrieve theme from env (intro.set_theme) or default
         template="plotly_dark" if os.getenv("THEME") == "dark" else "plotly",
         error_y=None if not use_ci else df["margin"],
@@ -303,17 +428,80 @@ def plot_bars(
             yaxis_title="median",
         )
 
-    # * set axis title
-    alt_text = alt_text or title or caption
-    _add_alt_text(alt_text)
-    _fig.show(
-        renderer=renderer or os.getenv("RENDERER"),
-        width=width,
-        height=height,
+    return _fig
+
+def _add_text_columns(df: pd.DataFrame, precision: int, divider: str, normalize: bool, use_ci: bool) -> str:
+    """Adds the label columns to the aggregated data (in place), returns the name of the column to show."""
+    # * format output
+    df["cnt_str"] = fmt_number(df[df.columns[1]], precision)
+
+    df["cnt_pct_str"] = join_labels(df["cnt_str"], fmt_pct(df["pct"], 1), divider)
+    # * format output for ci
+    df["ci_str"] = (
+        None
+        if not use_ci
+        else join_labels(
+            df["cnt_str"],
+            fmt_number(df["mean"] - df["margin"], precision) + ";" + fmt_number(df["mean"] + df["margin"], precision),
+            divider,
+            brackets="[]",
+        )
     )
 
-    # * save to png if path is provided
-    if png_path is not None:
-        _fig.write_image(Path(png_path).as_posix())
+    return "ci_str" if use_ci else "cnt_pct_str" if normalize else "cnt_str"
+
+
+def _render_bars_mpl(
+    data: PlotData,
+    orientation: Literal["h", "v"],
+    null_label: str,
+    precision: int,
+    height: int,
+    width: int,
+):
+    """Render stage of plot_bars for backend="matplotlib", same data, colors and labels as the plotly figure."""
+    df = data.frame.copy()
+    col_index = df.columns[0]
+    col_value = data.meta["col_value"]
+    normalize = data.meta["normalize"]
+    use_ci = data.meta["use_ci"]
+
+    # * ci enforces vertical bars
+    if use_ci:
+        orientation = "v"
 
-    return
+    color_palette = const.COLOR_BLUE_LIGHT if os.getenv("THEME") == "dark" else const.COLOR_BLUE_DARK
+    col_value_str = _add_text_columns(df, precision, "\n", normalize, use_ci)
+    color_map = _assign_column_colors(
+        df[col_index].unique().tolist(), color_palette, null_label, first_col_grey=False, sort_columns=False
+    )
+
+    fig, axes = _mpl_figure(width, height)
+    ax = axes[0, 0]
+    draw = ax.bar if orientation == "v" else ax.barh
+    bars = draw(
+        np.arange(len(df)),
+        df[col_value].to_numpy(dtype=float),
+        0.8,
+        color=[_mpl_color(color_map[c]) for c in df[col_index]],
+        **({"yerr": df["margin"].to_numpy(dtype=float), "capsize": 4} if use_ci else {}),
+    )
+    if len(df) <= _MPL_MAX_LABELED_BARS:
+        ax.bar_label(bars, labels=df[col_value_str].tolist(), label_type="center" if use_ci else "edge", fontsize=8)
+    _set_category_ticks(ax, df[col_index].tolist(), orientation)
+
+    # * leave room for labels outside, ci errorbars are auto-handled
+    if not use_ci and len(df):
+        bar_max = df[col_value].max() * (1.1 if normalize else 1.05)
+        if orientation == "v":
+            ax.set_ylim(0, bar_max * 1.05)
+        else:
+            ax.set_xlim(0, bar_max)
+
+    ax.grid(True, axis="y" if orientation == "v" else "x", alpha=0.3)
+    ax.set_axisbelow(True)
+    ax.set_title(_mpl_text(data.title), loc="left")
+    value_title = "median" if data.meta["ci_agg"] == "median" else "value"
+    ax.set_xlabel("index" if orientation == "v" else value_title)
+    ax.set_ylabel(value_title if orientation == "v" else "index")
+    return fig
@@ -5,9 +5,10 @@ from typing import Literal
 import pandas as pd
 import plotly.express as px
 
-from ..helper import _add_alt_text, _set_caption
-from ..hlp import *
+from ..helper import STATS_MAX_POINTS, _add_alt_text, _set_box_stats, _set_caption, _use_stats
+from ..hlp.to_series import to_series
 from ..tbl import print_summary
+from ..tbl.print_summary import _box_stats
 
 
 def plot_box(
@@ -29,11 +30,12 @@ def plot_box(
     renderer: Literal["png", "svg", None] = None,
     alt_text: str = None,
     plot: bool = True,
+    mode: Literal["raw", "stats", "auto"] = "auto",
 ) -> None:
     """
     Plots a horizontal box plot for the given pandas Series.
 
-    ⚠️ DEPRECATION WARNING: on large dataframes, this diagram will be EXTREMELY bloated. use the `_large` version!
+    ⚠️ DEPRECATION WARNING: with mode="raw" on large dataframes, this diagram will be EXTREMELY bloated. use mode="stats" or the `_large` version!
 
     Args:
         ser: The pandas Series to plot.
@@ -53,16 +55,25 @@ def plot_box(
         png_path (Path | str, optional): The path to save the image as a png file. Defaults to None.
         renderer (Literal["png", "svg", None], optional): The renderer to use for saving the image. Defaults to None.
         alt_text (str, optional): Custom alt text for accessibility. Defaults to title or caption if not provided.
+        mode (Literal["raw", "stats", "auto"]): "raw" hands all values to plotly, "stats" draws the box from precomputed
+            quartiles and whiskers with at most `helper.STATS_MAX_POINTS` points, so the figure size does not grow with the rows.
+            "auto" uses "stats" above `helper.AUTO_STATS_ROWS` rows. Violins always need the raw values. Defaults to "auto".
 
     Returns: None
     """
     ser = to_series(ser)
     if ser is None:
         return
+    if mode not in ("raw", "stats", "auto"):
+        print(f"❌ mode must be one of 'raw', 'stats', 'auto', got '{mode}'")
+        return
+    if violin and mode == "stats":
+        print("❌ violin needs the raw values, use mode='raw' or 'auto'")
+        return
 
     # * drop na to keep scipy sane
     n_ = len(ser)
-    ser.dropna(inplace=True)
+    ser = ser.dropna()
     # n = len(ser)
 
     if plot:
@@ -90,8 +101,11 @@ def plot_box(
         else:
             plot_title = f"{_set_caption(caption)} [{ser.name}]{log_str}, {n_str}"
 
+        # * stats mode: px draws a stub with one value, the box is filled with the stats afterwards
+        use_stats = not violin and _use_stats(mode, len(ser))
+
         dict = {
-            "data_frame": ser,
+            "data_frame": pd.Series([0.0], name=ser.name) if use_stats else ser,
             "orientation": "h",
             "template": "plotly_dark" if os.getenv("THEME") == "dark" else "plotly",
             "points": points,
@@ -102,6 +116,10 @@ def plot_box(
         }
 
         fig = px.violin(**{**dict, "box": True}) if violin else px.box(**dict)
+        if use_stats:
+            box_points = "outliers" if points is None else points
+            box = _box_stats(None, ser, points=box_points, max_points=STATS_MAX_POINTS)
+            _set_box_stats(fig, box, box_points)
 
         if (x_min or x_min == 0) and (x_max or x_max == 0):
             fig.update_xaxes(range=[x_min, x_max])
@@ -1,15 +1,13 @@
-import os
 from math import e
 from pathlib import Path
 from typing import Literal
 
 import pandas as pd
-import seaborn as sb
-from matplotlib import pyplot as plt
 
-from ..helper import _add_alt_text, _set_caption
-from ..hlp import *
+from ..helper import STATS_MAX_POINTS, _add_alt_text, _draw_boxes_mpl, _mpl_figure, _set_caption, _show_mpl
+from ..hlp.to_series import to_series
 from ..tbl import print_summary
+from ..tbl.print_summary import _box_stats
 
 
 def plot_box_large(
@@ -30,18 +28,20 @@ def plot_box_large(
     use_log: bool = False,
     png_path: Path | str = None,
     alt_text: str = None,
+    bw_method: Literal["scott", "silverman"] | float = "scott",
 ) -> None:
     """
     Plots a horizontal box or violin plot for a pandas Series.
 
     This function is designed to handle large datasets efficiently by rendering a
-    static image instead of a large interactive plot structure.
+    static image instead of a large interactive plot structure. The box statistics are computed
+    once from a sorted copy of the values and drawn with matplotlib (`Axes.bxp`, violins from a binned kde).
 
     Args:
         ser: The pandas Series containing the data to plot.
         points: Controls outlier visibility. 'all' or 'outliers' shows fliers;
                 None or 'suspectedoutliers' hides them (Plotly's distinct types
-                are not fully supported by Seaborn's static output).
+                are not fully supported by matplotlib's static output).
         precision: The decimal precision for the annotation labels.
         height: The height of the plot figure in pixels (scaled to Matplotlib inches).
         width: The width of the plot figure in pixels (scaled to Matplotlib inches).
@@ -59,9 +59,11 @@ def plot_box_large(
         png_path (Path | str, optional): The file path to save the generated image.
                                         The plot will be saved in PNG format.
         renderer (Literal["png", "svg", None], optional): This argument is maintained
-                for compatibility but is **ignored** as Seaborn/Matplotlib uses
+                for compatibility but is **ignored** as Matplotlib uses
                 `plt.show()` for display.
         alt_text (str, optional): Custom alt text for accessibility. Defaults to title or caption if not provided.
+        bw_method (Literal["scott", "silverman"] | float): bandwidth rule of the violin kdes, or a factor of the std
+            like in scipy.stats.gaussian_kde. Defaults to "scott".
 
     Returns:
         None
@@ -79,20 +81,14 @@ def plot_box_large(
     # ----------------------------------------------------
 
     if plot:
-        # * apply theme early
-        if os.getenv("THEME") == "dark":
-            plt.style.use("dark_background")
-        else:
-            plt.style.use("default")
-
-        # Seaborn/Matplotlib setup for size
-        # figsize takes (width, height) in inches, so we scale by a factor (e.g., 100 DPI)
-        scale_factor = 100
-        plt.figure(figsize=(width / scale_factor, height / scale_factor))
+        # * box stats from one sort of the values, no frame and no per-row category column
+        showfliers = points != "suspectedoutliers"
+        box = _box_stats(
+            None, ser, points="outliers" if showfliers and not violin else None, max_points=STATS_MAX_POINTS, keep_sorted=violin
+        )
 
-        # Create a dummy DataFrame suitable for Seaborn's y/x mapping for a single Series
-        # We use 'value' for the numeric data and a constant 'category' for the y-axis
-        df_plot = pd.DataFrame({"value": ser.values, "category": ser.name or "Series"})
+        fig, axes = _mpl_figure(width, height)
+        ax = axes[0, 0]
 
         log_str = " (log-scale)" if use_log else ""
         n_str = f"n={n_:_}"
@@ -103,44 +99,21 @@ def plot_box_large(
         else:
             plot_title = f"{_set_caption(caption)} [{ser.name}]{log_str}, {n_str}"
 
-        # ----------------------------------------------------
-        # --- Seaborn Plotting ---
-        # ----------------------------------------------------
-
-        if violin:
-            # Use violinplot
-            ax = sb.violinplot(
-                data=df_plot,
-                x="value",
-                y="category",
-                orient="h",
-                cut=0,  # Seaborn argument to control how far the plot extends past whiskers
-                inner="box",  # Show a mini boxplot inside the violin
-            )
-        else:
-            # Use boxplot
-            # The 'points' argument is partially supported via 'fliersize' and 'showfliers'
-
-            # Determine flier/outlier display
-            showfliers = True
-            flier_size = 5  # Default size
-            if points == "outliers" or points == "all":
-                showfliers = True
-            elif points is None or points == "suspectedoutliers":
-                # Note: Seaborn/Matplotlib doesn't distinguish between 'outliers' and 'suspected' like Plotly
-                # 'suspectedoutliers' is not directly translatable, so we'll treat it as 'None' (no fliers)
-                if points == "suspectedoutliers":
-                    showfliers = False
-
-            ax = sb.boxplot(
-                data=df_plot,
-                x="value",
-                y="category",
-                orient="h",
-                palette="tab10",
-                showfliers=showfliers,
-                flierprops={"markerfacecolor": "red", "markersize": flier_size} if showfliers else {},
-            )
+        # * matplotlib draws the stats: Axes.violin with a binned kde and an inner box, or Axes.bxp
+        # * 'suspectedoutliers' is not translatable to matplotlib, it hides the fliers
+        _draw_boxes_mpl(
+            ax,
+            box,
+            [ser.name or "Series"],
+            ["tab:blue"],
+            orientation="h",
+            width=0.8,
+            violin=violin,
+            showfliers=showfliers,
+            flierprops={"markerfacecolor": "red", "markersize": 5},
+            bw_method=bw_method,
+        )
+        ax.set_xlabel("value")
 
         # Apply axis limits and scale
         if use_log:
@@ -159,13 +132,13 @@ def plot_box_large(
         # --- Annotations ---
         # ----------------------------------------------------
 
-        # Recalculate stats for annotations
-        median = ser.median()
-        mean = ser.mean()
-        q25 = ser.quantile(0.25)
-        q75 = ser.quantile(0.75)
-        min_val = ser.min()
-        max_val = ser.max()
+        # * annotations from the same stats
+        median = box["median"][0]
+        mean = box["mean"][0]
+        q25 = box["q25"][0]
+        q75 = box["q75"][0]
+        min_val = box["min"][0]
+        max_val = box["max"][0]
         iqr = q75 - q25
 
         # Calculate fences (Matplotlib standard)
@@ -204,24 +177,9 @@ def plot_box_large(
                     fontsize=8,
                 )
 
-        # height: int = 200, # Handled by plt.figure(figsize=...)
-        # width: int = 1200, # Handled by plt.figure(figsize=...)
-        # caption: str = None, # Handled in title
-        # renderer: Literal["png", "svg", None] = None, # NOT SUPPORTED/COMMENTED OUT
-
-        # Display the plot
-        plt.tight_layout()
         alt_text = alt_text or title or caption
         _add_alt_text(alt_text)
-        plt.show()
-
-        # * save to png if path is provided
-        if png_path is not None:
-            plt.savefig(Path(png_path).as_posix(), format="png")
-
-        # Clear the figure to prevent display issues if multiple plots are run
-        plt.close()
-        plt.style.use("default")
+        _show_mpl(fig, png_path)
 
     if summary:
         print_summary(ser.to_frame())
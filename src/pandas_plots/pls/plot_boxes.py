@@ -2,14 +2,23 @@ import os
 from pathlib import Path
 from typing import Literal
 
+import numpy as np
 import pandas as pd
 import plotly.express as px
 
 from pandas_plots import const
 
-from ..helper import _add_alt_text, _assign_column_colors, _set_caption
-from ..hlp import *
+from ..helper import (
+    STATS_MAX_POINTS,
+    _add_alt_text,
+    _assign_column_colors,
+    _project,
+    _set_box_stats,
+    _set_caption,
+    _use_stats,
+)
 from ..tbl import print_summary
+from ..tbl.print_summary import _box_stats
 
 
 def plot_boxes(
@@ -33,11 +42,12 @@ def plot_boxes(
     first_col_grey: bool = False,
     alt_text: str = None,
     plot: bool = True,
+    mode: Literal["raw", "stats", "auto"] = "auto",
 ) -> None:
     """
     Plot vertical boxes for each unique item in the DataFrame and add annotations for statistics.
 
-    ⚠️: on large dataframes, this diagram will be EXTREMELY bloated. use the `_large` version!
+    ⚠️: with mode="raw" on large dataframes, this diagram will be EXTREMELY bloated. use mode="stats" or the `_large` version!
 
     if facet_col is not None, the plot will be faceted by facet_col. facet_col must be last column
 
@@ -63,6 +73,9 @@ def plot_boxes(
         null_label (str): Label for null values.
         first_col_grey (bool): If True, sets the first category to grey.
         alt_text (str, optional): Custom alt text for accessibility. Defaults to title or caption if not provided.
+        mode (Literal["raw", "stats", "auto"]): "raw" hands all values to plotly, "stats" draws the boxes from precomputed
+            quartiles and whiskers with at most `helper.STATS_MAX_POINTS` points per box, so the figure size grows with
+            the boxes, not the rows. "auto" uses "stats" above `helper.AUTO_STATS_ROWS` rows. Defaults to "auto".
 
     Returns: None
     """
@@ -74,6 +87,9 @@ def plot_boxes(
     ):
         print("❌ df must have 2 or 3 columns: [0] str or bool, [1] num, [2] (optional) str")
         return
+    if mode not in ("raw", "stats", "auto"):
+        print(f"❌ mode must be one of 'raw', 'stats', 'auto', got '{mode}'")
+        return
     # * layout gaps
     xlvl1 = -50
     xlvl2 = 0
@@ -82,6 +98,9 @@ def plot_boxes(
     col_cat = df.columns[0]
     col_num = df.columns[1]
 
+    # * labels are replaced column-wise on a projection, the caller's df stays untouched
+    df = _project(df)
+
     # * handle null values FIRST before any type conversion
     df[col_cat] = df[col_cat].fillna(null_label)
     # Also replace pd.NA and string "nan" / "<NA>" that may result from conversion
@@ -89,7 +108,7 @@ def plot_boxes(
 
     # * type of col0 must be str, not object. otherwise px.box will fail since sorting will fail
     if pd.api.types.is_object_dtype(df.iloc[:, 0]):
-        df.iloc[:, 0] = df.iloc[:, 0].astype(str)
+        df[col_cat] = df[col_cat].astype(str)
 
     # * unique items
     # Sort the unique items alphabetically
@@ -108,12 +127,24 @@ def plot_boxes(
         plot_title = f"{_set_caption(caption)} [{df.columns[0]}] by [{df.columns[1]}]{log_str}, {n_str}"
 
     if plot:
+        # * stats mode: px draws a stub with one row per box (value = index of the box), filled with the stats afterwards
+        use_stats = _use_stats(mode, len(df))
+        if use_stats:
+            keys = [col_cat, facet_col] if facet_col else [col_cat]
+            groups = df.groupby(keys, sort=False, dropna=False)
+            data = groups.size().reset_index()[keys]
+            data.insert(1, col_num, np.arange(len(data), dtype=float))
+            box_points = "outliers" if points is None else points
+            box = _box_stats(groups.ngroup(), df[col_num], list(range(len(data))), box_points, STATS_MAX_POINTS)
+        else:
+            data = df
+
         # * main plot
         fig = px.box(
-            df,
-            x=df.iloc[:, 0],
-            y=df.iloc[:, 1],
-            color=df.iloc[:, 0],
+            data,
+            x=data.iloc[:, 0],
+            y=data.iloc[:, 1],
+            color=data.iloc[:, 0],
             facet_col=facet_col,
             template="plotly_dark" if os.getenv("THEME") == "dark" else "plotly",
             orientation="v",
@@ -122,6 +153,8 @@ def plot_boxes(
             color_discrete_map=color_map,
             title=plot_title,
         )
+        if use_stats:
+            _set_box_stats(fig, box, box_points)
 
         # * Set the order of the x-axis categories
         fig.update_xaxes(categoryorder="array", categoryarray=items)
@@ -129,15 +162,16 @@ def plot_boxes(
         # * yshift is trivial
         YS = 0
 
-        # * loop annotations
+        # * loop annotations, stats of all items from one sort by item
         if annotations:
+            box = _box_stats(df[col_cat], df[col_num], items)
             for i, item in enumerate(items):
-                max = round(df[df.iloc[:, 0] == item].iloc[:, 1].max(), precision)
-                min = round(df[df.iloc[:, 0] == item].iloc[:, 1].min(), precision)
-                mean = round(df[df.iloc[:, 0] == item].iloc[:, 1].mean(), precision)
-                median = round(df[df.iloc[:, 0] == item].iloc[:, 1].median(), precision)
-                q25 = round(df[df.iloc[:, 0] == item].iloc[:, 1].quantile(0.25), precision)
-                q75 = round(df[df.iloc[:, 0] == item].iloc[:, 1].quantile(0.75), precision)
+                max = round(box["max"][i], precision)
+                min = round(box["min"][i], precision)
+                mean = round(box["mean"][i], precision)
+                median = round(box["median"][i], precision)
+                q25 = round(box["q25"][i], precision)
+                q75 = round(box["q75"][i], precision)
                 fence0_ = round(q25 - 1.5 * (q75 - q25), precision)
                 fence0 = fence0_ if fence0_ > min else min
                 fence1_ = round(q75 + 1.5 * (q75 - q25), precision)
@@ -1,16 +1,23 @@
-import os
 from pathlib import Path
 from typing import Literal
 
+import numpy as np
 import pandas as pd
-import seaborn as sb
-from matplotlib import pyplot as plt
 
 from pandas_plots import const
 
-from ..helper import _add_alt_text, _assign_column_colors, _set_caption
-from ..hlp import *
+from ..helper import (
+    STATS_MAX_POINTS,
+    _add_alt_text,
+    _assign_column_colors,
+    _draw_boxes_mpl,
+    _mpl_color,
+    _mpl_figure,
+    _set_caption,
+    _show_mpl,
+)
 from ..tbl import print_summary
+from ..tbl.print_summary import _box_stats
 
 
 def plot_boxes_large(
@@ -32,10 +39,12 @@ def plot_boxes_large(
     first_col_grey: bool = False,
     alt_text: str = None,
     plot: bool = True,
+    bw_method: Literal["scott", "silverman"] | float = "scott",
 ) -> None:
     """
-    Plots vertical box plots for each unique item in the DataFrame using Seaborn/Matplotlib.
-    Use it for large datasets.
+    Plots vertical box plots for each unique item in the DataFrame using Matplotlib.
+    Use it for large datasets: the box statistics are computed from one sort by category and drawn
+    with `Axes.bxp` (violins from binned kdes), no per-row label column is allocated.
 
     Args:
         df (pd.DataFrame): The input DataFrame with two columns: [0] str or bool (category),
@@ -60,6 +69,8 @@ def plot_boxes_large(
         null_label (str): Label for null values.
         first_col_grey (bool): If True, sets the first category to grey.
         alt_text (str, optional): Custom alt text for accessibility. Defaults to title or caption if not provided.
+        bw_method (Literal["scott", "silverman"] | float): bandwidth rule of the violin kdes, or a factor of the std
+            like in scipy.stats.gaussian_kde. Defaults to "scott".
 
     Returns: None
     """
@@ -72,36 +83,34 @@ def plot_boxes_large(
         print("❌ df must have 2 columns: [0] str or bool, [1] num")
         return
 
-    # * Prepare DataFrame for Seaborn
     col_cat, col_num = df.columns[0], df.columns[1]
 
-    # * handle null values FIRST before any type conversion
-    df[col_cat] = df[col_cat].fillna(null_label)
-    # Also replace pd.NA and string "nan" / "<NA>" that may result from conversion
-    df[col_cat] = df[col_cat].replace([pd.NA, "nan", "<NA>"], null_label)
-
-    # * type of col0 must be str, not object
-    if pd.api.types.is_object_dtype(df.iloc[:, 0]):
-        df.loc[:, col_cat] = df[col_cat].astype(str)
-
-    # * Sort by category
-    df = df.sort_values(col_cat)
+    # * labels per distinct category, not per row: nulls and "nan" / "<NA>" become null_label, object keys become str
+    is_object = pd.api.types.is_object_dtype(df[col_cat])
+    codes, uniques = pd.factorize(df[col_cat], use_na_sentinel=False)
+    labels = [null_label if pd.isna(u) or u in ("nan", "<NA>") else str(u) if is_object else u for u in uniques]
+    categories = sorted(set(labels))
+    # * int codes into the sorted categories, the only per-row key
+    position = {label: i for i, label in enumerate(categories)}
+    codes = np.array([position[label] for label in labels], dtype=np.intp)[codes]
 
     if plot:
-        # * Set theme and figure size
-        if os.getenv("THEME") == "dark":
-            plt.style.use("dark_background")
-        else:
-            plt.style.use("default")
-
-        scale_factor = 100
-        plt.figure(figsize=(width / scale_factor, height / scale_factor))
+        showfliers = points != "suspectedoutliers"
+        box = _box_stats(
+            codes,
+            df[col_num],
+            range(len(categories)),
+            points="outliers" if showfliers and not violin else None,
+            max_points=STATS_MAX_POINTS,
+            keep_sorted=violin,
+        )
+
+        fig, axes = _mpl_figure(width, height)
+        ax = axes[0, 0]
 
         # * assign colors
-        colors_unique = df[col_cat].unique().tolist()
-        color_map = _assign_column_colors(colors_unique, color_palette, null_label, first_col_grey)
-        # convert dict to list in the order of colors_unique
-        color_list = [color_map[cat] for cat in colors_unique]
+        color_map = _assign_column_colors(categories, color_palette, null_label, first_col_grey)
+        color_list = [_mpl_color(color_map[cat]) for cat in categories]
 
         # * Title and Labels
         log_str = " (log-scale)" if use_log else ""
@@ -113,64 +122,42 @@ def plot_boxes_large(
         else:
             plot_title = f"{_set_caption(caption)} [{col_cat}] by [{col_num}]{log_str}, {n_str}"
 
-        # * Determine flier/outlier display
-        showfliers = True
-        flier_size = 5
-        if points == "outliers" or points == "all":
-            showfliers = True
-        elif points is None or points == "suspectedoutliers":
-            # Plotly's 'suspectedoutliers' is not directly translatable, treat as None (hide fliers)
-            if points == "suspectedoutliers":
-                showfliers = False
-
-        # * Main Plotting with Seaborn - Use Boxplot or Violinplot
-        if violin:
-            sb.violinplot(
-                data=df,
-                x=col_cat,
-                y=col_num,
-                hue=col_cat,
-                palette=color_list,
-                width=box_width,
-                inner="box" if not use_log else None,  # inner="box" is standard for violin
-                ax=plt.gca(),
-            )
-        else:
-            sb.boxplot(
-                data=df,
-                x=col_cat,
-                y=col_num,
-                hue=col_cat,
-                palette=color_list,
-                width=box_width,
-                showfliers=showfliers,
-                flierprops={"markerfacecolor": "white", "markersize": flier_size} if showfliers else {},
-                ax=plt.gca(),
-            )
+        # * matplotlib draws the stats: Axes.violin with a binned kde (cut=2 like seaborn), or Axes.bxp
+        # * Plotly's 'suspectedoutliers' is not directly translatable, it hides the fliers
+        _draw_boxes_mpl(
+            ax,
+            box,
+            categories,
+            color_list,
+            orientation="v",
+            width=box_width,
+            violin=violin,
+            inner=not use_log,
+            cut=2,
+            showfliers=showfliers,
+            flierprops={"markerfacecolor": "white", "markersize": 5},
+            bw_method=bw_method,
+        )
+        ax.set_xlabel(col_cat)
+        ax.set_ylabel(col_num)
 
         # * Apply log scale and title
-        ax = plt.gca()
         if use_log:
             ax.set_yscale("log")  # Vertical plot means log scale is applied to y-axis
 
         ax.set_title(plot_title)
 
         # * Display the plot
-        plt.tight_layout()
         alt_text = alt_text or title or caption
         _add_alt_text(alt_text)
-        plt.show()
-
-        # * save to png if path is provided
-        if png_path is not None:
-            plt.savefig(Path(png_path).as_posix(), format="png", transparent=False)
-
-        plt.close()
-        plt.style.use("default")  # Reset style
+        _show_mpl(fig, png_path)
 
     if summary:
-        _df_sorted = df.sort_values(col_cat)
-        print_summary(df=_df_sorted, precision=precision, sparse=False)
-        print_summary(df=_df_sorted, precision=precision, sparse=True)
+        # * the labels as categorical, sorted like the categories
+        df = pd.DataFrame(
+            {col_cat: pd.Categorical.from_codes(codes, categories), col_num: df[col_num]}, index=df.index, copy=False
+        )
+        print_summary(df=df, precision=precision, sparse=False)
+        print_summary(df=df, precision=precision, sparse=True)
 
     return
@@ -1,6 +1,9 @@
+from __future__ import annotations
+
 import os
+from dataclasses import replace
 from pathlib import Path
-from typing import Literal, Optional
+from typing import TYPE_CHECKING, Literal, Optional
 
 import pandas as pd
 import plotly.express as px
@@ -9,11 +12,30 @@ import plotly.graph_objects as go
 from pandas_plots import const
 
 # from ..hlp import *
-from ..helper import _add_alt_text, _aggregate_data, _assign_column_colors, _set_caption
+from ..helper import (
+    _add_alt_text,
+    _aggregate_data,
+    _aggregate_data_db,
+    _assign_column_colors,
+    _draw_stacked_bars_mpl,
+    _mpl_figure,
+    _mpl_text,
+    _project,
+    _set_caption,
+    _show_mpl,
+    _to_relation,
+    _use_matplotlib,
+)
+from ..cache import cached
+from ..labels import fmt_number, fmt_pct
+from ..plot_data import PlotData
+
+if TYPE_CHECKING:
+    import duckdb as ddb
 
 
 def plot_facet_stacked_bars(
-    df: pd.DataFrame,
+    df: pd.DataFrame | ddb.DuckDBPyRelation | str | PlotData,
     subplots_per_row: int = 4,
     top_n_index: int = 0,
     top_n_color: int = 0,
@@ -38,12 +60,19 @@ def plot_facet_stacked_bars(
     show_pct: bool = False,
     fill_index: bool = False,
     alt_text: str = None,
-) -> None:
+    engine: Literal["pandas", "duckdb"] = "pandas",
+    con: ddb.DuckDBPyConnection = None,
+    return_data: bool = False,
+    backend: Literal["plotly", "matplotlib", "auto"] = "plotly",
+) -> PlotData | None:
     """
     A function to plot multiple (subplots_per_row) stacked bar charts, facetted by the third column, with the first column as the index and the second column as the colors.
 
     Args:
-        df (pd.DataFrame): Input DataFrame with 3 or 4 columns.
+        df (pd.DataFrame | ddb.DuckDBPyRelation | str): Input DataFrame with 3 or 4 columns.
+            A duckdb relation or a sql query (run on `con`) implies `engine="duckdb"`.
+            A `PlotData` from a previous call is rendered again without aggregating, only render parameters apply
+            (subplots_per_row, subplot_size, annotations, precision, show_pct, renderer, png_path, alt_text).
         subplots_per_row (int): The number of subplots to display per row.
         top_n_index (int): The number of top indexes to include in the chart. Default is 0, which includes all indexes.
         top_n_color (int): The number of top colors to include in the chart. Default is 0, which includes all colors.
@@ -73,9 +102,52 @@ def plot_facet_stacked_bars(
             and value 0. This ensures every facet subplot renders all index ticks symmetrically even when
             certain combinations are absent from the data. Default is False.
         alt_text (str, optional): Custom alt text for accessibility. Defaults to title or caption if not provided.
-
-    Returns: None
+        engine (Literal["pandas", "duckdb"]): "duckdb" runs null labelling, grouping, top n and "(other)"
+            as one query in duckdb and fetches only the aggregated result. Labels are plotted as text.
+        con (ddb.DuckDBPyConnection): Connection for a sql query or DataFrame with `engine="duckdb"`. Defaults to the duckdb default connection.
+        return_data (bool): If True, returns the aggregated `PlotData` for re-rendering or `hlp.export_plot_data()`.
+        backend (Literal["plotly", "matplotlib", "auto"]): "matplotlib" renders a static image from the same data, colors
+            and labels, without plotly json and kaleido (`renderer` does not apply). "auto" uses matplotlib above
+            `helper.AUTO_BACKEND_MARKS` bars (segments). Defaults to "plotly".
+
+    Returns:
+        PlotData | None: The aggregated data if `return_data` is True.
     """
+    if backend not in ("plotly", "matplotlib", "auto"):
+        print(f"❌ backend must be one of 'plotly', 'matplotlib', 'auto', got '{backend}'")
+        return
+    if isinstance(df, PlotData):
+        data = df
+        if not data._check_kind("plot_facet_stacked_bars"):
+            return
+    else:
+        data = _compute_facet_stacked_bars(
+            df=df,
+            top_n_index=top_n_index,
+            top_n_color=top_n_color,
+            top_n_facet=top_n_facet,
+            null_label=null_label,
+            show_other=show_other,
+            sort_values_index=sort_values_index,
+            sort_values_color=sort_values_color,
+            sort_values_facet=sort_values_facet,
+            relative=relative,
+            fill_index=fill_index,
+            engine=engine,
+            con=con,
+        )
+        # * title and colors are applied to the (cached) aggregation, changing them never reruns the groupby
+        data = _decorate_facet_stacked_bars(
+            data,
+            caption=caption,
+            caption_only_n=caption_only_n,
+            title=title,
+            color_palette=color_palette,
+            null_label=null_label,
+            first_col_grey=first_col_grey,
+        )
+    relative = data.meta["relative"]
+
     # ENFORCE show_pct RULES ---
     if not relative:
         # If bars are absolute, annotations MUST be absolute
@@ -90,43 +162,110 @@ def plot_facet_stacked_bars(
         print(f"Warning: 'precision' received as {precision} (type: {type(precision)}). Defaulting to 0.")
         precision = 0
 
-    df_copy = df.copy()
+    render_args = dict(
+        subplots_per_row=subplots_per_row,
+        subplot_size=subplot_size,
+        annotations=annotations,
+        precision=precision,
+        show_pct=show_pct,
+    )
+    if _use_matplotlib(backend, len(data.frame)):
+        _add_alt_text(alt_text or title or caption)
+        _show_mpl(_render_facet_stacked_bars_mpl(data, **render_args), png_path)
+        return data if return_data else None
 
-    if not (df_copy.shape[1] == 3 or df_copy.shape[1] == 4):
-        raise ValueError("Input DataFrame must have 3 or 4 columns.")
+    fig = _render_facet_stacked_bars(data, **render_args)
+    n_rows = -(-data.frame["facet"].nunique() // subplots_per_row)
 
-    original_column_names = df_copy.columns.tolist()
-
-    if df_copy.shape[1] == 3:
-        df_copy.columns = ["index", "col", "facet"]
-        df_copy["value"] = 1
-    elif df_copy.shape[1] == 4:
-        df_copy.columns = ["index", "col", "facet", "value"]
-
-    if fill_index:
-        _fill = pd.MultiIndex.from_product(
-            [df_copy["index"].unique(), df_copy["facet"].unique()],
-            names=["index", "facet"],
-        ).to_frame(index=False)
-        _fill["col"] = None
-        _fill["value"] = 0
-        df_copy = pd.concat([df_copy, _fill[["index", "col", "facet", "value"]]], ignore_index=True)
-
-    n = df_copy["value"].sum()
-    original_rows = len(df_copy)
-
-    aggregated_df = _aggregate_data(  # Assumes aggregate_data is accessible
-        df_copy,
-        top_n_index,
-        top_n_color,
-        top_n_facet,
-        null_label,
-        show_other=show_other,
-        sort_values_index=sort_values_index,
-        sort_values_color=sort_values_color,
-        sort_values_facet=sort_values_facet,
+    if png_path:
+        png_path = Path(png_path)
+        fig.write_image(str(png_path))
+
+    alt_text = alt_text or title or caption
+    _add_alt_text(alt_text)
+    fig.show(
+        renderer=renderer or os.getenv("RENDERER"),
+        width=subplot_size * subplots_per_row,
+        height=subplot_size * n_rows,
     )
 
+    return data if return_data else None
+
+
+@cached(ignore=("con",))
+def _compute_facet_stacked_bars(
+    df: pd.DataFrame | ddb.DuckDBPyRelation | str,
+    top_n_index: int,
+    top_n_color: int,
+    top_n_facet: int,
+    null_label: str,
+    show_other: bool,
+    sort_values_index: bool,
+    sort_values_color: bool,
+    sort_values_facet: bool,
+    relative: bool,
+    fill_index: bool,
+    engine: Literal["pandas", "duckdb"],
+    con: ddb.DuckDBPyConnection,
+) -> PlotData:
+    """
+    Compute stage of plot_facet_stacked_bars: aggregation and category orders.
+    Title and colors are added by `_decorate_facet_stacked_bars`.
+    """
+    if not isinstance(df, pd.DataFrame):
+        engine = "duckdb"
+    if engine == "duckdb":
+        df = _to_relation(df, con)
+
+    if not (len(df.columns) == 3 or len(df.columns) == 4):
+        raise ValueError("Input DataFrame must have 3 or 4 columns.")
+
+    original_column_names = list(df.columns)
+
+    if engine == "duckdb":
+        aggregated_df, n = _aggregate_data_db(
+            df,
+            *df.columns[:3],
+            value=df.columns[3] if len(df.columns) == 4 else None,
+            top_n_index=top_n_index,
+            top_n_color=top_n_color,
+            top_n_facet=top_n_facet,
+            null_label=null_label,
+            show_other=show_other,
+            sort_values_index=sort_values_index,
+            sort_values_color=sort_values_color,
+            sort_values_facet=sort_values_facet,
+            fill_index=fill_index,
+        )
+    else:
+        # * renamed projection, the caller's columns are not copied
+        df_copy = _project(df, names=["index", "col", "facet", "value"][: df.shape[1]])
+        if df_copy.shape[1] == 3:
+            df_copy["value"] = 1
+
+        if fill_index:
+            _fill = pd.MultiIndex.from_product(
+                [df_copy["index"].unique(), df_copy["facet"].unique()],
+                names=["index", "facet"],
+            ).to_frame(index=False)
+            _fill["col"] = None
+            _fill["value"] = 0
+            df_copy = pd.concat([df_copy, _fill[["index", "col", "facet", "value"]]], ignore_index=True)
+
+        n = df_copy["value"].sum()
+
+        aggregated_df = _aggregate_data(  # Assumes aggregate_data is accessible
+            df_copy,
+            top_n_index,
+            top_n_color,
+            top_n_facet,
+            null_label,
+            show_other=show_other,
+            sort_values_index=sort_values_index,
+            sort_values_color=sort_values_color,
+            sort_values_facet=sort_values_facet,
+        )
+
     aggregated_df["index"] = aggregated_df["index"].astype(str)
     aggregated_df["col"] = aggregated_df["col"].astype(str)
     aggregated_df["facet"] = aggregated_df["facet"].astype(str)
@@ -153,32 +292,69 @@ def plot_facet_stacked_bars(
         sum_by_facet = aggregated_df.groupby("facet")["value"].sum().sort_values(ascending=False)
         category_orders["facet"] = sum_by_facet.index.tolist()
 
-    columns_for_color = sorted(aggregated_df["col"].unique().tolist())
-    column_colors_map = _assign_column_colors(
-        columns_for_color, color_palette, null_label, first_col_grey=first_col_grey
-    )  # Assumes assign_column_colors is accessible
+    return PlotData(
+        kind="plot_facet_stacked_bars",
+        frame=aggregated_df,
+        category_orders=category_orders,
+        title_parts={
+            "subject": f"{'TOP ' + str(top_n_index) + ' ' if top_n_index > 0 else ''}[{original_column_names[0]}] {'TOP ' + str(top_n_color) + ' ' if top_n_color > 0 else ''}[{original_column_names[1]}] {'TOP ' + str(top_n_facet) + ' ' if top_n_facet > 0 else ''}[{original_column_names[2]}]",
+            "n": f"n={n:_}",
+        },
+        # * export the absolute values, also if bars are relative
+        columns={
+            "index": original_column_names[0],
+            "col": original_column_names[1],
+            "facet": original_column_names[2],
+            "annotation_value": original_column_names[3] if len(original_column_names) == 4 else "cnt",
+        },
+        n=n,
+        meta={"relative": relative},
+    )
+
 
-    #  Prepare the text series for annotations with 'show_pct' control
-    if annotations:
-        if show_pct:
-            # When show_pct is True, use the scaled 'value' column (0-1) and format as percentage
-            formatted_text_series = aggregated_df["value"].apply(lambda x: f"{x:.{precision}%}".replace(".", ","))
-        else:
-            # When show_pct is False, use the 'annotation_value' (original absolute) and format as absolute
-            formatted_text_series = aggregated_df["annotation_value"].apply(
-                lambda x: f"{x:_.{precision}f}".replace(".", ",")
-            )
-    else:
-        formatted_text_series = None
-    # - - - -
+def _decorate_facet_stacked_bars(
+    data: PlotData,
+    caption: str,
+    caption_only_n: bool,
+    title: str,
+    color_palette: str | list[str],
+    null_label: str,
+    first_col_grey: bool,
+) -> PlotData:
+    """Cosmetic part of the compute stage of plot_facet_stacked_bars: title and colors of the aggregated data."""
+    parts = data.title_parts
+    columns_for_color = sorted(data.frame["col"].unique().tolist())
+    column_colors_map = _assign_column_colors(columns_for_color, color_palette, null_label, first_col_grey=first_col_grey)
 
-    title_str_n = f"n={n:_}"
     if caption_only_n:
-        title_str = title_str_n
+        title_str = parts["n"]
     elif title:
-        title_str = f"{title}, {title_str_n}"
+        title_str = f"{title}, {parts['n']}"
     else:
-        title_str = f"{_set_caption(caption)} {'TOP ' + str(top_n_index) + ' ' if top_n_index > 0 else ''}[{original_column_names[0]}] {'TOP ' + str(top_n_color) + ' ' if top_n_color > 0 else ''}[{original_column_names[1]}] {'TOP ' + str(top_n_facet) + ' ' if top_n_facet > 0 else ''}[{original_column_names[2]}], {title_str_n}"
+        title_str = f"{_set_caption(caption)} {parts['subject']}, {parts['n']}"
+
+    return replace(
+        data,
+        color_map=column_colors_map,
+        title_parts={"text": title_str, "caption": _set_caption(caption), **parts},
+    )
+
+
+def _render_facet_stacked_bars(
+    data: PlotData,
+    subplots_per_row: int,
+    subplot_size: int,
+    annotations: bool,
+    precision: int,
+    show_pct: bool,
+) -> go.Figure:
+    """Render stage of plot_facet_stacked_bars, builds the figure from the aggregated data."""
+    aggregated_df = data.frame.copy()
+    category_orders = {axis: list(order) for axis, order in data.category_orders.items()}
+    relative = data.meta["relative"]
+
+    formatted_text_series = _annotation_texts(aggregated_df, annotations, show_pct, precision)
+    # - - - -
 
     fig = px.bar(
         aggregated_df,
@@ -188,13 +364,13 @@ def plot_facet_stacked_bars(
         facet_col="facet",
         facet_col_wrap=subplots_per_row,
         barmode="stack",
-        color_discrete_map=column_colors_map,
+        color_discrete_map=dict(data.color_map),
         category_orders=category_orders,
         text=formatted_text_series,
         text_auto=False,
         # height=subplot_size * (-(-len(aggregated_df["facet"].unique()) // subplots_per_row)),
         # title=f"{caption} {original_column_names[0]}, {original_column_names[1]}, {original_column_names[2]}",
-        title=title_str,
+        title=data.title,
     )
 
     fig.for_each_annotation(lambda a: a.update(text=a.text.split("=")[-1]))
@@ -231,16 +407,66 @@ def plot_facet_stacked_bars(
         height=subplot_size * (-(-len(aggregated_df["facet"].unique()) // subplots_per_row)),
     )
 
-    if png_path:
-        png_path = Path(png_path)
-        fig.write_image(str(png_path))
+    return fig
 
-    alt_text = alt_text or title or caption
-    _add_alt_text(alt_text)
-    fig.show(
-        renderer=renderer or os.getenv("RENDERER"),
-        width=subplot_size * subplots_per_row,
-        height=subplot_size * (-(-len(aggregated_df["facet"].unique()) // subplots_per_row)),
-    )
 
-    return
+def _annotation_texts(df: pd.DataFrame, annotations: bool, show_pct: bool, precision: int) -> pd.Series | None:
+    """Bar texts of the aggregated data, None without annotations."""
+    #  Prepare the text series for annotations with 'show_pct' control
+    if not annotations:
+        return None
+    if show_pct:
+        # When show_pct is True, use the scaled 'value' column (0-1) and format as percentage
+        texts = fmt_pct(df["value"], precision, decimal=",")
+    else:
+        # When show_pct is False, use the 'annotation_value' (original absolute) and format as absolute
+        texts = fmt_number(df["annotation_value"], precision, decimal=",")
+    return pd.Series(texts, index=df.index)
+
+
+def _render_facet_stacked_bars_mpl(
+    data: PlotData,
+    subplots_per_row: int,
+    subplot_size: int,
+    annotations: bool,
+    precision: int,
+    show_pct: bool,
+):
+    """Render stage of plot_facet_stacked_bars for backend="matplotlib", one axis per facet, shared legend."""
+    from matplotlib.ticker import PercentFormatter
+
+    df = data.frame.copy()
+    df["text"] = _annotation_texts(df, annotations, show_pct, precision)
+    relative = data.meta["relative"]
+
+    # * plotly orders categories without explicit order by first appearance
+    orders = {axis: list(data.category_orders.get(axis) or df[axis].unique()) for axis in ("index", "col", "facet")}
+    n_rows = -(-len(orders["facet"]) // subplots_per_row)
+
+    fig, axes = _mpl_figure(subplot_size * subplots_per_row, subplot_size * n_rows, n_rows, subplots_per_row)
+    for ax, facet in zip(axes.flat, orders["facet"]):
+        sub = df[df["facet"] == facet]
+        _draw_stacked_bars_mpl(
+            ax,
+            sub,
+            # * like matches=None in plotly, each facet only shows its own bars
+            index_order=[i for i in orders["index"] if i in set(sub["index"])],
+            color_order=orders["col"],
+            color_map=dict(data.color_map),
+            orientation="v",
+            text="text" if annotations else None,
+        )
+        ax.set_title(str(facet))
+        ax.grid(True, axis="y", alpha=0.3)
+        ax.set_axisbelow(True)
+        if relative:
+            ax.set_ylim(0, 1.1)
+            ax.yaxis.set_major_formatter(PercentFormatter(1.0, decimals=0))
+    for ax in axes.flat[len(orders["facet"]) :]:
+        ax.set_visible(False)
+
+    # * one legend for all facets, colors are the same in each
+    handles = {h.get_label(): h for ax in axes.flat for h in ax.get_legend_handles_labels()[0]}
+    fig.legend(list(handles.values()), list(handles), title=data.columns["col"], loc="center left", bbox_to_anchor=(1.0, 0.5), frameon=False)
+    fig.suptitle(_mpl_text(data.title), x=0.01, ha="left")
+    return fig
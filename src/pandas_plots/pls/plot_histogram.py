@@ -1,17 +1,25 @@
+from __future__ import annotations
+
 import os
 from pathlib import Path
-from typing import Literal
+from typing import TYPE_CHECKING, Literal
 
+import numpy as np
 import pandas as pd
 import plotly.express as px
+import plotly.graph_objects as go
 
-from ..helper import _set_caption
-from ..hlp import *
+from ..binning import auto_bins, bin_counts, db_auto_bin_counts, db_column_stats, normalize
+from ..helper import STATS_MAX_POINTS, _NUMERIC_TYPES, _resolve_relation, _set_box_stats, _set_caption, _use_stats
 from ..tbl import print_summary
+from ..tbl.print_summary import _box_stats
+
+if TYPE_CHECKING:
+    import duckdb as ddb
 
 
 def plot_histogram(
-    df_ser: pd.DataFrame | pd.Series,
+    df_ser: pd.DataFrame | pd.Series | ddb.DuckDBPyRelation | str,
     histnorm: Literal["probability", "probability density", "density", "percent", None] = None,
     nbins: int = 0,
     orientation: Literal["h", "v"] = "v",
@@ -25,17 +33,22 @@ def plot_histogram(
     title: str = None,
     png_path: Path | str = None,
     summary: bool = False,
+    mode: Literal["raw", "stats", "auto"] = "auto",
+    con: ddb.DuckDBPyConnection = None,
 ) -> None:
     """
     A function to plot a histogram based on *numeric* columns in a DataFrame.
     Accepts:
         - a numeric series
         - a dataframe with only numeric columns
+        - a duckdb relation, a parquet file or a table in `con` with only numeric columns,
+          binned in the database (always in stats mode, boxes without outliers)
 
-    ⚠️ on large dataframes, this diagram will be EXTREMELY bloated. use the `_large` version!
+    ⚠️ with mode="raw" on large dataframes, this diagram will be EXTREMELY bloated. use mode="stats" or the `_large` version!
 
     Args:
-        df_ser (pd.DataFrame | pd.Series): The input containing the data to be plotted.
+        df_ser (pd.DataFrame | pd.Series | DuckDBPyRelation | str): The input containing the data to be plotted.
+            A str is read as parquet file (or glob) or as name of a table/view in `con`.
         histnorm (Literal["probability", "probability density", "density", "percent", None]): The normalization mode for the histogram. Default is None.
         nbins (int): The number of bins in the histogram. Default is 0. If its set to -1, the number of bins will represent the integer span of the data.
         orientation (Literal["h", "v"]): The orientation of the histogram. Default is "v".
@@ -49,49 +62,86 @@ def plot_histogram(
         title (str): The title of the plot. Default is None.
         png_path (Path | str, optional): The path to save the image as a png file. Defaults to None.
         summary (bool): Whether to print a summary table of the data. Default is False.
-
+        mode (Literal["raw", "stats", "auto"]): "raw" hands all values to plotly, "stats" draws one bar per bin from counts
+            computed with the bins plotly would choose, and the marginal boxes from precomputed stats, so the figure size
+            does not grow with the rows. "auto" uses "stats" above `helper.AUTO_STATS_ROWS` values. Defaults to "auto".
+        con (DuckDBPyConnection): connection for parquet files and table names, default connection if None.
 
     Returns: None
     """
 
-    # * convert to df if series
+    # * convert to df if series, anything else is read as duckdb relation and binned in the database
+    rel = None
     if isinstance(df_ser, pd.Series):
         df = df_ser.to_frame()
-    else:
+    elif isinstance(df_ser, pd.DataFrame):
         df = df_ser
+    else:
+        rel = _resolve_relation(df_ser, con)
+        if rel is None:
+            print(f"❌ '{df_ser}' is neither a relation, a parquet file nor a table")
+            return
 
-    col_not_num = df.select_dtypes(exclude="number").columns
+    if rel is None:
+        col_not_num = df.select_dtypes(exclude="number").columns
+    else:
+        col_not_num = [col for col, dtype in zip(rel.columns, rel.types) if dtype.id not in _NUMERIC_TYPES]
     if any(col_not_num):
         print(
             f"❌ all columns must be numeric, but the following are not: [{', '.join(col_not_num)}]. consider using plot_bars()."
         )
         return
 
+    if mode not in ("raw", "stats", "auto"):
+        print(f"❌ mode must be one of 'raw', 'stats', 'auto', got '{mode}'")
+        return
+    if rel is not None and mode == "raw":
+        print("❌ relations are binned in duckdb, use mode='stats' or 'auto'")
+        return
+
     if os.getenv("PDF") == "1":
         summary = False
 
-    # * rounding
-    df = df.map(lambda x: round(x, precision))
-
     _caption = _set_caption(caption)
 
+    if rel is None:
+        # * rounding
+        df = df.round(precision)
+        columns, n_rows = list(df.columns), df.shape[0]
+        lo, hi = df.min().min(), df.max().max()
+    else:
+        # * min/max pass, the values are rounded in the database
+        columns = list(rel.columns)
+        stats = db_column_stats(rel, columns, precision)
+        n_rows = stats["rows"]
+        lo, hi = np.fmin.reduce(stats["min"]), np.fmax.reduce(stats["max"])
+
     # * nbins defaults to number of unique values
     if nbins == -1:
-        # Calling int on a single element Series is deprecated and will raise a TypeError in the future. Use int(ser.iloc[0]) instead
-        nbins = int(df.iloc[0].max() - df.iloc[0].min())
+        nbins = int(hi - lo) if pd.notna(hi - lo) else 0
+
+    # * stats mode: px draws a stub with one value per column, bars and boxes are filled with the stats afterwards
+    use_stats = rel is not None or _use_stats(mode, df.size)
 
     # ! plot
     fig = px.histogram(
-        data_frame=df,
+        data_frame=pd.DataFrame([np.arange(len(columns), dtype=float)], columns=columns) if use_stats else df,
         histnorm=histnorm,
         nbins=nbins,
         marginal="box",
         barmode=barmode,
         text_auto=text_auto,
         orientation=orientation,
-        title=title or f"{_caption}[{', '.join(df.columns)}], n={df.shape[0]:_}",
+        title=title or f"{_caption}[{', '.join(map(str, columns))}], n={n_rows:_}",
         template="plotly_dark" if os.getenv("THEME") == "dark" else "plotly",
     )
+    if use_stats:
+        if rel is None:
+            counts, bins, box = _bin_frame(df, nbins)
+        else:
+            counts, bins, box = _bin_relation(rel, columns, nbins, precision, stats)
+        fig = _binned_figure(fig, counts, bins, histnorm, box)
+
     # * set title properties
     fig.update_layout(
         title={
@@ -103,7 +153,7 @@ def plot_histogram(
                 "size": 24,
             },
         },
-        showlegend=False if df.shape[1] == 1 else True,
+        showlegend=False if len(columns) == 1 else True,
     )
 
     fig.update_layout(
@@ -122,6 +172,93 @@ def plot_histogram(
         fig.write_image(Path(png_path).as_posix())
 
     if summary:
-        print_summary(df)
+        print_summary(df if rel is None else rel)
 
     return
+
+
+def _bin_frame(df: pd.DataFrame, nbins: int) -> tuple[list[np.ndarray], tuple[float, float, int], dict]:
+    """Counts per bin and box stats (with outliers) of all columns, the bins are the ones plotly would choose."""
+    values = [df[col].to_numpy(dtype=float, na_value=np.nan) for col in df.columns]
+    values = [v[~np.isnan(v)] for v in values]
+    combined = np.concatenate(values)
+    bins = auto_bins(combined, nbins) if len(combined) else (0.0, 1.0, 0)
+    del combined
+    counts = [bin_counts(v, *bins) for v in values]
+
+    stats = [_box_stats(None, pd.Series(v), points="outliers", max_points=STATS_MAX_POINTS) for v in values]
+    box = {key: np.concatenate([s[key] for s in stats]) for key in stats[0] if key != "points"}
+    box["points"] = [s["points"][0] for s in stats]
+    return counts, bins, box
+
+
+def _bin_relation(
+    rel: ddb.DuckDBPyRelation, columns: list[str], nbins: int, precision: int, stats: dict[str, np.ndarray]
+) -> tuple[np.ndarray, tuple[float, float, int], dict]:
+    """Counts per bin and box stats (without points) of all columns, from one more scan in duckdb."""
+    counts, bins, lower, upper = db_auto_bin_counts(rel, columns, stats, nbins, precision)
+    box = {
+        "count": stats["count"],
+        "q25": stats["q25"],
+        "median": stats["median"],
+        "q75": stats["q75"],
+        # * whisker ends reach at least the quartiles, like plotly draws them
+        "lowerfence": np.fmin(stats["q25"], lower),
+        "upperfence": np.fmax(stats["q75"], upper),
+    }
+    return counts, bins, box
+
+
+def _binned_figure(
+    fig: go.Figure, counts: list[np.ndarray], bins: tuple[float, float, int], histnorm: str | None, box: dict
+) -> go.Figure:
+    """
+    Rebuilds a px.histogram stub figure from stats: one bar per bin and the marginal boxes from box stats.
+
+    All columns share the `bins` (first edge, size, number) like in px.histogram. The styling of the
+    histogram traces is carried over to the go.Bar traces. Boxes show outliers if `box` holds points.
+    """
+    start, size, n_bins = bins
+    edges = start + size * np.arange(n_bins + 1)
+    centers = (edges[:-1] + edges[1:]) / 2
+    # * hover shows the bin range, like plotly does for histograms
+    ranges = [f"{lo:.12g} - {hi:.12g}" for lo, hi in zip(edges[:-1], edges[1:])]
+
+    # * the stub value of a trace is the index of its column
+    points = "outliers" if "points" in box else None
+    boxes = go.Figure(data=[trace for trace in fig.data if trace.type == "box"])
+    _set_box_stats(boxes, box, points)
+    boxes = iter(boxes.data)
+
+    traces = []
+    for trace in fig.data:
+        if trace.type == "box":
+            traces.append(next(boxes))
+            continue
+        col = int(trace.x[0] if trace.x is not None else trace.y[0])
+        heights = normalize(counts[col], histnorm, size)
+        horizontal = trace.orientation == "h"
+        traces.append(
+            go.Bar(
+                x=heights if horizontal else centers,
+                y=centers if horizontal else heights,
+                # * a single bar has no neighbours to take its width from
+                width=size if n_bins == 1 else None,
+                customdata=ranges,
+                name=trace.name,
+                legendgroup=trace.legendgroup,
+                showlegend=trace.showlegend,
+                marker=trace.marker.to_plotly_json(),
+                orientation=trace.orientation,
+                texttemplate=trace.texttemplate,
+                hovertemplate=trace.hovertemplate.replace("%{y}" if horizontal else "%{x}", "%{customdata}"),
+                xaxis=trace.xaxis,
+                yaxis=trace.yaxis,
+            )
+        )
+
+    binned = go.Figure(data=traces, layout=fig.layout)
+    # * histograms have no gap between bars, bars do by default
+    if binned.layout.bargap is None:
+        binned.update_layout(bargap=0)
+    return binned
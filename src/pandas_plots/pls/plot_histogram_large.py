@@ -1,17 +1,24 @@
+from __future__ import annotations
+
 import os
 from pathlib import Path
+from typing import TYPE_CHECKING, Literal
 
+import numpy as np
 import pandas as pd
 import seaborn as sb
 from matplotlib import pyplot as plt
 
-from ..helper import _add_alt_text, _set_caption
-from ..hlp import *
+from ..binning import db_bin_counts, db_column_stats, numpy_bins
+from ..helper import _NUMERIC_TYPES, _add_alt_text, _kde_binned, _resolve_relation, _set_caption
 from ..tbl import print_summary
 
+if TYPE_CHECKING:
+    import duckdb as ddb
+
 
 def plot_histogram_large(
-    df_ser: pd.DataFrame | pd.Series,
+    df_ser: pd.DataFrame | pd.Series | ddb.DuckDBPyRelation | str,
     nbins: int = -1,
     precision: int = 2,
     height: int = 500,
@@ -21,6 +28,8 @@ def plot_histogram_large(
     png_path: Path | str = None,
     summary: bool = False,
     alt_text: str = None,
+    con: ddb.DuckDBPyConnection = None,
+    bw_method: Literal["scott", "silverman"] | float = "scott",
 ) -> None:
     """
     A function to plot a histogram based on a large number of *numeric* columns in a DataFrame
@@ -29,10 +38,13 @@ def plot_histogram_large(
     Accepts:
         - a numeric series
         - a dataframe with only numeric columns
+        - a duckdb relation, a parquet file or a table in `con` with only numeric columns,
+          binned in the database, only the counts per bin are fetched
 
 
     Args:
-        df_ser (pd.DataFrame | pd.Series): The input containing the data to be plotted.
+        df_ser (pd.DataFrame | pd.Series | DuckDBPyRelation | str): The input containing the data to be plotted.
+            A str is read as parquet file (or glob) or as name of a table/view in `con`.
         nbins (int): The number of bins in the histogram. If set to -1, the number of bins
                      will be calculated based on the data span (Seaborn will use 'auto' by default
                      if no integer is provided, which is generally better).
@@ -44,17 +56,29 @@ def plot_histogram_large(
         png_path (Path | str, optional): The path to save the image as a png file.
         summary (bool): Whether to print a summary table of the data.
         alt_text (str, optional): Custom alt text for accessibility. Defaults to title or caption if not provided.
+        con (DuckDBPyConnection): connection for parquet files and table names, default connection if None.
+        bw_method (Literal["scott", "silverman"] | float): bandwidth rule of the kde, or a factor of the std like
+            in scipy.stats.gaussian_kde. The kde is computed on a binned grid with an FFT. Defaults to "scott".
 
     Returns: None
     """
 
-    # * convert to df if series
+    # * convert to df if series, anything else is read as duckdb relation and binned in the database
+    rel = None
     if isinstance(df_ser, pd.Series):
         df = df_ser.to_frame()
-    else:
+    elif isinstance(df_ser, pd.DataFrame):
         df = df_ser
+    else:
+        rel = _resolve_relation(df_ser, con)
+        if rel is None:
+            print(f"❌ '{df_ser}' is neither a relation, a parquet file nor a table")
+            return
 
-    col_not_num = df.select_dtypes(exclude="number").columns
+    if rel is None:
+        col_not_num = df.select_dtypes(exclude="number").columns
+    else:
+        col_not_num = [col for col, dtype in zip(rel.columns, rel.types) if dtype.id not in _NUMERIC_TYPES]
     if any(col_not_num):
         print(
             f"❌ all columns must be numeric, but the following are not: [{', '.join(col_not_num)}]. consider using plot_bars()."
@@ -64,11 +88,37 @@ def plot_histogram_large(
     if os.getenv("PDF") == "1":
         summary = False
 
-    # * Only plot the first numeric column if DataFrame has multiple
-    data_series = df.iloc[:, 0]
+    if isinstance(bw_method, str) and bw_method not in ("scott", "silverman"):
+        print(f"❌ bw_method must be 'scott', 'silverman' or a number, got '{bw_method}'")
+        return
 
-    # * rounding (apply only to the plotting data if needed)
-    data_series = data_series.apply(lambda x: round(x, precision))
+    if rel is None:
+        # * Only plot the first numeric column if DataFrame has multiple
+        data_series = df.iloc[:, 0]
+
+        # * rounding (apply only to the plotting data if needed)
+        data_series = data_series.round(precision)
+        name, n_rows = data_series.name, data_series.shape[0]
+        values = data_series.dropna().to_numpy(dtype=float)
+        if not len(values):
+            print(f"❌ column '{name}' has no values")
+            return
+        # * same bins as seaborn would choose
+        counts, edges = np.histogram(values, bins=nbins if nbins > 0 else "auto")
+        coords, density = _kde_binned(values, bw_method=bw_method)
+    else:
+        # * min/max pass, then counts per bin of the first column, values are rounded in the database
+        name = rel.columns[0]
+        stats = db_column_stats(rel, [name], precision)
+        n_rows = stats["rows"]
+        if not stats["count"][0]:
+            print(f"❌ column '{name}' has no values")
+            return
+        start, size, n_bins = numpy_bins(stats, nbins)
+        counts = db_bin_counts(rel, [name], start, size, n_bins, precision=precision, clip=True)[0][0]
+        edges = start + size * np.arange(n_bins + 1)
+        # * the kde of the bin centers weighted by their counts, off by a small share of the bin width
+        coords, density = _kde_binned((edges[:-1] + edges[1:]) / 2, bw_method=bw_method, weights=counts)
 
     # --- Matplotlib/Seaborn Setup ---
 
@@ -84,25 +134,26 @@ def plot_histogram_large(
 
     # * Title and Labels
     _caption = _set_caption(caption)
-    title_str = title or f"{_caption}[{data_series.name or 'Value'}], n={data_series.shape[0]:_.0f}"
-
-    # * Determine number of bins (Fixes TypeError: bins must be an integer, a string, or an array)
-    bins_arg = nbins if nbins > 0 else "auto"
+    title_str = title or f"{_caption}[{name or 'Value'}], n={n_rows:_.0f}"
 
-    # * Main Plotting with Seaborn histplot
+    # * Main Plotting with Seaborn histplot, from the counts: bin centers weighted by their counts
+    ax = plt.gca()
     sb.histplot(
-        x=data_series,
-        bins=bins_arg,
-        kde=True,  # Standard histogram
+        x=(edges[:-1] + edges[1:]) / 2,
+        weights=counts,
+        # * a list, seaborn compares bins to "auto" when weights are given
+        bins=edges.tolist(),
         color="skyblue",  # Set a default color
         edgecolor=".2",  # Dark edges for bars
-        ax=plt.gca(),
+        alpha=0.5,  # * seaborn's default with kde=True
+        ax=ax,
     )
+    # * binned fft kde instead of seaborn's kde=True, scaled to the counts like seaborn does
+    ax.plot(coords, density * (counts * np.diff(edges)).sum(), color="skyblue")
 
     # * Apply title and labels
-    ax = plt.gca()
     ax.set_title(title_str)
-    ax.set_xlabel(data_series.name or "Value")
+    ax.set_xlabel(name or "Value")
     ax.set_ylabel("Count")
 
     # * Display the plot
@@ -120,6 +171,6 @@ def plot_histogram_large(
 
     if summary:
         # Assuming print_summary is a helper function that accepts a DataFrame
-        print_summary(df)
+        print_summary(df if rel is None else rel)
 
     return
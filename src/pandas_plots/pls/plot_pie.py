@@ -4,8 +4,8 @@ from pathlib import Path
 import matplotlib.pyplot as plt
 import pandas as pd
 
+from ..cache import cached
 from ..helper import _set_caption
-from ..hlp import *
 
 
 def plot_pie(
@@ -55,7 +55,7 @@ def plot_pie(
 
     # * take 1st (only) column and use value counts to get distribution
     # This Series contains the values and the index contains the labels
-    data_counts = data.iloc[:, 0].value_counts()
+    data_counts = _count_values(ser=data.iloc[:, 0])
 
     # * Get the number of observations (before grouping)
     n = data.shape[0]
@@ -105,3 +105,9 @@ def plot_pie(
 
     plt.close()
     plt.style.use("default")  # Reset style
+
+
+@cached
+def _count_values(ser: pd.Series) -> pd.Series:
+    """Compute stage of plot_pie: distribution of the values, most frequent first."""
+    return ser.value_counts()
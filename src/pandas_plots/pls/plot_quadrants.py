@@ -4,6 +4,8 @@ from pathlib import Path
 from matplotlib import pyplot as plt
 import seaborn as sb
 
+from ..helper import _project
+
 def plot_quadrants(
     df: pd.DataFrame,
     title: str = None,
@@ -36,6 +38,7 @@ def plot_quadrants(
         return
 
     if len(df.columns) == 2:
+        df = _project(df)
         df["cnt"] = 1
 
     heat = (
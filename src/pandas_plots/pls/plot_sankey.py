@@ -1,11 +1,10 @@
 import os
-import re
 
 import pandas as pd
 import plotly.graph_objects as go
 
 from pandas_plots import const
-from pandas_plots.helper import _add_alt_text, _assign_column_colors
+from pandas_plots.helper import _add_alt_text, _assign_column_colors, _project
 
 NA_EVENT = "(NA)"
 
@@ -169,7 +168,8 @@ def plot_sankey(
     date_col_name = df.columns[1]
     event_col_name = df.columns[2]
 
-    df_processed = df.copy()
+    # * only the 3 columns are needed, drop_duplicates() below makes the working copy
+    df_processed = _project(df, [id_col_name, date_col_name, event_col_name])
 
     # --- Aggregate the data to remove duplicate rows before processing ---
     df_processed = df_processed.drop_duplicates(subset=[id_col_name, date_col_name, event_col_name])
@@ -268,96 +268,98 @@ def plot_sankey(
     if max_events_per_id is not None:
         df_sorted = df_sorted[df_sorted["event_order"] <= max_events_per_id]
 
-    df_sorted["ordered_event_label"] = "[" + df_sorted["event_order"].astype(str) + "] " + df_sorted[event_col_name]
-
-    # Filter out IDs that were left with no events after sequencing (e.g., if max_events=0)
-    df_sorted = df_sorted.dropna(subset=["ordered_event_label"])
-
     if df_sorted.empty:
         print("No valid data to plot after filtering.")
         return None
 
-    # Use a vectorized shift operation to create source and target columns
-    df_sorted["source_label"] = df_sorted.groupby(id_col_name)["ordered_event_label"].shift(1)
-    df_with_links = df_sorted.dropna(subset=["source_label"]).copy()
+    # * order number and event name stay separate columns, labels are only built for the (few) nodes and links
+    # Every event after the first of its ID is the target of a link from the previous event
+    previous_event = df_sorted.groupby(id_col_name)[event_col_name].shift(1)
+    is_followup = df_sorted["event_order"] > 1
+    links = [
+        pd.DataFrame(
+            {
+                "source_order": df_sorted["event_order"][is_followup] - 1,
+                "source_name": previous_event[is_followup],
+                "target_order": df_sorted["event_order"][is_followup],
+                "target_name": df_sorted[event_col_name][is_followup],
+            }
+        )
+    ]
 
     # Create the start node and links if enabled
     if show_start_node:
-        first_events = df_sorted.groupby(id_col_name).first().reset_index()
-        first_events["source_label"] = "[0] start"
-        df_with_links = pd.concat(
-            [
-                first_events[["source_label", "ordered_event_label"]],
-                df_with_links[["source_label", "ordered_event_label"]],
-            ],
-            ignore_index=True,
+        is_first = ~is_followup
+        links.insert(
+            0,
+            pd.DataFrame(
+                {
+                    "source_order": 0,
+                    "source_name": "start",
+                    "target_order": df_sorted["event_order"][is_first],
+                    "target_name": df_sorted[event_col_name][is_first],
+                }
+            ),
         )
 
-    link_counts = df_with_links.groupby(["source_label", "ordered_event_label"]).size().reset_index(name="value")
+    link_counts = (
+        pd.concat(links, ignore_index=True)
+        .groupby(["source_order", "source_name", "target_order", "target_name"])
+        .size()
+        .reset_index(name="value")
+    )
+    link_counts["source_label"] = _node_label(link_counts["source_order"], link_counts["source_name"])
+    link_counts["target_label"] = _node_label(link_counts["target_order"], link_counts["target_name"])
+    # * links in the order of their labels
+    link_counts = link_counts.sort_values(["source_label", "target_label"], ignore_index=True)
 
     # Get all unique nodes for the labels and sorting
-    all_labels = pd.concat([link_counts["source_label"], link_counts["ordered_event_label"]]).unique()
-    unique_labels_df = pd.DataFrame(all_labels, columns=["label"])
-    unique_labels_df["event_order_num"] = unique_labels_df["label"].str.extract(r"\[(\d+)\]").astype(float).fillna(0)
-    unique_labels_df["event_name"] = unique_labels_df["label"].str.extract(r"\] (.*)").fillna("start")
+    nodes = pd.concat(
+        [
+            link_counts[["source_order", "source_name", "source_label"]].set_axis(["order", "name", "label"], axis=1),
+            link_counts[["target_order", "target_name", "target_label"]].set_axis(["order", "name", "label"], axis=1),
+        ],
+        ignore_index=True,
+    ).drop_duplicates("label")
 
     # Add sort key to force (NA) to the end
-    unique_labels_df["event_name_sort_key"] = unique_labels_df["event_name"].apply(
-        lambda x: "~Z_NA_LAST" if x == NA_EVENT else x
-    )
+    nodes["name_sort_key"] = nodes["name"].mask(nodes["name"] == NA_EVENT, "~Z_NA_LAST")
 
     # Sort primarily by order number, and secondarily by the custom sort key
-    unique_labels_df_sorted = unique_labels_df.sort_values(by=["event_order_num", "event_name_sort_key"])
-
-    unique_unformatted_labels_sorted = unique_labels_df_sorted["label"].tolist()
-
-    label_to_index = {label: i for i, label in enumerate(unique_unformatted_labels_sorted)}
-
-    # Calculate node counts and step totals for percentage calculation
-    node_counts = df_sorted["ordered_event_label"].value_counts()
-
-    # Add count information to the DataFrame for easier calculation
-    unique_labels_df_sorted["node_count"] = unique_labels_df_sorted["label"].apply(
-        lambda x: total_unique_ids if x == "[0] start" else node_counts.get(x, 0)
-    )
-
-    # Calculate the total count for each step (event_order_num)
-    step_totals = unique_labels_df_sorted.groupby("event_order_num")["node_count"].sum()
-
-    # Map the step total back to the DataFrame
-    unique_labels_df_sorted["step_total"] = unique_labels_df_sorted["event_order_num"].map(step_totals)
-
-    # --- Recalculate and format display_labels with (Total % | Step %) ---
-    display_labels = []
-    for index, row in unique_labels_df_sorted.iterrows():
-        label = row["label"]
-        count = row["node_count"]
-        step_total = row["step_total"]
-
-        formatted_count = f"{count:,}".replace(",", "_")
-
-        # 1. Total Percentage (relative to total_unique_ids)
-        total_percentage = (count / total_unique_ids) * 100
-        formatted_total_percentage = f"{int(round(total_percentage, 0))}%"
-
-        # 2. Step Percentage (relative to step_total)
-        if label == "[0] start":
-            # Step 0 is the total start, so step percentage is 100%
-            formatted_step_percentage = "100%"
-        elif step_total > 0:
-            step_percentage = (count / step_total) * 100
-            formatted_step_percentage = f"{int(round(step_percentage, 0))}%"
-        else:
-            formatted_step_percentage = "0%"
-
-        formatted_percentages = f"({formatted_total_percentage} | {formatted_step_percentage})"
-
-        display_labels.append(f"{label} {formatted_count} {formatted_percentages}")
-    # --- End of display_labels recalculation ---
+    nodes = nodes.sort_values(by=["order", "name_sort_key"], ignore_index=True)
+
+    label_to_index = pd.Series(nodes.index, index=nodes["label"])
+
+    # Calculate node counts (events per order number and name) for percentage calculation
+    node_counts = df_sorted.groupby(["event_order", event_col_name]).size().rename("node_count")
+    nodes = nodes.merge(node_counts, how="left", left_on=["order", "name"], right_index=True)
+    is_start = nodes["order"] == 0
+    nodes["node_count"] = nodes["node_count"].fillna(0).astype(int).mask(is_start, total_unique_ids)
+
+    # Calculate the total count for each step (order number)
+    nodes["step_total"] = nodes.groupby("order")["node_count"].transform("sum")
+
+    # --- Format display_labels with (Total % | Step %) ---
+    # 1. Total Percentage (relative to total_unique_ids)
+    total_percentage = _percent(nodes["node_count"] / total_unique_ids * 100)
+    # 2. Step Percentage (relative to step_total), step 0 is the total start, so its step percentage is 100%
+    step_percentage = _percent(nodes["node_count"] / nodes["step_total"].where(nodes["step_total"] > 0) * 100)
+    step_percentage = step_percentage.mask(is_start, "100%").fillna("0%")
+
+    display_labels = (
+        nodes["label"]
+        + " "
+        + _thousands(nodes["node_count"])
+        + " ("
+        + total_percentage
+        + " | "
+        + step_percentage
+        + ")"
+    ).tolist()
 
     # Map sources and targets to indices
     sources = link_counts["source_label"].map(label_to_index).tolist()
-    targets = link_counts["ordered_event_label"].map(label_to_index).tolist()
+    targets = link_counts["target_label"].map(label_to_index).tolist()
     values = link_counts["value"].tolist()
 
     # Set default palettes if not provided
@@ -368,14 +370,13 @@ def plot_sankey(
     if palette_na is None:
         palette_na = const.COLOR_NA
 
+    # Use a distinct color for links to/from (NA) and from the start node
+    is_na_link = (link_counts["source_name"] == NA_EVENT) | (link_counts["target_name"] == NA_EVENT)
+    is_start_link = link_counts["source_order"] == 0
+
     # Get unique target events for color assignment (all links landing on the same
     # event share a color, regardless of where they came from)
-    target_events = []
-    for i, row in link_counts.iterrows():
-        source_l = row["source_label"]
-        target_l = row["ordered_event_label"]
-        if NA_EVENT not in source_l and NA_EVENT not in target_l and source_l != "[0] start":
-            target_events.append(re.search(r"\] (.*)", target_l).group(1))
+    target_events = link_counts["target_name"][~is_na_link & ~is_start_link]
 
     # Assign colors to target events using assign_column_colors helper
     unique_target_events = list(set(target_events))
@@ -388,19 +389,13 @@ def plot_sankey(
     )
 
     # Build link colors list
-    link_colors = []
-    for i, row in link_counts.iterrows():
-        source_l = row["source_label"]
-        target_l = row["ordered_event_label"]
-
-        # Use a distinct color for links to/from (NA)
-        if NA_EVENT in source_l or NA_EVENT in target_l:
-            link_colors.append(palette_na[0])
-        elif source_l == "[0] start":
-            link_colors.append(palette_start[0])
-        else:
-            target_event_name = re.search(r"\] (.*)", target_l).group(1)
-            link_colors.append(event_colors[target_event_name])
+    link_colors = (
+        link_counts["target_name"]
+        .map(event_colors)
+        .mask(is_start_link, palette_start[0])
+        .mask(is_na_link, palette_na[0])
+        .tolist()
+    )
 
     formatted_total_ids = f"{total_unique_ids:,}".replace(",", "_")
     total_rows = len(df_processed)
@@ -441,3 +436,18 @@ def plot_sankey(
     alt_text = alt_text or chart_title
     _add_alt_text(alt_text)
     fig.show(renderer=renderer or os.getenv("RENDERER"), width=width, height=height)
+
+
+def _node_label(order: pd.Series, name: pd.Series) -> pd.Series:
+    """Node labels like "[1] op" from the event order number and the event name."""
+    return "[" + order.astype(str) + "] " + name
+
+
+def _percent(share: pd.Series) -> pd.Series:
+    """Rounded percentages like "42%", missing shares stay missing."""
+    return share.round().astype("Int64").astype("string") + "%"
+
+
+def _thousands(count: pd.Series) -> pd.Series:
+    """Integers with "_" as thousands separator, like f"{count:_}"."""
+    return count.astype(str).str.replace(r"\B(?=(\d{3})+$)", "_", regex=True)
@@ -1,23 +1,42 @@
+from __future__ import annotations
+
 import os
+from dataclasses import replace
 from pathlib import Path
-from typing import Literal, Optional
+from typing import TYPE_CHECKING, Literal, Optional
 
 import pandas as pd
 import plotly.express as px
+import plotly.graph_objects as go
 
 from pandas_plots import const
 
 from ..helper import (
     _aggregate_data,
+    _aggregate_data_db,
     _assign_column_colors,
+    _fillna,
     _group_kkr,
+    _project,
     _set_caption,
     _add_alt_text,
+    _draw_stacked_bars_mpl,
+    _mpl_figure,
+    _mpl_text,
+    _show_mpl,
+    _to_relation,
+    _use_matplotlib,
 )
+from ..cache import cached
+from ..labels import fmt_number, fmt_pct, is_visible, join_labels
+from ..plot_data import PlotData
+
+if TYPE_CHECKING:
+    import duckdb as ddb
 
 
 def plot_stacked_bars(
-    df: pd.DataFrame,
+    df: pd.DataFrame | ddb.DuckDBPyRelation | str | PlotData,
     top_n_index: int = 0,
     top_n_color: int = 0,
     dropna: bool = False,
@@ -46,12 +65,19 @@ def plot_stacked_bars(
     kkr_col: Optional[str] = None,
     first_col_grey: bool = False,
     alt_text: str = None,
-) -> None:
+    engine: Literal["pandas", "duckdb"] = "pandas",
+    con: ddb.DuckDBPyConnection = None,
+    return_data: bool = False,
+    backend: Literal["plotly", "matplotlib", "auto"] = "plotly",
+) -> PlotData | None:
     """
     Generates a stacked bar plot using the provided DataFrame.
 
     Args:
-        df (pd.DataFrame): The input DataFrame with at least two categorical columns and one numerical column.
+        df (pd.DataFrame | ddb.DuckDBPyRelation | str): The input DataFrame with at least two categorical columns and one numerical column.
+            A duckdb relation or a sql query (run on `con`) implies `engine="duckdb"`.
+            A `PlotData` from a previous call is rendered again without aggregating, only render parameters apply
+            (orientation, relative, show_pct_all, show_pct_bar, height, width, renderer, png_path, alt_text).
         top_n_index (int): Limit the number of categories displayed on the index axis.
         top_n_color (int): Limit the number of categories displayed in the color legend.
         dropna (bool): If True, removes rows with missing values; otherwise, replaces them with `null_label`.
@@ -80,16 +106,118 @@ def plot_stacked_bars(
         show_pct_bar (bool): If True, formats the bar text with percentages from the bar's total.
         kkr_col (str): Edge case: Name of the column that contains kkr name to ensure all kkr are shown
         alt_text (str, optional): Custom alt text for accessibility. Defaults to title or caption if not provided.
-
-    Returns: None
+        engine (Literal["pandas", "duckdb"]): "duckdb" runs null labelling, grouping, top n, "(other)" and total
+            as one query in duckdb and fetches only the aggregated result. Labels are plotted as text.
+        con (ddb.DuckDBPyConnection): Connection for a sql query or DataFrame with `engine="duckdb"`. Defaults to the duckdb default connection.
+        return_data (bool): If True, returns the aggregated `PlotData` for re-rendering or `hlp.export_plot_data()`.
+        backend (Literal["plotly", "matplotlib", "auto"]): "matplotlib" renders a static image from the same data, colors
+            and labels, without plotly json and kaleido (`renderer` does not apply). "auto" uses matplotlib above
+            `helper.AUTO_BACKEND_MARKS` bars (segments). Defaults to "plotly".
+
+    Returns:
+        PlotData | None: The aggregated data if `return_data` is True.
     """
-    BAR_LENGTH_MULTIPLIER = 1.05
+    if backend not in ("plotly", "matplotlib", "auto"):
+        print(f"❌ backend must be one of 'plotly', 'matplotlib', 'auto', got '{backend}'")
+        return
+    if isinstance(df, PlotData):
+        data = df
+        if not data._check_kind("plot_stacked_bars"):
+            return
+    else:
+        data = _compute_stacked_bars(
+            df=df,
+            top_n_index=top_n_index,
+            top_n_color=top_n_color,
+            dropna=dropna,
+            swap=swap,
+            sort_values_index=sort_values_index,
+            sort_values_color=sort_values_color,
+            show_total=show_total,
+            precision=precision,
+            null_label=null_label,
+            show_other=show_other,
+            kkr_col=kkr_col,
+            engine=engine,
+            con=con,
+        )
+        if data is None:
+            return
+        # * title and colors are applied to the (cached) aggregation, changing them never reruns the groupby
+        data = _decorate_stacked_bars(
+            data,
+            title=title,
+            caption=caption,
+            caption_only_n=caption_only_n,
+            no_n=no_n,
+            color_palette=color_palette,
+            null_label=null_label,
+            first_col_grey=first_col_grey,
+        )
+
+    # * alt text handling. prio order: alt_text -> title -> caption
+    alt_text = alt_text or title or caption
+    _add_alt_text(alt_text)
+
+    render_args = dict(
+        orientation=orientation,
+        relative=relative,
+        show_pct_all=show_pct_all,
+        show_pct_bar=show_pct_bar,
+        height=height,
+        width=width,
+    )
+    if _use_matplotlib(backend, len(data.frame)):
+        _show_mpl(_render_stacked_bars_mpl(data, **render_args), png_path)
+        return data if return_data else None
+
+    fig = _render_stacked_bars(data, **render_args)
+
+    # * save to png if path is provided
+    if png_path is not None:
+        fig.write_image(Path(png_path).as_posix())
+
+    fig.show(
+        renderer=renderer or os.getenv("RENDERER"),
+        width=width,
+        height=height,
+    )
+
+    return data if return_data else None
+
+
+@cached(ignore=("con",))
+def _compute_stacked_bars(
+    df: pd.DataFrame | ddb.DuckDBPyRelation | str,
+    top_n_index: int,
+    top_n_color: int,
+    dropna: bool,
+    swap: bool,
+    sort_values_index: bool,
+    sort_values_color: bool,
+    show_total: bool,
+    precision: int,
+    null_label: str,
+    show_other: bool,
+    kkr_col: Optional[str],
+    engine: Literal["pandas", "duckdb"],
+    con: ddb.DuckDBPyConnection,
+) -> PlotData | None:
+    """Compute stage of plot_stacked_bars: aggregation and category orders. Title and colors are added by `_decorate_stacked_bars`."""
+    if not isinstance(df, pd.DataFrame):
+        engine = "duckdb"
+    if engine == "duckdb":
+        df = _to_relation(df, con)
 
     # * 2 axis means at least 2 columns
     if len(df.columns) < 2 or len(df.columns) > 3:
         print("❌ df must have exactly 2 or 3 columns")
         return
 
+    if engine == "duckdb" and kkr_col:
+        print("❌ kkr_col is not supported with engine='duckdb'")
+        return
+
     # ! do not enforce str columns anymore
     # # * check if first 2 columns are str
     # dtypes = set(df.iloc[:, [0, 1]].dtypes)
@@ -105,133 +233,126 @@ def plot_stacked_bars(
     #     print("❌ last column must be numeric")
     #     return
 
-    df = df.copy()  # Copy the input DataFrame to avoid modifying the original
-    
-    # * alt text handling. prio order: alt_text -> title -> caption
-    alt_text = alt_text or title or caption
-    _add_alt_text(alt_text)
-
-    if kkr_col:
-        df = _group_kkr(df=df, kkr_col=kkr_col)
-
-    # * add count column[2] as a service if none is present
-    if len(df.columns) == 2:
-        df["cnt"] = 1
-
-    # * handle null values
-    if not dropna:
-        df = df.fillna(null_label)
-    else:
-        df.dropna(inplace=True)
-
-    # * strip whitespaces if columns are str
-    if df.iloc[:, 0].dtype.kind == "O":
-        df.iloc[:, 0] = df.iloc[:, 0].str.strip()
-    if df.iloc[:, 1].dtype.kind == "O":
-        df.iloc[:, 1] = df.iloc[:, 1].str.strip()
-
-    # * apply precision
-    df.iloc[:, 2] = df.iloc[:, 2].round(precision)
-
     # # * set index + color col
     col_index = df.columns[0] if not swap else df.columns[1]
     col_color = df.columns[1] if not swap else df.columns[0]
+    value_name = df.columns[2] if len(df.columns) == 3 else "cnt"
+
+    if engine == "duckdb":
+        # * total is always added on the first column, like below
+        aggregated_df, n = _aggregate_data_db(
+            rel=df,
+            index=col_index,
+            col=col_color,
+            value=df.columns[2] if len(df.columns) == 3 else None,
+            top_n_index=top_n_index,
+            top_n_color=top_n_color,
+            null_label=null_label,
+            show_other=show_other,
+            sort_values_index=sort_values_index,
+            sort_values_color=sort_values_color,
+            dropna=dropna,
+            strip=True,
+            precision=precision,
+            total=("col" if swap else "index") if show_total else None,
+        )
+        n = int(n)
+    else:
+        aggregated_df, n = _aggregate_stacked_df(
+            df=df,
+            swap=swap,
+            dropna=dropna,
+            precision=precision,
+            show_total=show_total,
+            kkr_col=kkr_col,
+            top_n_index=top_n_index,
+            top_n_color=top_n_color,
+            null_label=null_label,
+            show_other=show_other,
+            sort_values_index=sort_values_index,
+            sort_values_color=sort_values_color,
+        )
+
+    df = aggregated_df
 
-    # * ensure df is grouped to prevent false aggregations
-    df = df.groupby([df.columns[0], df.columns[1]])[df.columns[2]].sum().reset_index()
+    if sort_values_color:
+        colors_unique = df.groupby("col", observed=True)["value"].sum().sort_values(ascending=False).index.tolist()
+    else:
+        colors_unique = sorted(df["col"].unique().tolist())
 
-    # * add total as aggregation of df
-    if show_total:
-        df_total = df.groupby(df.columns[1], observed=True, as_index=False)[df.columns[2]].sum()
-        df_total[df.columns[0]] = " Total"
-        df = pd.concat([df, df_total], ignore_index=True)
+    if sort_values_index:
+        index_unique = df.groupby("index", observed=True)["value"].sum().sort_values(ascending=False).index.tolist()
+    else:
+        index_unique = sorted(df["index"].unique().tolist())
 
-    # * calculate n
-    divider = 2 if show_total else 1
-    n = int(df.iloc[:, 2].sum() / divider)
+    cat_orders = {
+        "index": index_unique,
+        "col": colors_unique,
+    }
+
+    return PlotData(
+        kind="plot_stacked_bars",
+        frame=df,
+        category_orders=cat_orders,
+        title_parts={
+            "top_index": f"TOP{top_n_index} " if top_n_index > 0 else "",
+            "top_color": f"TOP{top_n_color} " if top_n_color > 0 else "",
+            "null": ", NULL excluded" if dropna else "",
+        },
+        columns={"index": col_index, "col": col_color, "value": value_name},
+        n=n,
+        meta={"precision": precision},
+    )
 
-    # * title str
-    _title_str_top_index = f"TOP{top_n_index} " if top_n_index > 0 else ""
-    _title_str_top_color = f"TOP{top_n_color} " if top_n_color > 0 else ""
-    _title_str_null = ", NULL excluded" if dropna else ""
-    _n_str = "" if no_n else f", n={n:_}"
+
+def _decorate_stacked_bars(
+    data: PlotData,
+    title: str,
+    caption: str,
+    caption_only_n: bool,
+    no_n: bool,
+    color_palette: str | list[str],
+    null_label: str,
+    first_col_grey: bool,
+) -> PlotData:
+    """Cosmetic part of the compute stage of plot_stacked_bars: title and colors of the aggregated data."""
+    parts = data.title_parts
+    _n_str = "" if no_n else f", n={data.n:_}"
 
     if caption_only_n:
         _title_str = _n_str.replace(",", "").strip()
     elif title:
         _title_str = f"{title}{_n_str}"
     else:
-        _title_str = f"{_set_caption(caption)}{_title_str_top_index}[{col_index}] by {_title_str_top_color}[{col_color}]{_title_str_null}{_n_str}"
-
-    _df = df.copy().assign(facet=None)
-    _df.columns = ["index", "col", "value", "facet"] if not swap else ["col", "index", "value", "facet"]
+        _title_str = f"{_set_caption(caption)}{parts['top_index']}[{data.columns['index']}] by {parts['top_color']}[{data.columns['col']}]{parts['null']}{_n_str}"
 
-    aggregated_df = _aggregate_data(
-        df=_df,
-        top_n_index=top_n_index,
-        top_n_color=top_n_color,
-        top_n_facet=0,
-        null_label=null_label,
-        show_other=show_other,
-        sort_values_index=sort_values_index,
-        sort_values_color=sort_values_color,
-        sort_values_facet=False,  # just a placeholder
+    return replace(
+        data,
+        color_map=_assign_column_colors(data.category_orders["col"], color_palette, null_label, first_col_grey),
+        title_parts={"text": _title_str, "caption": _set_caption(caption), **parts, "n": _n_str},
     )
 
-    df = aggregated_df.copy()
 
-    # * calculate bar totals
-    bar_totals = df.groupby("index")["value"].transform("sum")
-
-    # * after grouping add cols for pct and formatting
-    df["cnt_pct_all_only"] = (df["value"] / n * 100).apply(lambda x: f"{(x):.{precision}f}%")
-    df["cnt_pct_bar_only"] = (df["value"] / bar_totals * 100).apply(lambda x: f"{(x):.{precision}f}%")
+def _render_stacked_bars(
+    data: PlotData,
+    orientation: Literal["h", "v"],
+    relative: bool,
+    show_pct_all: bool,
+    show_pct_bar: bool,
+    height: int,
+    width: int,
+) -> go.Figure:
+    """Render stage of plot_stacked_bars, builds the figure from the aggregated data."""
+    BAR_LENGTH_MULTIPLIER = 1.05
 
-    # * format output
-    df["cnt_str"] = df["value"].apply(lambda x: f"{x:_.{precision}f}")
+    df = data.frame.copy()
+    n = data.n
+    precision = data.meta["precision"]
+    cat_orders = {axis: list(order) for axis, order in data.category_orders.items()}
+    col_color = data.columns["col"]
 
     divider2 = "<br>" if orientation == "v" else " "
-
-    # Modify this section
-    df["cnt_pct_all_str"] = df.apply(
-        lambda row: (
-            f"{row['cnt_str']}{divider2}({row['cnt_pct_all_only']})"
-            if (row["value"] / n * 100) >= 5
-            else row["cnt_str"]
-        ),
-        axis=1,
-    )
-    df["cnt_pct_bar_str"] = df.apply(
-        lambda row: (
-            f"{row['cnt_str']}{divider2}({row['cnt_pct_bar_only']})"
-            if (row["value"] / bar_totals.loc[row.name] * 100) >= 5
-            else row["cnt_str"]
-        ),
-        axis=1,
-    )
-
-    text_to_show = "cnt_str"
-    if show_pct_all:
-        text_to_show = "cnt_pct_all_str"
-    elif show_pct_bar:
-        text_to_show = "cnt_pct_bar_str"
-
-    if sort_values_color:
-        colors_unique = df.groupby("col", observed=True)["value"].sum().sort_values(ascending=False).index.tolist()
-    else:
-        colors_unique = sorted(df["col"].unique().tolist())
-
-    if sort_values_index:
-        index_unique = df.groupby("index", observed=True)["value"].sum().sort_values(ascending=False).index.tolist()
-    else:
-        index_unique = sorted(df["index"].unique().tolist())
-
-    color_map = _assign_column_colors(colors_unique, color_palette, null_label, first_col_grey)
-
-    cat_orders = {
-        "index": index_unique,
-        "col": colors_unique,
-    }
+    text_to_show = _add_text_columns(df, n, precision, divider2, show_pct_all, show_pct_bar)
 
     # Ensure bl is categorical with the correct order
     df["index"] = pd.Categorical(df["index"], categories=cat_orders["index"], ordered=True)
@@ -245,9 +366,9 @@ def plot_stacked_bars(
         color="col",
         text=text_to_show,
         orientation=orientation,
-        title=_title_str,
+        title=data.title,
         template="plotly_dark" if os.getenv("THEME") == "dark" else "plotly",
-        color_discrete_map=color_map,  # Use assigned colors
+        color_discrete_map=dict(data.color_map),  # Use assigned colors
         category_orders=cat_orders,
     )
 
@@ -305,14 +426,141 @@ def plot_stacked_bars(
         height=height,
     )
 
-    # * save to png if path is provided
-    if png_path is not None:
-        fig.write_image(Path(png_path).as_posix())
+    return fig
 
-    fig.show(
-        renderer=renderer or os.getenv("RENDERER"),
-        width=width,
-        height=height,
+
+def _add_text_columns(
+    df: pd.DataFrame, n: float, precision: int, divider: str, show_pct_all: bool, show_pct_bar: bool
+) -> str:
+    """Adds the label columns to the aggregated data (in place), returns the name of the column to show."""
+    # * calculate bar totals
+    bar_totals = df.groupby("index")["value"].transform("sum")
+
+    # * after grouping add cols for pct and formatting
+    share_all = df["value"] / n
+    share_bar = df["value"] / bar_totals
+    df["cnt_pct_all_only"] = fmt_pct(share_all, precision)
+    df["cnt_pct_bar_only"] = fmt_pct(share_bar, precision)
+
+    # * format output
+    df["cnt_str"] = fmt_number(df["value"], precision)
+
+    # * pct only on segments that are large enough to show it
+    df["cnt_pct_all_str"] = join_labels(df["cnt_str"], df["cnt_pct_all_only"], divider, mask=is_visible(share_all))
+    df["cnt_pct_bar_str"] = join_labels(df["cnt_str"], df["cnt_pct_bar_only"], divider, mask=is_visible(share_bar))
+
+    if show_pct_all:
+        return "cnt_pct_all_str"
+    if show_pct_bar:
+        return "cnt_pct_bar_str"
+    return "cnt_str"
+
+
+def _render_stacked_bars_mpl(
+    data: PlotData,
+    orientation: Literal["h", "v"],
+    relative: bool,
+    show_pct_all: bool,
+    show_pct_bar: bool,
+    height: int,
+    width: int,
+):
+    """Render stage of plot_stacked_bars for backend="matplotlib", same data, colors and labels as the plotly figure."""
+    BAR_LENGTH_MULTIPLIER = 1.05
+
+    df = data.frame.copy()
+    text_to_show = _add_text_columns(df, data.n, data.meta["precision"], "\n", show_pct_all, show_pct_bar)
+    if relative:
+        # * same as plotly's barnorm="percent"
+        df["value"] = df["value"] / df.groupby("index")["value"].transform("sum") * 100
+
+    fig, axes = _mpl_figure(width, height)
+    ax = axes[0, 0]
+    totals = _draw_stacked_bars_mpl(
+        ax,
+        df,
+        index_order=list(data.category_orders["index"]),
+        color_order=list(data.category_orders["col"]),
+        color_map=dict(data.color_map),
+        orientation=orientation,
+        text=text_to_show,
+    )
+
+    value_axis = ax.set_ylim if orientation == "v" else ax.set_xlim
+    value_axis(0, 100 if relative else (totals.max() if len(totals) else 1) * BAR_LENGTH_MULTIPLIER)
+    ax.grid(True, axis="y" if orientation == "v" else "x", alpha=0.3)
+    ax.set_axisbelow(True)
+    ax.set_title(_mpl_text(data.title), loc="left")
+    ax.legend(title=data.columns["col"], loc="upper left", bbox_to_anchor=(1.0, 1.0), frameon=False)
+    return fig
+
+
+def _aggregate_stacked_df(
+    df: pd.DataFrame,
+    swap: bool,
+    dropna: bool,
+    precision: int,
+    show_total: bool,
+    kkr_col: Optional[str],
+    top_n_index: int,
+    top_n_color: int,
+    null_label: str,
+    show_other: bool,
+    sort_values_index: bool,
+    sort_values_color: bool,
+) -> tuple[pd.DataFrame, int]:
+    """pandas engine of plot_stacked_bars, returns the aggregated data and n."""
+    if kkr_col:
+        df = _group_kkr(df=df, kkr_col=kkr_col)
+    else:
+        # * columns are only replaced, never written into
+        df = _project(df)
+
+    # * add count column[2] as a service if none is present
+    if len(df.columns) == 2:
+        df["cnt"] = 1
+
+    # * handle null values
+    if not dropna:
+        df = _fillna(df, null_label)
+    else:
+        df = df.dropna()
+
+    # * strip whitespaces if columns are str
+    if df.iloc[:, 0].dtype.kind == "O":
+        df[df.columns[0]] = df.iloc[:, 0].str.strip()
+    if df.iloc[:, 1].dtype.kind == "O":
+        df[df.columns[1]] = df.iloc[:, 1].str.strip()
+
+    # * apply precision
+    df[df.columns[2]] = df.iloc[:, 2].round(precision)
+
+    # * ensure df is grouped to prevent false aggregations
+    df = df.groupby([df.columns[0], df.columns[1]])[df.columns[2]].sum().reset_index()
+
+    # * add total as aggregation of df
+    if show_total:
+        df_total = df.groupby(df.columns[1], observed=True, as_index=False)[df.columns[2]].sum()
+        df_total[df.columns[0]] = " Total"
+        df = pd.concat([df, df_total], ignore_index=True)
+
+    # * calculate n
+    divider = 2 if show_total else 1
+    n = int(df.iloc[:, 2].sum() / divider)
+
+    _df = df.assign(facet=None)
+    _df.columns = ["index", "col", "value", "facet"] if not swap else ["col", "index", "value", "facet"]
+
+    aggregated_df = _aggregate_data(
+        df=_df,
+        top_n_index=top_n_index,
+        top_n_color=top_n_color,
+        top_n_facet=0,
+        null_label=null_label,
+        show_other=show_other,
+        sort_values_index=sort_values_index,
+        sort_values_color=sort_values_color,
+        sort_values_facet=False,  # just a placeholder
     )
 
-    return
+    return aggregated_df, n
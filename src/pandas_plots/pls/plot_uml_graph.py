@@ -4,6 +4,8 @@ import duckdb
 import pandas as pd
 from IPython.display import Markdown, display
 
+from ..helper import _project
+
 
 def plot_uml_graph(df=None, orientation="v", debug=False, show_legend=True):
     """
@@ -77,6 +79,9 @@ def plot_uml_graph(df=None, orientation="v", debug=False, show_legend=True):
         df = pd.DataFrame(attunement_data, columns=["source", "target", "category", "weight"])
         print("Demo mode - Input table (first 5 rows):")
 
+    # * text columns are cleaned on a projection, the caller's df stays untouched
+    df = _project(df)
+
     # Remove unwanted characters from all text columns
     chars_to_remove = ["§", "(", ")", "@", "…", "‑", "“", " ", "„"]
     for col in df.select_dtypes(include=["object", "string"]).columns:
@@ -0,0 +1,577 @@
+"""
+Column profiles for the table functions.
+
+Each column is counted once (one hash pass, `value_counts(sort=False)`), everything else is derived
+from the counts table, which only has one row per distinct value:
+
+    prof = profile_frame(df)
+    prof["age"].n_missing, prof["age"].n_distinct
+    prof["age"].by_order(5)          # first 5 values by sort order (with missing)
+    prof["age"].by_frequency(10)     # 10 most frequent values (without missing)
+    prof["age"].moments["mean"]
+
+For frames too large to count exactly, `sketch_frame()` works in chunks with bounded memory: distinct counts
+come from a HyperLogLog sketch, top values from a space-saving summary. Both report their error bounds.
+`sample_rows()` draws the rows for everything else (numeric summary, bar plots).
+
+Numeric summaries of data that arrives in chunks (`pd.read_csv(chunksize=...)`, record batches) are kept
+as `SummaryState` per column: exact counts and moments, quantiles from a t-digest. States are plain dicts
+via `to_dict()`, so shards can be summarized in other processes and merged afterwards:
+
+    parts = [summarize_chunks(pd.read_csv(path, chunksize=1_000_000)) for path in shards]
+    states = merge_summaries(parts)
+    tbl.print_summary(states)
+"""
+
+from collections.abc import Iterable
+from dataclasses import dataclass, field, replace
+from functools import cached_property
+
+import numpy as np
+import pandas as pd
+
+from .helper import _map_ordered
+
+# * 2**14 registers, relative standard error of the distinct count 1.04 / 2**7 = 0.8%
+HLL_PRECISION = 14
+# * counters of the space-saving summary, the error of a top count is at most n_rows / capacity
+TOP_K_CAPACITY = 1_000
+SAMPLE_ROWS = 100_000
+CHUNK_ROWS = 1_000_000
+# * the t-digest keeps about compression / 2 centroids, single values at the tails
+TDIGEST_COMPRESSION = 200
+
+
+@dataclass(frozen=True)
+class ColumnProfile:
+    """
+    Counts of one column and the stats derived from them.
+
+    Attributes:
+        name (str): Column name.
+        dtype: Column dtype.
+        n_rows (int): Number of rows, including missing values.
+        counts (pd.Series): Distinct value -> count, including missing values, in order of first appearance.
+    """
+
+    name: str
+    dtype: object
+    n_rows: int
+    counts: pd.Series
+
+    @cached_property
+    def _missing(self) -> np.ndarray:
+        return np.asarray(self.counts.index.isna())
+
+    @cached_property
+    def labels(self) -> pd.Series:
+        """
+        Counts by display value. Object columns are keyed by their str value, so mixed types can be sorted
+        (values with the same text are merged). Other columns are keyed by their value.
+        """
+        if self.dtype != "object":
+            return self.counts
+        return self.counts.groupby(self.counts.index.astype(str), sort=False).sum()
+
+    @property
+    def n_missing(self) -> int:
+        return int(self.counts[self._missing].sum())
+
+    @property
+    def n_distinct(self) -> int:
+        """Number of distinct display values, a missing value counts as one."""
+        return len(self.labels)
+
+    @property
+    def is_unique(self) -> bool:
+        """True if no value (missing included) occurs twice."""
+        return len(self.counts) == self.n_rows
+
+    def by_order(self, k: int = None) -> pd.Series:
+        """First `k` display values by sort order, missing last."""
+        return self.labels.sort_index().iloc[:k]
+
+    def by_frequency(self, k: int = None) -> pd.Series:
+        """`k` most frequent values without missing, same order as `value_counts()`."""
+        return self.counts[~self._missing].sort_values(ascending=False).iloc[:k]
+
+    def scaled(self, n_rows: int) -> "ColumnProfile":
+        """Profile of a sample, with counts extrapolated to `n_rows`."""
+        counts = (self.counts * (n_rows / self.n_rows)).round().astype("int64")
+        return ColumnProfile(name=self.name, dtype=self.dtype, n_rows=n_rows, counts=counts)
+
+    @cached_property
+    def moments(self) -> dict:
+        """count, sum, mean, std, min and max of numeric columns (weighted by the counts), empty otherwise."""
+        if not pd.api.types.is_numeric_dtype(self.dtype) or pd.api.types.is_bool_dtype(self.dtype):
+            return {}
+        present = self.counts[~self._missing]
+        values = present.index.to_numpy(dtype=float, na_value=np.nan)
+        weights = present.to_numpy(dtype=float)
+        count = weights.sum()
+        if count == 0:
+            return {"count": 0, "sum": 0.0, "mean": np.nan, "std": np.nan, "min": np.nan, "max": np.nan}
+        total = (values * weights).sum()
+        mean = total / count
+        # * sample std like pandas (ddof=1)
+        var = ((values - mean) ** 2 * weights).sum() / (count - 1) if count > 1 else np.nan
+        return {
+            "count": int(count),
+            "sum": total,
+            "mean": mean,
+            "std": np.sqrt(var),
+            "min": values.min(),
+            "max": values.max(),
+        }
+
+
+def profile_column(ser: pd.Series) -> ColumnProfile:
+    """Counts the values of `ser` in one pass and returns its profile."""
+    return ColumnProfile(
+        name=ser.name,
+        dtype=ser.dtype,
+        n_rows=len(ser),
+        counts=ser.value_counts(dropna=False, sort=False),
+    )
+
+
+def profile_frame(df: pd.DataFrame, workers: int = 1) -> dict[str, ColumnProfile]:
+    """Returns column name -> profile, in column order. Columns are counted on `workers` threads."""
+    return dict(zip(df.columns, _map_ordered(lambda col: profile_column(df[col]), df.columns, workers)))
+
+
+def _bit_length(x: np.ndarray) -> np.ndarray:
+    """Bit length of uint32 values (exact, float64 holds 32 bit integers)."""
+    return np.frexp(x.astype(np.float64))[1]
+
+
+def hll_registers(hashes: np.ndarray, registers: np.ndarray = None, p: int = HLL_PRECISION) -> np.ndarray:
+    """
+    Adds 64 bit hashes to HyperLogLog registers (new ones if None). Registers of two sketches merge by `np.maximum`.
+    The first `p` bits select the register, it keeps the max position of the first 1 bit in the remaining bits.
+    """
+    if registers is None:
+        registers = np.zeros(2**p, dtype=np.uint8)
+    hashes = np.asarray(hashes, dtype=np.uint64)
+    idx = (hashes >> np.uint64(64 - p)).astype(np.intp)
+    rest = hashes << np.uint64(p)
+    high, low = (rest >> np.uint64(32)), (rest & np.uint64(0xFFFFFFFF))
+    leading_zeros = np.where(high > 0, 32 - _bit_length(high), 64 - _bit_length(low))
+    rank = np.minimum(leading_zeros + 1, 64 - p + 1).astype(np.uint8)
+    np.maximum.at(registers, idx, rank)
+    return registers
+
+
+def hll_estimate(registers: np.ndarray) -> tuple[float, float]:
+    """Returns the distinct count estimate and its relative standard error."""
+    m = len(registers)
+    alpha = 0.7213 / (1 + 1.079 / m)
+    estimate = alpha * m * m / np.sum(np.ldexp(1.0, -registers.astype(np.int64)))
+    zeros = int((registers == 0).sum())
+    # * small range correction (linear counting)
+    if estimate <= 2.5 * m and zeros > 0:
+        estimate = m * np.log(m / zeros)
+    return float(estimate), 1.04 / np.sqrt(m)
+
+
+@dataclass(frozen=True)
+class TopK:
+    """
+    Space-saving summary of the most frequent values.
+
+    Attributes:
+        counts (pd.Series): Value -> estimated count (an overestimate), descending.
+        errors (pd.Series): Value -> max overestimate, the true count is in [count - error, count].
+        floor (int): Max count of any value not in `counts`.
+    """
+
+    counts: pd.Series
+    errors: pd.Series
+    floor: int = 0
+
+    @classmethod
+    def from_counts(cls, counts: pd.Series, capacity: int = TOP_K_CAPACITY) -> "TopK":
+        """Summary of exact counts, truncated to `capacity` values."""
+        counts = counts.sort_values(ascending=False, kind="stable")
+        floor = int(counts.iloc[capacity]) if len(counts) > capacity else 0
+        counts = counts.iloc[:capacity]
+        return cls(counts=counts, errors=pd.Series(0, index=counts.index, dtype="int64"), floor=floor)
+
+    def merge(self, other: "TopK", capacity: int = TOP_K_CAPACITY) -> "TopK":
+        """Merges two summaries, a value missing in one of them is assumed at that summary's floor."""
+        keys = self.counts.index.append(other.counts.index).unique()
+        counts = self.counts.reindex(keys, fill_value=self.floor) + other.counts.reindex(keys, fill_value=other.floor)
+        errors = self.errors.reindex(keys, fill_value=self.floor) + other.errors.reindex(keys, fill_value=other.floor)
+        counts = counts.sort_values(ascending=False, kind="stable")
+        floor = int(counts.iloc[capacity]) if len(counts) > capacity else self.floor + other.floor
+        counts = counts.iloc[:capacity]
+        return TopK(counts=counts, errors=errors[counts.index], floor=floor)
+
+    @property
+    def max_error(self) -> int:
+        """Max overestimate of any reported count."""
+        return int(self.errors.max()) if len(self.errors) else 0
+
+
+@dataclass(frozen=True)
+class ColumnSketch:
+    """
+    Approximate profile of one column. `n_rows` and `n_missing` are exact.
+
+    Attributes:
+        name (str): Column name.
+        dtype: Column dtype.
+        n_rows (int): Number of rows, including missing values.
+        n_missing (int): Number of missing values.
+        n_distinct (float): Estimated number of distinct values, a missing value counts as one.
+        distinct_error (float): Relative standard error of `n_distinct`.
+        top (TopK): Most frequent values without missing.
+    """
+
+    name: str
+    dtype: object
+    n_rows: int
+    n_missing: int
+    n_distinct: float
+    distinct_error: float
+    top: TopK
+
+    def by_frequency(self, k: int = None) -> pd.Series:
+        """`k` most frequent values without missing, with estimated counts."""
+        return self.top.counts.iloc[:k]
+
+
+def sketch_column(ser: pd.Series, capacity: int = TOP_K_CAPACITY, chunk_rows: int = CHUNK_ROWS) -> ColumnSketch:
+    """
+    Sketches `ser` chunk by chunk, memory is bound by `chunk_rows` and `capacity`.
+    Each chunk is counted once, the sketches are fed with its distinct values (HyperLogLog ignores repeats).
+    """
+    registers, top, n_missing = None, None, 0
+    for start in range(0, max(len(ser), 1), chunk_rows):
+        counts = ser.iloc[start : start + chunk_rows].value_counts(dropna=False, sort=False)
+        missing = np.asarray(counts.index.isna())
+        n_missing += int(counts[missing].sum())
+        registers = hll_registers(pd.util.hash_pandas_object(counts.index.to_series(), index=False).to_numpy(), registers)
+        chunk_top = TopK.from_counts(counts[~missing], capacity)
+        top = chunk_top if top is None else top.merge(chunk_top, capacity)
+    n_distinct, distinct_error = hll_estimate(registers)
+    return ColumnSketch(
+        name=ser.name,
+        dtype=ser.dtype,
+        n_rows=len(ser),
+        n_missing=n_missing,
+        n_distinct=n_distinct,
+        distinct_error=distinct_error,
+        top=top,
+    )
+
+
+def sketch_frame(df: pd.DataFrame, capacity: int = TOP_K_CAPACITY, workers: int = 1) -> dict[str, ColumnSketch]:
+    """Returns column name -> sketch, in column order. Columns are sketched on `workers` threads."""
+    return dict(zip(df.columns, _map_ordered(lambda col: sketch_column(df[col], capacity), df.columns, workers)))
+
+
+def approx_duplicates(df: pd.DataFrame, subset: list[str] = None, chunk_rows: int = CHUNK_ROWS) -> tuple[float, float]:
+    """
+    Estimates the number of duplicated rows as rows - distinct rows (HyperLogLog over row hashes).
+
+    Returns:
+        tuple[float, float]: Estimate and its absolute standard error.
+    """
+    data = df if subset is None else df[subset]
+    registers = None
+    for start in range(0, len(data), chunk_rows):
+        hashes = pd.util.hash_pandas_object(data.iloc[start : start + chunk_rows], index=False).to_numpy()
+        registers = hll_registers(hashes, registers)
+    if registers is None:
+        return 0.0, 0.0
+    n_distinct, error = hll_estimate(registers)
+    n_distinct = min(n_distinct, len(data))
+    return len(data) - n_distinct, n_distinct * error
+
+
+def sample_rows(n_rows: int, k: int = SAMPLE_ROWS, seed: int = 0) -> np.ndarray:
+    """
+    Positions of a uniform random sample of `k` rows, sorted. The frame is in memory, so the positions are
+    drawn directly, same distribution as a reservoir sample over a stream.
+    """
+    if n_rows <= k:
+        return np.arange(n_rows)
+    return np.sort(np.random.default_rng(seed).choice(n_rows, size=k, replace=False))
+
+
+@dataclass(frozen=True)
+class Moments:
+    """
+    Count, sum, mean and central moment sums of a column. Two states merge exactly (pairwise update of
+    Chan and Pebay, the batch form of Welford's algorithm), so the result does not depend on the chunking.
+
+    Attributes:
+        count (int): Number of values.
+        total (int | float): Sum of the values, int for int columns.
+        mean (float): Mean.
+        m2 (float): Sum of squared deviations from the mean.
+        m3 (float): Sum of cubed deviations.
+        m4 (float): Sum of deviations to the 4th power.
+    """
+
+    count: int = 0
+    total: int | float = 0
+    mean: float = 0.0
+    m2: float = 0.0
+    m3: float = 0.0
+    m4: float = 0.0
+
+    @classmethod
+    def from_values(cls, values: np.ndarray) -> "Moments":
+        """Moments of values without missing."""
+        if not len(values):
+            return cls()
+        x = values.astype(np.float64)
+        mean = x.mean()
+        d = x - mean
+        d2 = d * d
+        return cls(
+            count=len(x),
+            total=values.sum().item(),
+            mean=float(mean),
+            m2=float(d2.sum()),
+            m3=float((d2 * d).sum()),
+            m4=float((d2 * d2).sum()),
+        )
+
+    def merge(self, other: "Moments") -> "Moments":
+        na, nb = self.count, other.count
+        if not na or not nb:
+            return self if nb == 0 else other
+        n = na + nb
+        delta = other.mean - self.mean
+        m2 = self.m2 + other.m2 + delta**2 * na * nb / n
+        m3 = self.m3 + other.m3 + delta**3 * na * nb * (na - nb) / n**2 + 3 * delta * (na * other.m2 - nb * self.m2) / n
+        m4 = (
+            self.m4
+            + other.m4
+            + delta**4 * na * nb * (na * na - na * nb + nb * nb) / n**3
+            + 6 * delta**2 * (na * na * other.m2 + nb * nb * self.m2) / n**2
+            + 4 * delta * (na * other.m3 - nb * self.m3) / n
+        )
+        return Moments(count=n, total=self.total + other.total, mean=self.mean + delta * nb / n, m2=m2, m3=m3, m4=m4)
+
+    @property
+    def std(self) -> float:
+        """Sample std (ddof=1) like pandas."""
+        return float(np.sqrt(self.m2 / (self.count - 1))) if self.count > 1 else np.nan
+
+    @property
+    def skew(self) -> float:
+        """Biased skewness like scipy.stats.skew."""
+        return float(np.sqrt(self.count) * self.m3 / self.m2**1.5) if self.m2 > 0 else np.nan
+
+    @property
+    def kurtosis(self) -> float:
+        """Biased excess kurtosis like scipy.stats.kurtosis."""
+        return float(self.count * self.m4 / self.m2**2 - 3) if self.m2 > 0 else np.nan
+
+
+@dataclass(frozen=True)
+class TDigest:
+    """
+    Merging t-digest, a quantile sketch of weighted centroids. Centroids are small at the tails (single values)
+    and large in the middle, the quantile error is smallest where box plots need it. Digests merge by compressing
+    their joint centroids.
+
+    Attributes:
+        means (np.ndarray): Centroid means, ascending.
+        weights (np.ndarray): Centroid weights (number of values).
+        min (float): Smallest value.
+        max (float): Largest value.
+        compression (int): Size parameter, about compression / 2 centroids are kept.
+    """
+
+    means: np.ndarray = field(default_factory=lambda: np.empty(0))
+    weights: np.ndarray = field(default_factory=lambda: np.empty(0))
+    min: float = np.nan
+    max: float = np.nan
+    compression: int = TDIGEST_COMPRESSION
+
+    @classmethod
+    def from_values(cls, values: np.ndarray, compression: int = TDIGEST_COMPRESSION) -> "TDigest":
+        """Digest of values without missing."""
+        if not len(values):
+            return cls(compression=compression)
+        values = np.sort(values.astype(np.float64))
+        return cls._compress(values, np.ones(len(values)), values[0], values[-1], compression)
+
+    @classmethod
+    def _compress(cls, means, weights, lo, hi, compression) -> "TDigest":
+        """Merges neighbouring centroids that fall into the same unit of the k1 scale (arcsin of the quantile)."""
+        order = np.argsort(means, kind="stable")
+        means, weights = means[order], weights[order]
+        cum = np.cumsum(weights)
+        q = (cum - weights / 2) / cum[-1]
+        k = compression / (2 * np.pi) * np.arcsin(2 * q - 1)
+        group = np.floor(k - k[0]).astype(np.intp)
+        w = np.bincount(group, weights=weights)
+        m = np.bincount(group, weights=means * weights)
+        keep = w > 0
+        return cls(means=m[keep] / w[keep], weights=w[keep], min=float(lo), max=float(hi), compression=compression)
+
+    @property
+    def count(self) -> int:
+        return int(self.weights.sum())
+
+    def merge(self, other: "TDigest") -> "TDigest":
+        if not len(other.means) or not len(self.means):
+            return self if not len(other.means) else other
+        return self._compress(
+            np.concatenate([self.means, other.means]),
+            np.concatenate([self.weights, other.weights]),
+            min(self.min, other.min),
+            max(self.max, other.max),
+            self.compression,
+        )
+
+    def quantile(self, q) -> np.ndarray:
+        """
+        Quantiles (0-1), interpolated between centroids. Rank q * (n - 1) like the linear method of np.percentile,
+        exact while all centroids are single values.
+        """
+        if not len(self.means):
+            return np.full(np.shape(q), np.nan)
+        centers = np.cumsum(self.weights) - self.weights / 2
+        rank = np.asarray(q) * (self.weights.sum() - 1) + 0.5
+        return np.interp(rank, centers, self.means, left=self.min, right=self.max)
+
+    def _value_at_rank(self, rank: float) -> float:
+        """Estimate of the value with 0-based rank `rank` (the centroid centers are at rank + 0.5)."""
+        centers = np.cumsum(self.weights) - self.weights / 2
+        return float(np.interp(rank + 0.5, centers, self.means, left=self.min, right=self.max))
+
+    def first_above(self, x: float) -> float:
+        """Estimate of the smallest value >= x (NaN if there is none). Exact where the centroids are single values."""
+        if not len(self.means) or x > self.max:
+            return np.nan
+        if x <= self.min:
+            return self.min
+        centers = np.cumsum(self.weights) - self.weights / 2
+        rank = np.interp(x, self.means, centers)
+        return max(self._value_at_rank(np.ceil(rank - 0.5)), x)
+
+    def last_below(self, x: float) -> float:
+        """Estimate of the largest value <= x (NaN if there is none). Exact where the centroids are single values."""
+        if not len(self.means) or x < self.min:
+            return np.nan
+        if x >= self.max:
+            return self.max
+        centers = np.cumsum(self.weights) - self.weights / 2
+        rank = np.interp(x, self.means, centers)
+        return min(self._value_at_rank(np.floor(rank - 0.5)), x)
+
+
+@dataclass(frozen=True)
+class SummaryState:
+    """
+    Mergeable summary of one numeric column: exact counts and moments, quantiles from a t-digest.
+
+    Attributes:
+        name (str): Column name.
+        kind (str): "i" for integer columns (min, max and whisker ends are shown as int), "f" otherwise.
+        n_rows (int): Number of rows, including missing values.
+        moments (Moments): Moments of the present values.
+        digest (TDigest): Quantile sketch of the present values.
+    """
+
+    name: str
+    kind: str
+    n_rows: int
+    moments: Moments
+    digest: TDigest
+
+    @classmethod
+    def from_series(cls, ser: pd.Series, compression: int = TDIGEST_COMPRESSION) -> "SummaryState":
+        values = ser.dropna().to_numpy()
+        return cls(
+            name=ser.name,
+            kind="i" if values.dtype.kind in "iu" else "f",
+            n_rows=len(ser),
+            moments=Moments.from_values(values),
+            digest=TDigest.from_values(values, compression),
+        )
+
+    def merge(self, other: "SummaryState") -> "SummaryState":
+        return SummaryState(
+            name=self.name,
+            kind="i" if self.kind == other.kind == "i" else "f",
+            n_rows=self.n_rows + other.n_rows,
+            moments=self.moments.merge(other.moments),
+            digest=self.digest.merge(other.digest),
+        )
+
+    def to_dict(self) -> dict:
+        """Plain dict of python types, e.g. for json or pickle between processes."""
+        return {
+            "name": self.name,
+            "kind": self.kind,
+            "n_rows": self.n_rows,
+            "moments": {k: getattr(self.moments, k) for k in ("count", "total", "mean", "m2", "m3", "m4")},
+            "digest": {
+                "means": self.digest.means.tolist(),
+                "weights": self.digest.weights.tolist(),
+                "min": self.digest.min,
+                "max": self.digest.max,
+                "compression": self.digest.compression,
+            },
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "SummaryState":
+        digest = dict(data["digest"])
+        digest["means"], digest["weights"] = np.asarray(digest["means"], dtype=float), np.asarray(digest["weights"], dtype=float)
+        return cls(
+            name=data["name"],
+            kind=data["kind"],
+            n_rows=data["n_rows"],
+            moments=Moments(**data["moments"]),
+            digest=TDigest(**digest),
+        )
+
+
+def summarize_chunks(chunks: Iterable[pd.DataFrame], compression: int = TDIGEST_COMPRESSION) -> dict[str, SummaryState]:
+    """
+    Returns column name -> summary state of the numeric columns, reading one chunk at a time.
+    Memory is bound by the chunk size and the digests. Series are taken as one column frames.
+    All states count every row: rows of chunks where a column is absent or not numeric count as missing.
+    """
+    states, n_rows = {}, 0
+    for chunk in chunks:
+        if isinstance(chunk, pd.Series):
+            chunk = chunk.to_frame()
+        numeric = chunk.select_dtypes(include=np.number).columns
+        for col in numeric:
+            state = SummaryState.from_series(chunk[col], compression)
+            states[col] = states[col].merge(state) if col in states else _pad_rows(state, n_rows)
+        for col in states.keys() - set(numeric):
+            states[col] = _pad_rows(states[col], len(chunk))
+        n_rows += len(chunk)
+    return states
+
+
+def merge_summaries(parts: Iterable[dict[str, SummaryState]]) -> dict[str, SummaryState]:
+    """
+    Merges the summary states of several shards, columns in order of first appearance.
+    Rows of shards without a column count as missing for it.
+    """
+    states, n_rows = {}, 0
+    for part in parts:
+        part_rows = max((state.n_rows for state in part.values()), default=0)
+        for col, state in part.items():
+            states[col] = states[col].merge(state) if col in states else _pad_rows(state, n_rows)
+        for col in states.keys() - set(part):
+            states[col] = _pad_rows(states[col], part_rows)
+        n_rows += part_rows
+    return states
+
+
+def _pad_rows(state: SummaryState, n_missing: int) -> SummaryState:
+    """State with `n_missing` more rows, all missing."""
+    return replace(state, n_rows=state.n_rows + n_missing) if n_missing else state
@@ -2,18 +2,21 @@
 Table functions module for pandas-plots.
 
 This module contains various table-related functions that were previously in tbl.py.
+Functions (and their backends) are imported on first use.
 """
 
-from .descr_db import descr_db
-from .describe_df import describe_df
-from .pivot_df import pivot_df
-from .show_num_df import show_num_df
-from .print_summary import print_summary
+from ..lazy import attach
 
-__all__ = [
-    "descr_db",
-    "describe_df", 
-    "pivot_df",
-    "show_num_df",
-    "print_summary"
-]
\ No newline at end of file
+# * public name -> defining module, resolved on first access
+_FUNCTIONS = {
+    "descr_db": ".descr_db",
+    "describe_db": ".describe_db",
+    "describe_df": ".describe_df",
+    "pivot_df": ".pivot_df",
+    "show_num_df": ".show_num_df",
+    "print_summary": ".print_summary",
+}
+
+__all__ = list(_FUNCTIONS)
+
+__getattr__, __dir__ = attach(__name__, functions=_FUNCTIONS)
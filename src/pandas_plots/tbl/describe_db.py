@@ -0,0 +1,273 @@
+import os
+from typing import Literal
+
+import duckdb as ddb
+import pandas as pd
+from IPython.display import display
+
+from ..helper import _NUMERIC_TYPES, _resolve_relation, _sql_name
+from ..hlp.wrap_text import wrap_text
+from .descr_db import descr_db
+from .describe_df import _short_names, _show_bar_grid
+from .print_summary import _build_summary_df, _format_summary_table
+
+_INTEGER_TYPES = _NUMERIC_TYPES - {"float", "double", "decimal"}
+# * name of the relation in per column queries, must not shadow a table of the connection
+_VIEW = "__describe_db"
+
+
+def describe_db(
+    data: ddb.DuckDBPyRelation | str,
+    caption: str = "<unknown>",
+    con: ddb.DuckDBPyConnection = None,
+    use_plot: bool = True,
+    use_columns: bool = True,
+    renderer: Literal["png", "svg", None] = None,
+    fig_cols: int = 5,
+    fig_offset: int = None,
+    fig_rowheight: int = 300,
+    fig_width: int = 300,
+    sort_mode: Literal["value", "index"] = "value",
+    top_n_uniques: int = 5,
+    top_n_chars_in_index: int = 0,
+    top_n_chars_in_columns: int = 0,
+    dupl_cols: list[str] = None,
+    mode: Literal["approx", "exact"] = "approx",
+    precision: int = 3,
+):
+    """
+    Profiles a duckdb relation like describe_df(): shape, duplicates, column stats (dtype | uniques | missings) [values],
+    numeric stats in the layout of print_summary(), a 3 row preview and a bar grid of the most frequent values per column.
+    Everything is computed by duckdb aggregates, only the aggregated results are loaded, so tables larger than memory work.
+
+    Args:
+    data (DuckDBPyRelation | str): relation, path of a parquet file (or glob) or name of a table/view in `con`
+    caption (str): caption to describe the data
+    con (DuckDBPyConnection): connection for parquet files and table names, default connection if None
+    use_plot (bool): display plot?
+    use_columns (bool): display columns values?
+    renderer (Literal["png", "svg", None]): renderer for plot.
+    fig_cols (int): number of columns in plot
+    fig_offset (int): offset for plots as iloc Argument. None = no offset, -1 = omit last plot
+    fig_rowheight (int): row height for plot (default 300)
+    fig_width (int): width for plot (default 300)
+    sort_mode (Literal["value", "index"]): sort bars by value or index
+    top_n_uniques (int): number of uniques to display
+    top_n_chars_in_index (int): number of characters to display on index axis on the plot (value range)
+    top_n_chars_in_columns (int): number of characters to display as subplot title (column name). If set, minimum is 10.
+    dupl_cols (list[str]): list of columns to check for duplicates
+    mode (Literal["approx", "exact"]): "approx" uses approx_count_distinct, approx_top_k and approx_quantile,
+        values in the header are the most frequent ones. "exact" uses count(distinct), quantile_cont and group by,
+        values in the header are the first ones by sort order. Bar counts are exact in both modes. Defaults to "approx".
+    precision (int): decimals of the numeric stats
+
+    usage:
+    describe_db("registry.parquet", caption="registry")
+    describe_db("patients", con=ddb.connect("registry.duckdb"), mode="exact")
+    """
+    if mode not in ("approx", "exact"):
+        print(f"❌ mode must be one of 'approx', 'exact', got '{mode}'")
+        return
+    rel = _resolve_relation(data, con)
+    if rel is None:
+        print(f"❌ '{data}' is neither a relation, a parquet file nor a table")
+        return
+    approx = mode == "approx"
+
+    columns = rel.columns
+    type_ids = [t.id for t in rel.types]
+
+    # * one scan: row count, non-null and distinct counts of all columns (and the top values in approx mode)
+    exprs = ["count(*)"]
+    for col in columns:
+        c = _sql_name(col)
+        exprs += [f"count({c})", f"approx_count_distinct({c})" if approx else f"count(DISTINCT {c})"]
+        if approx:
+            exprs.append(f"approx_top_k({c}, {max(top_n_uniques, 1)})")
+    stats = rel.aggregate(", ".join(exprs)).fetchone()
+    n_rows = stats[0]
+    step = 3 if approx else 2
+    col_stats = [stats[1 + i * step : 1 + (i + 1) * step] for i in range(len(columns))]
+
+    if n_rows == 0:
+        print("Relation is empty!")
+        return
+
+    print(f"🔵 {'*'*3} db: {caption} {'*'*3}  ")
+    print(f"🟣 shape: ({n_rows:_}, {len(columns)})")
+
+    # * distinct rows via 64 bit row hashes, duckdb spills to disk if the hashes do not fit into memory
+    subset = dupl_cols or columns
+    n_distinct_rows = rel.aggregate(f"count(DISTINCT hash({', '.join(_sql_name(c) for c in subset)}))").fetchone()[0]
+    duplicate_count = n_rows - n_distinct_rows
+    label = "duplicates" if dupl_cols is None else f"duplicates for {dupl_cols}"
+    print(f"🟣 {label}: {duplicate_count:_} ({duplicate_count / n_rows * 100:.0f}%)  ")
+
+    if use_columns:
+        if approx:
+            print("🟠 column stats all (dtype | ~uniques | missings) [most frequent values]  ")
+        else:
+            print("🟠 column stats all (dtype | uniques | missings) [values]  ")
+
+        for col, dtype, (n_present, n_distinct, *top) in zip(columns, rel.types, col_stats):
+            n_missing = n_rows - n_present
+            # * a missing value counts as one unique, like in describe_df
+            n_uniques = n_distinct + (n_missing > 0)
+            if approx:
+                values = list(top[0] or [])
+            else:
+                values = [
+                    row[0]
+                    for row in rel.query(
+                        _VIEW,
+                        f"SELECT DISTINCT {_sql_name(col)} FROM {_VIEW} WHERE {_sql_name(col)} IS NOT NULL "
+                        f"ORDER BY 1 LIMIT {max(top_n_uniques, 0)}",
+                    ).fetchall()
+                ]
+                if n_missing and len(values) < top_n_uniques:
+                    values.append(None)
+            print(
+                f"- {col} ({dtype} | {'~' if approx else ''}{n_uniques:_} | {n_missing:_} ({n_missing / n_rows * 100:.0f}%)) "
+                f"{wrap_text(values[:top_n_uniques], max_items_in_line=70, use_apo=dtype.id == 'varchar')}  "
+            )
+
+    print("\n🟠 column stats numeric  ")
+    numeric_cols = [col for col, type_id in zip(columns, type_ids) if type_id in _NUMERIC_TYPES]
+    if numeric_cols:
+        summaries = _summarize_numeric(rel, numeric_cols, type_ids, columns, n_rows, precision, approx)
+        names = [str(c) for c in numeric_cols]
+        if os.getenv("PDF") == "1":
+            display(_build_summary_df(names, summaries, precision, False, False, n_rows))
+        else:
+            print(_format_summary_table(names, summaries, precision, False, False, n_rows))
+    else:
+        print("❌ Relation contains no numeric columns for summary calculation.")
+
+    #  * show first 3 rows
+    print("\n🟠 sample 3 rows  ")
+    descr_db(rel, use_sumary=False)
+
+    # ! *** PLOTS ***
+    if use_plot:
+        names = _short_names(list(columns), top_n_chars_in_columns)
+        spans = [
+            _top_counts(rel, col, type_id, n_present == 0, n_rows, sort_mode, approx).rename_axis(name)
+            for col, type_id, (n_present, *_), name in list(zip(columns, type_ids, col_stats, names))[:fig_offset]
+        ]
+        _show_bar_grid(
+            spans,
+            fig_cols=fig_cols,
+            fig_rowheight=fig_rowheight,
+            fig_width=fig_width,
+            renderer=renderer,
+            top_n_chars_in_index=top_n_chars_in_index,
+            title="values by approx_top_k, counts are exact" if approx and sort_mode == "value" else None,
+        )
+
+
+def _summarize_numeric(
+    rel: ddb.DuckDBPyRelation,
+    numeric_cols: list[str],
+    type_ids: list[str],
+    columns: list[str],
+    n_rows: int,
+    precision: int,
+    approx: bool,
+) -> list[dict]:
+    """Summaries like print_summary._summarize_block(), from two aggregate scans (stats, then whisker ends)."""
+    quantile = "approx_quantile" if approx else "quantile_cont"
+    exprs = []
+    for col in numeric_cols:
+        # * decimals as double, so the values format like floats
+        c = f"{_sql_name(col)}::DOUBLE"
+        exprs += [
+            f"count({c})",
+            f"min({c})",
+            f"max({c})",
+            f"avg({c})",
+            f"stddev_samp({c})",
+            f"{quantile}({c}, [0.25, 0.5, 0.75])",
+        ]
+    row = rel.aggregate(", ".join(exprs)).fetchone()
+    stats = [row[i * 6 : (i + 1) * 6] for i in range(len(numeric_cols))]
+
+    # * whisker ends: most extreme values within 1.5 * iqr of the quartiles
+    fence_exprs = []
+    for col, (cnt, _, _, _, _, q) in zip(numeric_cols, stats):
+        c = f"{_sql_name(col)}::DOUBLE"
+        if cnt:
+            iqr = q[2] - q[0]
+            q1, q3 = round(q[0], precision), round(q[2], precision)
+            fence_exprs += [f"min({c}) FILTER (WHERE {c} >= {q1 - 1.5 * iqr!r})", f"max({c}) FILTER (WHERE {c} <= {q3 + 1.5 * iqr!r})"]
+        else:
+            fence_exprs += ["NULL", "NULL"]
+    fences = rel.aggregate(", ".join(fence_exprs)).fetchone()
+
+    is_int = {col: type_ids[columns.index(col)] in _INTEGER_TYPES for col in numeric_cols}
+    summaries = []
+    for i, (col, (cnt, min_val, max_val, mean, std, q)) in enumerate(zip(numeric_cols, stats)):
+        if not cnt:
+            summaries.append(
+                {
+                    "count": n_rows,
+                    "missings": "0 (0%)",
+                    "min": "N/A", "lower": "N/A", "q25": "N/A", "median": "N/A",
+                    "mean": "N/A", "q75": "N/A", "upper": "N/A", "max": "N/A",
+                    "std": "N/A", "cv": "N/A",
+                }
+            )
+            continue
+        # * values of the column keep its type, like min/max of an int series in print_summary
+        as_type = int if is_int[col] else (lambda v: round(v, precision))
+        lower, upper = fences[2 * i], fences[2 * i + 1]
+        std = std if std is not None else float("nan")
+        cv = std / mean if mean and std else None
+        summaries.append(
+            {
+                "count": n_rows,
+                "missings": f"{cnt:_} ({int(cnt / n_rows * 100)}%)",
+                "min": as_type(min_val),
+                "lower": as_type(max(lower, min_val)),
+                "q25": round(q[0], precision),
+                "median": round(q[1], precision),
+                "mean": round(mean, precision),
+                "q75": round(q[2], precision),
+                "upper": as_type(min(upper, max_val)),
+                "max": as_type(max_val),
+                "std": round(std, precision),
+                "cv": round(cv, precision) if cv is not None else "N/A",
+            }
+        )
+    return summaries
+
+
+def _top_counts(
+    rel: ddb.DuckDBPyRelation,
+    col: str,
+    type_id: str,
+    is_empty: bool,
+    n_rows: int,
+    sort_mode: str,
+    approx: bool,
+) -> pd.Series:
+    """Counts of the first 100 values by frequency or sort order, missing values excluded."""
+    if is_empty:
+        return pd.Series([n_rows], index=pd.Index(["(NA)"], dtype=object), name="count")
+
+    c = _sql_name(col)
+    # * plotted as text, like datetime and bool columns in describe_df
+    label = c if type_id in _NUMERIC_TYPES or type_id == "varchar" else f"CAST({c} AS VARCHAR)"
+    if sort_mode == "value" and approx:
+        # * approx_top_k picks the values, their counts are exact
+        where = f"{c} IN (SELECT unnest(approx_top_k({c}, 100)) FROM {_VIEW})"
+        order = "cnt DESC, 1"
+    elif sort_mode == "value":
+        where, order = f"{c} IS NOT NULL", "cnt DESC, 1"
+    else:
+        where, order = f"{c} IS NOT NULL", "1"
+    rows = rel.query(
+        _VIEW,
+        f"SELECT {label}, count(*) AS cnt FROM {_VIEW} WHERE {where} GROUP BY {c} ORDER BY {order} LIMIT 100",
+    ).fetchall()
+    values, counts = zip(*rows) if rows else ((), ())
+    return pd.Series(counts, index=pd.Index(values, dtype=None if rows else object), name="count", dtype="int64")
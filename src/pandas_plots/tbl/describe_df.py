@@ -3,15 +3,25 @@
 
 import math
 import os
+from dataclasses import replace
 from typing import Literal
 from IPython.display import display
 import duckdb as ddb
 
-import numpy as np
 import pandas as pd
 import plotly.express as px
+import plotly.graph_objects as go
+import plotly.io as pio
 from plotly.subplots import make_subplots
 
+from ..helper import _fillna, _project
+from ..profiler import (
+    ColumnProfile,
+    approx_duplicates,
+    profile_frame,
+    sample_rows,
+    sketch_frame,
+)
 from ..hlp.wrap_text import wrap_text
 from .print_summary import print_summary
 from .descr_db import descr_db
@@ -25,6 +35,9 @@ KPI_LITERAL = Literal[
     "rag_abs", "rag_rel", "min_max_xy", "max_min_xy", "min_max_x", "max_min_x"
 ]
 
+# * mode="auto" switches to approximations above this number of rows
+AUTO_APPROX_ROWS = 10_000_000
+
 def describe_df(
     df: pd.DataFrame,
     caption: str = "<unknown>",
@@ -42,6 +55,8 @@ def describe_df(
     top_n_chars_in_columns: int = 0,
     missing_figsize: tuple[int, int] = (26, 6),
     dupl_cols: list[str] = None,
+    mode: Literal["exact", "approx", "auto"] = "exact",
+    workers: int = 1,
 ):
     """
     This function takes a pandas DataFrame and a caption as input parameters and prints out the caption as a styled header, followed by the shape of the DataFrame and the list of column names. For each column, it prints out the column name, the number of unique values, and the column data type. If the column is a numeric column with more than 100 unique values, it also prints out the minimum, mean, maximum, and sum values. Otherwise, it prints out the first 100 unique values of the column.
@@ -63,6 +78,10 @@ def describe_df(
     top_n_chars_in_columns (int): number of characters to display as subplot title (column name). If set, minimum is 10.
     missing_figsize (tuple[int, int]): figsize for missing plot (default (26, 6)
     dupl_cols (list[str]): list of columns to check for duplicates
+    mode (Literal["exact", "approx", "auto"]): "approx" estimates uniques (HyperLogLog), top values (space-saving) and duplicates
+        with error bounds in the header lines, numeric stats and plots are based on a sample of rows.
+        "auto" uses "approx" above AUTO_APPROX_ROWS rows. Defaults to "exact".
+    workers (int): number of threads for the column stats, -1 = one per cpu. Output does not depend on it. Defaults to 1.
 
     usage:
     describe_df(
@@ -78,9 +97,9 @@ def describe_df(
 
     hint: skewness may not properly work if the columns is float and/or has only 1 value
     """
-    # * copy df, df col types are modified
-    df = df.fillna(pd.NA).copy()
-    df_ = df.copy()
+    # * keep the input for the missing plot, col types are modified on a projection (columns are replaced, not copied)
+    df_ = df
+    df = _fillna(_project(df), pd.NA)
 
     # * check if df is empty
     if len(df) == 0:
@@ -94,6 +113,21 @@ def describe_df(
     #     # * print <br> to avoid .show() bug in duckdb?
     #     display(HTML("<br>"))
 
+    if mode not in ("exact", "approx", "auto"):
+        print(f"❌ mode must be one of 'exact', 'approx', 'auto', got '{mode}'")
+        return
+    approx = mode == "approx" or (mode == "auto" and len(df) > AUTO_APPROX_ROWS)
+
+    if approx:
+        # * exact counts are too expensive, sketches for the header, a sample for stats and plots
+        sketches = sketch_frame(df, workers=workers)
+        sample = df.iloc[sample_rows(len(df))]
+        profiles = {col: prof.scaled(len(df)) for col, prof in profile_frame(sample, workers).items()}
+    else:
+        # * one counting pass per column, header, duplicates check and plots read from these
+        profiles = profile_frame(df, workers)
+        sample = df
+
     print(f"🔵 {'*'*3} df: {caption} {'*'*3}  ")
     print(f"🟣 shape: ({df.shape[0]:_}, {df.shape[1]})")
 
@@ -101,14 +135,19 @@ def describe_df(
     # Calculate percentage of duplicates
     total_rows = len(df)
 
-    if dupl_cols is None:
+    if approx:
+        duplicate_count, duplicate_error = approx_duplicates(df, dupl_cols)
+        duplicate_percentage = duplicate_count / total_rows * 100
+        label = "duplicates" if dupl_cols is None else f"duplicates for {dupl_cols}"
+        print(f"🟣 {label}: ~{duplicate_count:_.0f} ±{2 * duplicate_error:_.0f} ({duplicate_percentage:.0f}%)  ")
+    elif dupl_cols is None:
         # Use all columns if dupl_cols is not specified
-        duplicate_count = df.duplicated().sum()
+        duplicate_count = _count_duplicates(df, profiles)
         duplicate_percentage = (duplicate_count / total_rows * 100) if total_rows > 0 else 0
         print(f"🟣 duplicates: {duplicate_count:_} ({duplicate_percentage:.0f}%)  ")
     else:
         # Use only the specified columns for duplicate detection
-        duplicate_count = df.duplicated(subset=dupl_cols).sum()
+        duplicate_count = _count_duplicates(df, profiles, dupl_cols)
         duplicate_percentage = (duplicate_count / total_rows * 100) if total_rows > 0 else 0
         print(f"🟣 duplicates for {dupl_cols}: {duplicate_count:_} ({duplicate_percentage:.0f}%)  ")
     # print(f"🟣 uniques: {wrap_text(str({col: f'{df[col].nunique():_}' for col in df})) }  ")
@@ -120,26 +159,34 @@ def describe_df(
 
     n_rows = len(df) # Define the total number of rows
 
+    def get_uniques_header_approx(col: str):
+        sk = sketches[col]
+        percent_missing = (sk.n_missing / n_rows) * 100
+
+        # * most frequent values, the sort order of all uniques is unknown
+        unis = list(sk.by_frequency(top_n_uniques).index)
+
+        # * 🟠 col_name (dtype | ~uniques ±2 std errors | missings | max error of the top counts)
+        header = (
+            f"- {col} ({df[col].dtype} | ~{sk.n_distinct:_.0f} ±{2 * sk.distinct_error:.1%} | "
+            f"{sk.n_missing:_} ({percent_missing:.0f}%) | top ±{sk.top.max_error:_})"
+        )
+
+        return unis, header
+
     def get_uniques_header(col: str):
-        # * Calculate Missing Values
-        n_missing = df[col].isna().sum()
-        percent_missing = (n_missing / n_rows) * 100
-
-        # * Prep column for unique value count
-        if df[col].dtype == "object":
-            # Convert object to string to handle mixed types gracefully when counting uniques
-            col_series = df[col].astype(str)
-        else:
-            col_series = df[col]
+        if approx:
+            return get_uniques_header_approx(col)
+        prof = profiles[col]
+        percent_missing = (prof.n_missing / n_rows) * 100
 
-        # * Get unique values and count
-        unis = list(col_series.value_counts(dropna=False).sort_index().index)
-        n_uniques = len(unis)
+        # * Get unique values (object columns by their str value to handle mixed types)
+        unis = list(prof.by_order(top_n_uniques).index)
 
         # * Format the header string: 🟠 col_name (dtype | uniques | missings)
         header = (
-            f"- {col} ({df[col].dtype} | {n_uniques:_} | "
-            f"{n_missing:_} ({percent_missing:.0f}%))"
+            f"- {col} ({df[col].dtype} | {prof.n_distinct:_} | "
+            f"{prof.n_missing:_} ({percent_missing:.0f}%))"
         )
 
         return unis, header
@@ -147,7 +194,10 @@ def describe_df(
 
     # hack this block somehow interferes with the plotly renderer. so its run even when use_columns=False
     if use_columns:
-        print("🟠 column stats all (dtype | uniques | missings) [values]  ")
+        if approx:
+            print("🟠 column stats all, approximated (dtype | ~uniques | missings | top count error) [most frequent values]  ")
+        else:
+            print("🟠 column stats all (dtype | uniques | missings) [values]  ")
         print(f"- index {wrap_text(df.index.tolist()[:top_n_uniques])}  ")
 
     for col in df.columns[:]:
@@ -162,124 +212,168 @@ def describe_df(
                     f"{_h} {wrap_text(_u[:top_n_uniques], max_items_in_line=70, use_apo=is_str)}  "
                 )
 
-    print("\n🟠 column stats numeric  ")
+    if approx:
+        print(f"\n🟠 column stats numeric, sample of {len(sample):_} rows  ")
+    else:
+        print("\n🟠 column stats numeric  ")
     # * only show numerics
     # for col in df.select_dtypes("number").columns:
     #     _u, _h = get_uniques_header(col)
     #     print_summary(df=df[col], name=_h)
-    print_summary(df=df)
+    print_summary(df=sample, workers=workers)
 
     #  * show first 3 rows
     print("\n🟠 sample 3 rows  ")
     # display(df.head(3))
-    db = ddb.from_df(df)
+    # * duckdb converts object columns on registration, in approx mode only the head is handed over
+    db = ddb.from_df(df.head(1_000) if approx else df)
     descr_db(db, use_sumary=False)
 
     # ! *** PLOTS ***
     if use_plot:
-        # * fix bug(?) in plotly/choreographer - datetime columns are not plotted, set these to str
+        # * fix bug(?) in plotly/choreographer - datetime columns are not plotted, these are counted as str
         # * also make bool -> str for plot to have the <NA> values shown
-        datetime_cols = df.select_dtypes(include=['datetime64','boolean']).columns
-        df[datetime_cols] = df[datetime_cols].astype(str)
-
-        # * fix bug where empty Int64 columns are not plotted
-        # * get Int64 columns that are all null -> set to object
-        mask = df.dtypes.astype(str).str.lower().isin(['int64', 'float64'])
-        df = df.astype(
-            dict.fromkeys(
-                df.columns[mask][df.loc[:, mask].isnull().all()],
-                'object'
-            )
-        )
-
-        # * now set all empty object columns to <NA>
-        null_cols = df.columns[df.dtypes == 'object'][df.loc[:, df.dtypes == 'object'].isnull().all()]
-        df[null_cols] = "(NA)"
-
-        # * reduce column names len if selected
-        if top_n_chars_in_columns > 0:
-            # * minumum 10 chars, or display is cluttered
-            top_n_chars_in_columns = (
-                10 if top_n_chars_in_columns < 10 else top_n_chars_in_columns
-            )
-            col_list = []
-            for i, col in enumerate(df.columns):
-                col_list.append(col[:top_n_chars_in_columns] + "_" + str(i).zfill(3))
-            df.columns = col_list
+        str_cols = set(df.select_dtypes(include=['datetime64','boolean']).columns)
+        plot_profiles = [
+            _plot_profile(profiles[col], as_str=col in str_cols) for col in df.columns
+        ]
 
         # * respect fig_offset to exclude unwanted plots from maintanance columns
-        cols = df.iloc[:, :fig_offset].columns
-        cols_num = df.select_dtypes(np.number).columns.tolist()
-        # cols_str = list(set(df.columns) - set(cols_num))
-
-        # * set constant column count, calc rows
-        fig_rows = math.ceil(len(cols) / fig_cols)
-
-        fig = make_subplots(
-            rows=fig_rows,
-            cols=fig_cols,
-            shared_xaxes=False,
-            shared_yaxes=False,
-            subplot_titles=cols,
-        )
-        # * layout settings
-        # fig.layout.height = fig_rowheight * fig_rows
-        # fig.layout.width = 400 * fig_cols
-
-        # * construct subplots
-        for i, col in enumerate(cols):
+        names = _short_names(list(df.columns), top_n_chars_in_columns)
+        spans = []
+        for prof, name in list(zip(plot_profiles, names))[:fig_offset]:
             # * get unique values as sorted list
             if sort_mode == "value":
-                span = df[col].value_counts().sort_values(ascending=False)
+                span = prof.by_frequency().sort_values(ascending=False)
             else:
-                span = df[col].value_counts().sort_index()
-
-            # * check if num col w/ too many values (disabled)
-            if col in cols_num and len(span) > 100 and False:
-                figsub = px.box(df, x=col, points="outliers")
-            else:
-                # * only respect 100 items (fixed value)
-                x = span.iloc[:100].index
-                y = span.iloc[:100].values
-                # * cut long strings
-                if (
-                    x.dtype == "object"
-                    and top_n_chars_in_index > 0
-                    # * check if all values in span are datetime. if so - do not cut! (its just datetime..)
-                    and not pd.to_datetime(x, errors='coerce').dropna().shape[0] == pd.Series(x).dropna().shape[0]
-                    ) :
-                    x = x.astype(str).tolist()
-                    _cut = lambda s: (
-                        s[:top_n_chars_in_index] + ".."
-                        if len(s) > top_n_chars_in_index
-                        else s[:top_n_chars_in_index]
-                    )
-                    x = [_cut(item) for item in x]
-
-                figsub = px.bar(
-                    x=x,
-                    y=y,
-                )
-            # * grid position
-            _row = math.floor((i) / fig_cols) + 1
-            _col = i % fig_cols + 1
-
-            # * add trace to fig, only data not layout, only 1 series
-            fig.add_trace(figsub["data"][0], row=_row, col=_col)
-
-        # * set template and layout size
-        fig.update_layout(
-            template="plotly_dark" if os.getenv("THEME") == "dark" else "plotly",
-            width=fig_width * fig_cols,  # <-- Set width here
-            height=fig_rowheight * fig_rows,  # <-- Set height here
-        )
-
-        fig.show(
-            renderer=renderer or os.getenv("RENDERER"),
-            width=fig_width * fig_cols,  # <-- Set width here
-            height=fig_rowheight * fig_rows,  # <-- Set height here
+                span = prof.by_frequency().sort_index()
+            spans.append(span.rename_axis(name))
+
+        _show_bar_grid(
+            spans,
+            fig_cols=fig_cols,
+            fig_rowheight=fig_rowheight,
+            fig_width=fig_width,
+            renderer=renderer,
+            top_n_chars_in_index=top_n_chars_in_index,
+            title=f"sample of {len(sample):_} rows, counts extrapolated to {len(df):_}" if approx else None,
         )
 
     if use_missing:
         import missingno as msno
-        msno.matrix(df_, figsize=missing_figsize)
\ No newline at end of file
+        msno.matrix(df_, figsize=missing_figsize)
+
+
+def _count_duplicates(df: pd.DataFrame, profiles: dict[str, ColumnProfile], subset: list[str] = None) -> int:
+    """Counts duplicated rows like `df.duplicated(subset).sum()`, skipped if a column has no repeated value."""
+    if any(profiles[col].is_unique for col in (subset or df.columns)):
+        return 0
+    return df.duplicated(subset=subset).sum()
+
+
+def _plot_profile(prof: ColumnProfile, as_str: bool) -> ColumnProfile:
+    """
+    Profile of a column as plotted: `as_str` columns are counted by their text (missing values become bars),
+    empty numeric and object columns get a single "(NA)" bar.
+    """
+    counts = prof.counts
+    if as_str:
+        counts = counts.set_axis(counts.index.astype(str))
+    elif prof.n_missing == prof.n_rows and str(prof.dtype).lower() in ("int64", "float64", "object"):
+        counts = pd.Series([prof.n_rows], index=pd.Index(["(NA)"], dtype=object), name="count")
+    return replace(prof, counts=counts)
+
+
+def _px_bar_style() -> dict:
+    """Trace attributes px.bar() sets for a single unnamed series (first color of the default template)."""
+    template = pio.templates[px.defaults.template or pio.templates.default]
+    colorway = template.layout.colorway or px.colors.qualitative.D3
+    return dict(
+        hovertemplate="x=%{x}<br>y=%{y}<extra></extra>",
+        legendgroup="",
+        marker=dict(color=colorway[0], pattern=dict(shape="")),
+        name="",
+        orientation="v",
+        showlegend=False,
+        textposition="auto",
+        xaxis="x",
+        yaxis="y",
+    )
+
+
+def _short_names(names: list[str], top_n_chars: int) -> list[str]:
+    """Cuts names to `top_n_chars` (minimum 10) and appends the position, 0 = keep names."""
+    if top_n_chars <= 0:
+        return names
+    # * minumum 10 chars, or display is cluttered
+    top_n_chars = max(top_n_chars, 10)
+    return [str(name)[:top_n_chars] + "_" + str(i).zfill(3) for i, name in enumerate(names)]
+
+
+def _show_bar_grid(
+    spans: list[pd.Series],
+    fig_cols: int,
+    fig_rowheight: int,
+    fig_width: int,
+    renderer: str = None,
+    top_n_chars_in_index: int = 0,
+    title: str = None,
+) -> None:
+    """
+    Shows one bar chart per span (value -> count, sorted) in a grid, titled by the index name of the span.
+    Only the first 100 values of each span are drawn.
+    """
+    # * set constant column count, calc rows
+    fig_rows = math.ceil(len(spans) / fig_cols)
+
+    fig = make_subplots(
+        rows=fig_rows,
+        cols=fig_cols,
+        shared_xaxes=False,
+        shared_yaxes=False,
+        subplot_titles=pd.Index([span.index.name for span in spans]),
+    )
+
+    bar_style = _px_bar_style()
+
+    # * construct subplots
+    for i, span in enumerate(spans):
+        # * only respect 100 items (fixed value)
+        x = span.iloc[:100].index
+        y = span.iloc[:100].values
+        # * cut long strings
+        if (
+            x.dtype == "object"
+            and top_n_chars_in_index > 0
+            # * check if all values in span are datetime. if so - do not cut! (its just datetime..)
+            and not pd.to_datetime(x, errors='coerce').dropna().shape[0] == pd.Series(x).dropna().shape[0]
+            ) :
+            x = x.astype(str).tolist()
+            _cut = lambda s: (
+                s[:top_n_chars_in_index] + ".."
+                if len(s) > top_n_chars_in_index
+                else s[:top_n_chars_in_index]
+            )
+            x = [_cut(item) for item in x]
+
+        # * grid position
+        _row = math.floor((i) / fig_cols) + 1
+        _col = i % fig_cols + 1
+
+        # * same trace as px.bar(x=x, y=y)["data"][0], without building a figure per column
+        fig.add_trace(go.Bar(x=x, y=y, **bar_style), row=_row, col=_col)
+
+    # * set template and layout size
+    fig.update_layout(
+        template="plotly_dark" if os.getenv("THEME") == "dark" else "plotly",
+        width=fig_width * fig_cols,  # <-- Set width here
+        height=fig_rowheight * fig_rows,  # <-- Set height here
+    )
+    if title:
+        fig.update_layout(title=title)
+
+    fig.show(
+        renderer=renderer or os.getenv("RENDERER"),
+        width=fig_width * fig_cols,  # <-- Set width here
+        height=fig_rowheight * fig_rows,  # <-- Set height here
+    )
@@ -1,21 +1,29 @@
 # import warnings
 # warnings.filterwarnings("ignore")
 
+from __future__ import annotations
+
 from pathlib import Path
-from typing import Literal, Optional
+from typing import TYPE_CHECKING, Literal, Optional
 
 import pandas as pd
 
-from ..helper import _group_kkr
+from ..cache import cached
+from ..helper import _DB_INTEGER_TYPES, _aggregate_data_db, _group_kkr, _project, _to_relation
+
+if TYPE_CHECKING:
+    import duckdb as ddb
 
 NA_EVENT = "(NA)"
 
 TOTAL_LITERAL = Literal["sum", "mean", "median", "min", "max", "std", "var", "skew", "kurt"]
 KPI_LITERAL = Literal["rag_abs", "rag_rel", "min_max_xy", "max_min_xy", "min_max_x", "max_min_x"]
 
+_DB_NUMERIC_TYPES = _DB_INTEGER_TYPES | {"FLOAT", "DOUBLE", "DECIMAL"}
+
 
 def pivot_df(
-    df: pd.DataFrame,
+    df: pd.DataFrame | ddb.DuckDBPyRelation | str,
     dropna: bool = False,
     swap: bool = False,
     top_n_index: int = 0,
@@ -40,6 +48,8 @@ def pivot_df(
     png_conversion: Literal["chrome", "selenium"] = "selenium",
     kkr_col: Optional[str] = None,
     image_scale: str = None,
+    engine: Literal["pandas", "duckdb"] = "pandas",
+    con: ddb.DuckDBPyConnection = None,
 ) -> pd.DataFrame:
     """
     A function to pivot a DataFrame based on specified parameters hand over to the *show_num_df* function.
@@ -53,7 +63,8 @@ def pivot_df(
     `font_size_th` and `font_size_td` are overwritten by ENV variables in `setup_rendering`
 
     Args:
-        df (pd.DataFrame): The input DataFrame to be pivoted.
+        df (pd.DataFrame | ddb.DuckDBPyRelation | str): The input DataFrame to be pivoted.
+            A duckdb relation or a sql query (run on `con`) implies `engine="duckdb"`.
         dropna (bool, optional): Whether to drop NaN values. Defaults to False.
         swap (bool, optional): Whether to swap index and column. Defaults to False.
         top_n_index (int, optional): The number of top index values to consider. Defaults to 0.
@@ -84,6 +95,9 @@ def pivot_df(
         png_conversion (Literal["chrome", "selenium"], optional): The conversion method for the PNG file. Defaults to "selenium".
         kkr_col (str): Edge case: Name of the column that contains kkr name to ensure all kkr are shown
         image_scale: a string indicating the scale of the image width for markdown. eg "800" or "60%"
+        engine (Literal["pandas", "duckdb"], optional): "duckdb" runs null labelling, grouping and top n
+            as one query in duckdb and fetches only the aggregated result. Defaults to "pandas".
+        con (ddb.DuckDBPyConnection, optional): Connection for a sql query or DataFrame with `engine="duckdb"`.
 
     Returns:
         pd.DataFrame: The pivoted DataFrame.
@@ -93,58 +107,17 @@ def pivot_df(
         print("❌ axis not supported")
         return
 
-    # * if only 2 are provided, add cnt col
-    if len(df.columns) == 2:
-        df = df.assign(cnt=1)
-
-    if len(df.columns) != 3:
-        print("❌ df must have exactly 3 columns")
-        return
-
-    if not pd.api.types.is_numeric_dtype(df.iloc[:, 2]):
-        print("❌ 3rd column must be numeric")
-        return
-
-    df = df.copy()
-
-    if kkr_col:
-        df = _group_kkr(df=df, kkr_col=kkr_col)
-
-    col_index = df.columns[0]
-    col_column = df.columns[1]
-    col_value: str = df.columns[2]
-
-    if not dropna:
-        df[col_index] = df[col_index].fillna(NA_EVENT)
-        df[col_column] = df[col_column].fillna(NA_EVENT)
-    else:
-        df.dropna(inplace=True, subset=[col_index])
-        df.dropna(inplace=True, subset=[col_column])
-
-    # * top n indexes
-    if top_n_index > 0:
-        # * get top n -> series
-        # * on pivot tables (all cells are values) you can also use sum for each column[df.sum(axis=1) > n]
-        ser_top_n = df.groupby(col_index)[col_value].sum().sort_values(ascending=False)[:top_n_index]
-        # * only process top n indexes. this does not change pct values
-        df = df[df[col_index].isin(ser_top_n.index)]
-
-    # * top n columns
-    if top_n_columns > 0:
-        # * get top n -> series
-        # * on pivot tables (all cells are values) you can also use sum for each column[df.sum(axis=1) > n]
-        ser_top_n_col = df.groupby(col_column)[col_value].sum().sort_values(ascending=False)[:top_n_columns]
-        # * only process top n columns. this does not change pct values
-        df = df[df[col_column].isin(ser_top_n_col.index)]
-
-    # * create pivot
-    df = (
-        df.groupby([col_index, col_column], dropna=False)[col_value]
-        .sum()
-        .reset_index()
-        .pivot(index=col_index, columns=col_column, values=col_value)
+    df = _compute_pivot(
+        df=df,
+        dropna=dropna,
+        top_n_index=top_n_index,
+        top_n_columns=top_n_columns,
+        kkr_col=kkr_col,
+        engine=engine,
+        con=con,
     )
-    df = df.fillna(0)  # .astype(_type)
+    if df is None:
+        return
 
     from .show_num_df import show_num_df
 
@@ -171,3 +144,113 @@ def pivot_df(
         total_exclude=total_exclude,
         image_scale=image_scale,
     )
+
+
+@cached(ignore=("con",))
+def _compute_pivot(
+    df: pd.DataFrame | ddb.DuckDBPyRelation | str,
+    dropna: bool,
+    top_n_index: int,
+    top_n_columns: int,
+    kkr_col: Optional[str],
+    engine: Literal["pandas", "duckdb"],
+    con: ddb.DuckDBPyConnection,
+) -> pd.DataFrame:
+    """Compute stage of pivot_df: null labelling, top n and the pivot itself, without totals and styling."""
+    if not isinstance(df, pd.DataFrame):
+        engine = "duckdb"
+
+    if engine == "duckdb":
+        df = _pivot_db(_to_relation(df, con), dropna, top_n_index, top_n_columns, kkr_col)
+        if df is None:
+            return
+    else:
+        if len(df.columns) not in (2, 3):
+            print("❌ df must have exactly 3 columns")
+            return
+
+        # * columns are only replaced, never written into
+        df = _project(df)
+
+        # * if only 2 are provided, add cnt col
+        if len(df.columns) == 2:
+            df["cnt"] = 1
+
+        if not pd.api.types.is_numeric_dtype(df.iloc[:, 2]):
+            print("❌ 3rd column must be numeric")
+            return
+
+        if kkr_col:
+            df = _group_kkr(df=df, kkr_col=kkr_col)
+
+        col_index = df.columns[0]
+        col_column = df.columns[1]
+        col_value: str = df.columns[2]
+
+        if not dropna:
+            df[col_index] = df[col_index].fillna(NA_EVENT)
+            df[col_column] = df[col_column].fillna(NA_EVENT)
+        else:
+            df = df.dropna(subset=[col_index, col_column])
+
+        # * top n indexes
+        if top_n_index > 0:
+            # * get top n -> series
+            # * on pivot tables (all cells are values) you can also use sum for each column[df.sum(axis=1) > n]
+            ser_top_n = df.groupby(col_index)[col_value].sum().sort_values(ascending=False)[:top_n_index]
+            # * only process top n indexes. this does not change pct values
+            df = df[df[col_index].isin(ser_top_n.index)]
+
+        # * top n columns
+        if top_n_columns > 0:
+            # * get top n -> series
+            # * on pivot tables (all cells are values) you can also use sum for each column[df.sum(axis=1) > n]
+            ser_top_n_col = df.groupby(col_column)[col_value].sum().sort_values(ascending=False)[:top_n_columns]
+            # * only process top n columns. this does not change pct values
+            df = df[df[col_column].isin(ser_top_n_col.index)]
+
+        # * create pivot
+        df = (
+            df.groupby([col_index, col_column], dropna=False)[col_value]
+            .sum()
+            .reset_index()
+            .pivot(index=col_index, columns=col_column, values=col_value)
+        )
+
+    return df.fillna(0)
+
+
+def _pivot_db(
+    rel: ddb.DuckDBPyRelation,
+    dropna: bool,
+    top_n_index: int,
+    top_n_columns: int,
+    kkr_col: Optional[str],
+) -> pd.DataFrame:
+    """duckdb engine of pivot_df: aggregates in duckdb, only the result is pivoted in pandas."""
+    if kkr_col:
+        print("❌ kkr_col is not supported with engine='duckdb'")
+        return
+
+    if len(rel.columns) not in (2, 3):
+        print("❌ df must have exactly 3 columns")
+        return
+
+    if len(rel.columns) == 3 and str(rel.types[2]).split("(")[0] not in _DB_NUMERIC_TYPES:
+        print("❌ 3rd column must be numeric")
+        return
+
+    col_index, col_column = rel.columns[:2]
+    df, _ = _aggregate_data_db(
+        rel,
+        index=col_index,
+        col=col_column,
+        value=rel.columns[2] if len(rel.columns) == 3 else None,
+        top_n_index=top_n_index,
+        top_n_color=top_n_columns,
+        null_label=NA_EVENT,
+        sort_values_index=True,
+        sort_values_color=True,
+        dropna=dropna,
+    )
+    return df.pivot(index="index", columns="col", values="value").rename_axis(index=col_index, columns=col_column)
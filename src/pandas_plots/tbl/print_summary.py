@@ -1,123 +1,439 @@
+from __future__ import annotations
+
 import numbers
 import os
+from collections.abc import Iterable
 import numpy as np
 import pandas as pd
 from IPython.display import display
 from scipy import stats
-from typing import Literal
-
-from ..hlp.get_sparse_df import get_sparse_df
-
-
-def _calculate_summary_ser(
-    ser: pd.Series,
+from typing import TYPE_CHECKING, Literal
+
+from ..helper import _is_relation, _map_ordered
+from ..profiler import SummaryState, summarize_chunks
+
+if TYPE_CHECKING:
+    import duckdb as ddb
+
+# * duckdb vectors (2048 rows) per chunk when a relation is streamed
+RELATION_CHUNK_VECTORS = 512
+
+
+# * columns per block of the stats kernel, bounds the memory of the sorted copy
+BLOCK_COLS = 64
+
+
+def _take(ordered: np.ndarray, pos: np.ndarray) -> np.ndarray:
+    """Values at positions of the sorted buffer, clipped (positions of empty segments are replaced later)."""
+    return ordered[np.minimum(pos, len(ordered) - 1)]
+
+
+def _quantile_fraction(ordered: np.ndarray, starts: np.ndarray, counts: np.ndarray, per: float) -> np.ndarray:
+    """Percentile of each sorted segment, interpolated like scipy.stats.scoreatpercentile."""
+    idx = per / 100.0 * (counts - 1)
+    i = idx.astype(np.intp)
+    lo = _take(ordered, starts + i)
+    hi = _take(ordered, starts + np.minimum(i + 1, counts - 1))
+    w_lo, w_hi = (i + 1) - idx, idx - i
+    exact, interpolated = lo / 1.0, (lo * w_lo + hi * w_hi) / (w_lo + w_hi)
+    if exact.dtype == interpolated.dtype:
+        return np.where(i == idx, exact, interpolated)
+    # * scipy keeps float32 for exact order statistics, so does the (rounded) quartile
+    return np.array([e if is_exact else f for e, f, is_exact in zip(exact, interpolated, i == idx)], dtype=object)
+
+
+def _round(values: np.ndarray, precision: int) -> np.ndarray:
+    """np.round, elementwise for object arrays (mixed float32/float64 scalars)."""
+    if values.dtype == object:
+        return np.array([round(v, precision) for v in values], dtype=object)
+    return np.round(values, precision)
+
+
+def _quantile_linear(ordered: np.ndarray, starts: np.ndarray, counts: np.ndarray, q: float) -> np.ndarray:
+    """Quantile of each sorted segment, interpolated like np.percentile (method 'linear')."""
+    virtual = (counts - 1) * q
+    prev = np.floor(virtual).astype(np.intp)
+    gamma = virtual - prev
+    a = _take(ordered, starts + prev)
+    b = _take(ordered, starts + np.minimum(prev + 1, counts - 1))
+    diff = b - a
+    return np.where(gamma >= 0.5, b - diff * (1 - gamma), a + diff * gamma)
+
+
+def _median(ordered: np.ndarray, starts: np.ndarray, counts: np.ndarray) -> np.ndarray:
+    """Median of each sorted segment, like pd.Series.median (ints as float)."""
+    mid = counts // 2
+    hi = _take(ordered, starts + mid)
+    lo = _take(ordered, starts + np.maximum(mid - 1, 0))
+    if ordered.dtype.kind != "f":
+        lo, hi = lo.astype(np.float64), hi.astype(np.float64)
+    return np.where(counts % 2 == 1, hi, (lo + hi) / 2)
+
+
+def _summarize_sorted(
+    ordered: np.ndarray,
+    starts: np.ndarray,
+    lengths: np.ndarray,
+    counts: np.ndarray,
+    mean: np.ndarray,
+    std: np.ndarray,
+    sums: np.ndarray | None,
+    n_total: int,
     precision: int = 2,
     extended: bool = False,
     sparse: bool = False,
-):
-    """Calculates the statistics for a single Series (helper function)."""
-
-    def _format_int_with_underscores(n):
-        return f"{n:_}"
-    
-    # 1. Counts
-    original_total_count = len(ser)
-    ser_cleaned = ser.dropna()
-    cnt = len(ser_cleaned) # Non-missing count
-
-    # 2. Present Share calculation (always calculate if not sparse)
-    present_share_value = None
-    
-    if not sparse:
-        present_count = cnt # cnt is the non-missing count
-        
-        if original_total_count > 0:
-            # Non-Null Share (User requested content for the 'present' column)
-            present_percent = int(present_count / original_total_count * 100) 
-            formatted_present_count = _format_int_with_underscores(present_count)
-            present_share_value = f"{formatted_present_count} ({present_percent}%)"
-            
-        else:
-            present_share_value = "0 (N/A)"
-    
-    # 3. All-NaN check: Handle case where no values exist for stats but counts are present
-    if ser_cleaned.empty:
-        if original_total_count > 0 and not sparse:
-            # If all NaNs (not sparse), the present share is 0 (0%)
-            summary = {
-                "count": original_total_count, # Total N
-                # The 'missings' key holds the 'present count/share' value
-                "missings": "0 (0%)", 
-                "min": "N/A", "lower": "N/A", "q25": "N/A", "median": "N/A", 
-                "mean": "N/A", "q75": "N/A", "upper": "N/A", "max": "N/A", 
-                "std": "N/A", "cv": "N/A",
+) -> list[dict | None]:
+    """
+    Builds the summaries of the segments of a sorted 1-D buffer (helper function). Segment j starts at `starts[j]`,
+    is `lengths[j]` long and has `counts[j]` values, followed by missing values (NaN). Quartiles, median, whisker
+    ends, min and max are read by index. Quantiles interpolate like scipy/numpy/pandas per column, so the printed
+    stats are the same as from these functions.
+    """
+    # * empty segments are calculated on a neighbour and replaced by N/A below
+    safe = np.maximum(counts, 1)
+    q1 = _round(_quantile_fraction(ordered, starts, safe, 25), precision)
+    q3 = _round(_quantile_fraction(ordered, starts, safe, 75), precision)
+    iqr = _quantile_linear(ordered, starts, safe, 0.75) - _quantile_linear(ordered, starts, safe, 0.25)
+    med = _median(ordered, starts, safe)
+    min_vals, max_vals = _take(ordered, starts), _take(ordered, starts + safe - 1)
+
+    # * whisker ends: most extreme values within 1.5 * iqr of the quartiles, searched in the present values
+    # * of each sorted segment, a loop over columns, not rows
+    upper_fence, lower_fence = (q3 + 1.5 * iqr).astype(np.float64), (q1 - 1.5 * iqr).astype(np.float64)
+    n_le, n_lt = np.zeros(len(starts), dtype=np.intp), np.zeros(len(starts), dtype=np.intp)
+    for j in np.flatnonzero(counts):
+        seg = ordered[starts[j] : starts[j] + counts[j]]
+        n_le[j] = np.searchsorted(seg, upper_fence[j], side="right")
+        n_lt[j] = np.searchsorted(seg, lower_fence[j], side="left")
+    upper = _take(ordered, starts + np.maximum(n_le - 1, 0))
+    lower = _take(ordered, starts + np.minimum(n_lt, safe - 1))
+    with np.errstate(invalid="ignore", divide="ignore"):
+        cv = np.where((mean != 0) & (std != 0), std / mean, np.nan)
+
+    summaries = []
+    for j in range(len(starts)):
+        cnt = int(counts[j])
+        if cnt == 0:
+            if n_total > 0 and not sparse:
+                summary = {
+                    "count": n_total,
+                    "missings": "0 (0%)",
+                    "min": "N/A", "lower": "N/A", "q25": "N/A", "median": "N/A",
+                    "mean": "N/A", "q75": "N/A", "upper": "N/A", "max": "N/A",
+                    "std": "N/A", "cv": "N/A",
+                }
+                if extended:
+                    summary.update({"sum": "N/A", "skew": "N/A", "kurto": "N/A"})
+                summaries.append(summary)
+            else:
+                summaries.append(None)
+            continue
+
+        min_val, max_val = round(min_vals[j], precision), round(max_vals[j], precision)
+        # * fences don't cut off min/max if they are not outliers
+        # * no value within the fence (rounded quartiles of a constant column) gives NaN, like max() of nothing
+        low = round(lower[j], precision) if n_lt[j] < cnt else np.nan
+        up = round(upper[j], precision) if n_le[j] > 0 else np.nan
+        summary = {"count": n_total if not sparse else cnt}
+        if not sparse:
+            summary["missings"] = f"{cnt:_} ({int(cnt / n_total * 100)}%)" if n_total > 0 else "0 (N/A)"
+        summary.update(
+            {
+                "min": min_val,
+                "lower": min_val if low < min_val else low,
+                "q25": q1[j],
+                "median": round(med[j], precision),
+                "mean": round(mean[j], precision),
+                "q75": q3[j],
+                "upper": max_val if up > max_val else up,
+                "max": max_val,
+                "std": round(std[j], precision),
+                "cv": round(cv[j], precision) if not np.isnan(cv[j]) else "N/A",
             }
-            if extended:
-                 summary.update({"sum": "N/A", "skew": "N/A", "kurto": "N/A"})
-            return summary
-        
-        # If original_total_count is 0 or sparse mode (where count is 0), return None.
-        return None 
-
-
-    # --- Stats Calculation (using cleaned series) ---
-    iqr_value = stats.iqr(ser_cleaned)
-    q1 = round(stats.scoreatpercentile(ser_cleaned, 25), precision)
-    q3 = round(stats.scoreatpercentile(ser_cleaned, 75), precision)
-    min_val = round(ser_cleaned.min(), precision)
-    med = round(ser_cleaned.median(), precision)
-    
-    # Calculate fences and apply to series to find actual min/max within fences
-    upper = round(ser_cleaned[ser_cleaned <= q3 + 1.5 * iqr_value].max(), precision)
-    lower = round(ser_cleaned[ser_cleaned >= q1 - 1.5 * iqr_value].min(), precision)
-    
-    mean = round(ser_cleaned.mean(), precision)
-    std = round(ser_cleaned.std(), precision)
-
-    cv = ser_cleaned.std() / ser_cleaned.mean() if ser_cleaned.mean() != 0 and ser_cleaned.std() != 0 else np.nan
-    cv = round(cv, precision) if not np.isnan(cv) else "N/A"
-
-    max_val = round(ser_cleaned.max(), precision)
-    
-    # Ensure lower and upper fences don't cut off min/max if they are not outliers
-    lower = min_val if lower < min_val else lower
-    upper = max_val if upper > max_val else upper
+        )
+        if extended:
+            # * moments from the sorted segment, missing values are at its end
+            present = ordered[starts[j] : starts[j] + cnt].astype(np.float64)
+            summary["sum"] = round(sums[j], precision)
+            summary["skew"] = round(stats.skew(present), precision)
+            summary["kurto"] = round(stats.kurtosis(present), precision)
+        summaries.append(summary)
+    return summaries
+
+
+def _summarize_block(
+    values: np.ndarray,
+    n_total: int,
+    precision: int = 2,
+    extended: bool = False,
+    sparse: bool = False,
+) -> list[dict | None]:
+    """
+    Calculates the statistics for all columns of a 2-D block (rows x columns) of one numeric dtype (helper function).
+    The block is sorted once along the rows, its columns are the segments of the sorted buffer.
+    Mean, std and sum are column sums like in pandas.
+    """
+    n_rows, n_cols = values.shape
+    if n_rows == 0:
+        values = np.full((1, n_cols), np.nan)
+        n_rows = 1
+    values = np.asfortranarray(values)
+    missing = np.isnan(values) if values.dtype.kind == "f" else None
+    counts = n_rows - missing.sum(axis=0) if missing is not None else np.full(n_cols, n_rows)
+
+    # * mean and std like pandas: floats are summed in their dtype, ints as float64
+    is_float = values.dtype.kind == "f"
+    filled = np.where(missing, 0, values) if missing is not None and missing.any() else values
+    n = counts.astype(values.dtype if is_float else np.float64)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = filled.sum(axis=0, dtype=values.dtype if is_float else np.float64) / n
+        sqr = (filled.sum(axis=0, dtype=np.float64) / n - values) ** 2
+        if missing is not None:
+            sqr[missing] = 0
+        var = sqr.sum(axis=0, dtype=np.float64) / (n - 1)
+        var[counts < 2] = np.nan
+        std = np.sqrt(var.astype(values.dtype) if is_float else var)
+    sums = filled.sum(axis=0, dtype=values.dtype if is_float else None) if extended else None
+
+    # * NaN sorts to the end of each column, the F-ordered block is a flat buffer of its columns
+    ordered = np.sort(values, axis=0).ravel(order="F")
+    starts = np.arange(n_cols) * n_rows
+    return _summarize_sorted(
+        ordered, starts, np.full(n_cols, n_rows), counts, mean, std, sums, n_total, precision, extended, sparse
+    )
+
+
+def _summarize_groups(df: pd.DataFrame, precision: int = 2, extended: bool = False) -> tuple[list[str], list[dict | None]] | None:
+    """
+    Summaries per category, the same as print_summary() of get_sparse_df(df) but without the pivot (helper function).
+    Values are sorted by category and value, each category is a segment of one buffer, so memory is linear in the rows
+    instead of (largest category x number of categories). Columns are inferred like in get_sparse_df().
+    """
+    non_numeric_cols = df.select_dtypes(exclude=["number", "datetime"]).columns
+    if non_numeric_cols.empty:
+        print("Error: No non-numeric column found for pivoting.")
+        return None
+    numeric_cols = df.select_dtypes(include=["number"]).columns
+    if numeric_cols.empty:
+        print("Error: No numeric column found for values.")
+        return None
+    keys, ser = df[non_numeric_cols[0]], df[numeric_cols[0]]
+
+    # * the pivot sorts the categories, but keeps the order of appearance if a categorical has unused categories
+    unused = isinstance(keys.dtype, pd.CategoricalDtype) and keys.nunique() < len(keys.cat.categories)
+    codes, categories = pd.factorize(keys, sort=not unused)
+    names = [str(c) for c in categories]
+    has_missing_key = (codes < 0).any()
+    if has_missing_key:
+        # * missing keys are the first column of the pivot
+        codes = codes + 1
+        names = ["nan"] + names
+    n_groups = len(names)
+
+    valid = ser.notna().to_numpy()
+    if not valid.any():
+        return names, [None] * n_groups
+    values, codes = ser[valid].to_numpy(), codes[valid]
+    sizes = np.bincount(codes, minlength=n_groups)
+    # * the pivot fills unequal categories with NaN, so int values become float (numpy ints have no NaN,
+    # * all rows are valid; nullable ints stay int)
+    if values.dtype.kind in "iu" and isinstance(ser.dtype, np.dtype) and (has_missing_key or len(set(sizes)) > 1):
+        values = values.astype(np.float64)
+
+    ordered, starts, sizes = _sort_groups(codes, values, n_groups)
+    grouped = pd.Series(values).groupby(codes)
+    groups = np.arange(n_groups)
+    mean = grouped.mean().reindex(groups).to_numpy()
+    std = grouped.std().reindex(groups).to_numpy()
+    sums = grouped.sum().reindex(groups, fill_value=0).to_numpy() if extended else None
+    summaries = _summarize_sorted(ordered, starts, sizes, sizes, mean, std, sums, len(df), precision, extended, sparse=True)
+    return names, summaries
+
+
+def _sort_groups(codes: np.ndarray, values: np.ndarray, n_groups: int) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Sorts values without missing by group code and value with one lexsort (helper function).
+    Returns the sorted buffer, segment starts and sizes: group j is `ordered[starts[j] : starts[j] + sizes[j]]`.
+    """
+    sizes = np.bincount(codes, minlength=n_groups)
+    ordered = values[np.lexsort((values, codes))]
+    starts = np.concatenate([[0], np.cumsum(sizes)[:-1]]).astype(np.intp)
+    return ordered, starts, sizes
+
+
+def _box_stats(
+    keys: pd.Series | None,
+    values: pd.Series,
+    categories: list = None,
+    points: str = None,
+    max_points: int = None,
+    keep_sorted: bool = False,
+) -> dict[str, np.ndarray]:
+    """
+    Box statistics per category, in the order of `categories`: count, min, q25, median, mean, q75, max
+    and the whisker ends lowerfence / upperfence (outermost values within 1.5 IQR, like plotly draws them).
+    The values are sorted once by category, quantiles interpolate like pd.Series.quantile() (linear).
+    min and max keep the dtype of the values, categories without values get NaN.
+    `keys=None` gives a single box of all values, without a key per row.
+
+    With `points` ("all", "outliers", "suspectedoutliers"), "points" holds the values to draw per category,
+    at most `max_points` evenly spaced over the sorted values so the extremes are kept.
+    With `keep_sorted`, "sorted" holds the sorted values per category (views of one buffer, e.g. for densities).
+    """
+    n_groups = 1 if keys is None else len(categories)
+    valid = values.notna().to_numpy()
+    if keys is not None:
+        codes = pd.Index(categories).get_indexer(keys)
+        valid &= codes >= 0
+    if not valid.any():
+        nan = np.full(n_groups, np.nan)
+        box = {k: nan for k in ("min", "q25", "median", "mean", "q75", "max", "lowerfence", "upperfence")}
+        box["count"] = np.zeros(n_groups, dtype=int)
+        if points:
+            box["points"] = [np.array([]) for _ in range(n_groups)]
+        if keep_sorted:
+            box["sorted"] = [np.array([]) for _ in range(n_groups)]
+        return box
+    vals = values.to_numpy()[valid]
+    if keys is None:
+        ordered, starts, sizes = np.sort(vals), np.zeros(1, dtype=np.intp), np.array([len(vals)])
+        mean = np.array([pd.Series(vals).mean()])
+    else:
+        codes = codes[valid]
+        ordered, starts, sizes = _sort_groups(codes, vals, n_groups)
+        mean = pd.Series(vals).groupby(codes).mean().reindex(np.arange(n_groups)).to_numpy()
+    safe = np.maximum(sizes, 1)
+    box = {
+        "count": sizes,
+        "min": _take(ordered, starts),
+        "q25": _quantile_linear(ordered, starts, safe, 0.25),
+        "median": _median(ordered, starts, safe),
+        "mean": mean,
+        "q75": _quantile_linear(ordered, starts, safe, 0.75),
+        "max": _take(ordered, starts + safe - 1),
+    }
 
+    # * whisker ends and points need the segments one by one, a loop over categories, not rows
+    lowerfence, upperfence = np.full(n_groups, np.nan), np.full(n_groups, np.nan)
+    samples = []
+    for j in range(n_groups):
+        seg = ordered[starts[j] : starts[j] + sizes[j]]
+        if not len(seg):
+            samples.append(seg)
+            continue
+        q1, q3 = box["q25"][j], box["q75"][j]
+        lo = np.searchsorted(seg, 2.5 * q1 - 1.5 * q3, side="left")
+        hi = np.searchsorted(seg, 2.5 * q3 - 1.5 * q1, side="right")
+        lowerfence[j] = np.minimum(q1, seg[min(lo, len(seg) - 1)])
+        upperfence[j] = np.maximum(q3, seg[max(hi - 1, 0)])
+        if points:
+            pts = seg if points == "all" else np.concatenate([seg[:lo], seg[hi:]])
+            if max_points is not None and len(pts) > max_points:
+                pts = pts[np.linspace(0, len(pts) - 1, max_points).round().astype(np.intp)]
+            samples.append(pts)
+    box["lowerfence"], box["upperfence"] = lowerfence, upperfence
+    if points:
+        box["points"] = samples
+    if keep_sorted:
+        box["sorted"] = [ordered[starts[j] : starts[j] + sizes[j]] for j in range(n_groups)]
+
+    if (sizes == 0).any():
+        box = {k: v if k in ("count", "points", "sorted") else np.where(sizes > 0, v, np.nan) for k, v in box.items()}
+    return box
+
+
+def _numeric_blocks(df: pd.DataFrame, columns) -> list[tuple[list, np.ndarray]]:
+    """
+    Splits the columns into blocks of one numpy dtype and at most BLOCK_COLS columns.
+    Extension dtypes (Int64, Float64) become blocks of one column without missing values.
+    """
+    blocks = []
+    by_dtype = {}
+    for col in columns:
+        dtype = df[col].dtype
+        if isinstance(dtype, np.dtype):
+            by_dtype.setdefault(dtype, []).append(col)
+        else:
+            blocks.append(([col], df[col].dropna().to_numpy()[:, None]))
+    for cols in by_dtype.values():
+        for start in range(0, len(cols), BLOCK_COLS):
+            chunk = cols[start : start + BLOCK_COLS]
+            blocks.append((chunk, df[chunk].to_numpy()))
+    return blocks
+
+
+def _summarize_state(state: SummaryState, precision: int = 2, extended: bool = False) -> dict:
+    """Summary dict like _summarize_block() from a streamed state, quartiles and whisker ends are estimates."""
+    cnt, n_total = state.moments.count, state.n_rows
+    if cnt == 0:
+        summary = {
+            "count": n_total,
+            "missings": "0 (0%)",
+            "min": "N/A", "lower": "N/A", "q25": "N/A", "median": "N/A",
+            "mean": "N/A", "q75": "N/A", "upper": "N/A", "max": "N/A",
+            "std": "N/A", "cv": "N/A",
+        }
+        if extended:
+            summary.update({"sum": "N/A", "skew": "N/A", "kurto": "N/A"})
+        return summary
+
+    digest, moments = state.digest, state.moments
+    # * values of int columns stay int, like min/max of an int series
+    as_value = (lambda v: int(round(v)) if not np.isnan(v) else v) if state.kind == "i" else (lambda v: round(v, precision))
+    p25, p50, p75 = digest.quantile([0.25, 0.5, 0.75])
+    q1, q3 = round(p25, precision), round(p75, precision)
+    iqr = p75 - p25
+    mean, std = moments.mean, moments.std
+    cv = std / mean if mean != 0 and std != 0 else np.nan
+    min_val, max_val = as_value(digest.min), as_value(digest.max)
+    lower, upper = as_value(digest.first_above(q1 - 1.5 * iqr)), as_value(digest.last_below(q3 + 1.5 * iqr))
     summary = {
-        # Keep 'count' key: len(df) if not sparse, else non-missing count.
-        "count": original_total_count if not sparse else cnt, 
+        "count": n_total,
+        "missings": f"{cnt:_} ({int(cnt / n_total * 100)}%)",
         "min": min_val,
-        "lower": lower,
+        "lower": min_val if lower < min_val else lower,
         "q25": q1,
-        "median": med,
-        "mean": mean,
+        "median": round(p50, precision),
+        "mean": round(mean, precision),
         "q75": q3,
-        "upper": upper,
+        "upper": max_val if upper > max_val else upper,
         "max": max_val,
-        "std": std,
-        "cv": cv,
+        "std": round(std, precision),
+        "cv": round(cv, precision) if not np.isnan(cv) else "N/A",
     }
+    if extended:
+        summary["sum"] = round(moments.total, precision)
+        summary["skew"] = round(moments.skew, precision)
+        summary["kurto"] = round(moments.kurtosis, precision)
+    return summary
 
-    # Insert present share into the 'missings' key if not sparse
-    if not sparse:
-        new_summary = {"count": summary["count"], "missings": present_share_value}
-        
-        # Add the rest of the keys (starting from 'min')
-        for k, v in summary.items():
-            if k != "count":
-                new_summary[k] = v
-        summary = new_summary
 
+def _relation_chunks(rel: ddb.DuckDBPyRelation, vectors: int = RELATION_CHUNK_VECTORS):
+    """Reads a relation as DataFrames of about `vectors` * 2048 rows, the query runs once."""
+    while not (chunk := rel.fetch_df_chunk(vectors)).empty:
+        yield chunk
 
-    if extended:
-        sum_val = round(ser_cleaned.sum(), precision)
-        skew = round(stats.skew(ser_cleaned.tolist()), precision)
-        kurto = round(stats.kurtosis(ser_cleaned.tolist()), precision)
-        summary["sum"] = sum_val
-        summary["skew"] = skew
-        summary["kurto"] = kurto
 
-    return summary
+def _print_streamed_summary(
+    chunks: Iterable | dict[str, SummaryState], show: bool, precision: int, extended: bool
+) -> dict | None:
+    """print_summary() for chunks or merged summary states."""
+    states = chunks if isinstance(chunks, dict) else summarize_chunks(chunks)
+    if not states:
+        print("❌ Chunks contain no numeric columns for summary calculation.")
+        return
+    name_list = [str(col) for col in states]
+    summary_list = [_summarize_state(state, precision=precision, extended=extended) for state in states.values()]
+    # * summarize_chunks pads every state to all rows, max() also covers states merged by hand
+    total_df_count = max(state.n_rows for state in states.values())
+
+    if show:
+        print(f"🟠 quartiles and whiskers estimated by t-digest (compression {next(iter(states.values())).digest.compression})")
+        if os.getenv("PDF") == "1":
+            display(_build_summary_df(name_list, summary_list, precision, extended, False, total_df_count))
+        else:
+            print(_format_summary_table(name_list, summary_list, precision, extended, False, total_df_count))
+    return summary_list[-1]
 
 
 def _format_summary_table(name_list: list[str], summaries: list[dict], precision: int, extended: bool, sparse: bool, total_df_count: int):
@@ -244,12 +560,13 @@ def _build_summary_df(
 
 
 def print_summary(
-    df: pd.DataFrame | pd.Series,
+    df: pd.DataFrame | pd.Series | ddb.DuckDBPyRelation | Iterable[pd.DataFrame] | dict[str, SummaryState],
     show: bool = True,
     name: str = " ",
     precision: int = 3,
     extended: bool = False,
     sparse: bool = False,
+    workers: int = 1,
 ):
     """
         Print statistical summary for a pandas DataFrame (all numeric columns) or a Series,
@@ -259,8 +576,11 @@ def print_summary(
         max, quartiles) and, optionally, extended statistics (sum, skewness, kurtosis).
 
         Args:
-            df (pd.DataFrame | pd.Series): 
+            df (pd.DataFrame | pd.Series | DuckDBPyRelation | Iterable[pd.DataFrame] | dict[str, SummaryState]): 
                 The input data to summarize. If a DataFrame, only numeric columns are processed.
+                A duckdb relation or an iterator of chunks (e.g. `pd.read_csv(path, chunksize=1_000_000)`)
+                is streamed with bounded memory: counts and moments are exact, quartiles and whisker ends
+                are t-digest estimates. Merged states from `profiler.merge_summaries()` are printed as is.
             show (bool, optional): 
                 If True, prints the generated summary table to the console. Defaults to True.
             name (str, optional):  DEPRECATED
@@ -272,34 +592,51 @@ def print_summary(
                 If True, includes extended statistics like sum, skewness, kurtosis
                 in the summary. Defaults to False.
             sparse (bool, optional): 
-                If True, attempts to convert the input DataFrame into a sparse, wide format
-                using an inferred pivot before calculating the summary. This requires the 
-                external 'get_sparse_df' function to be defined. Defaults to False.
+                If True, summarizes the first numeric column per category of the first non-numeric
+                column, one row per category (same result as a summary of `get_sparse_df(df)`, but
+                computed per group without the pivot). Defaults to False.
+            workers (int, optional):
+                Number of threads to calculate the column statistics on, -1 = one per cpu.
+                Rows are printed in column order regardless. Defaults to 1.
 
         Returns:
             dict | None: A dictionary containing the summary statistics for the last column 
             or Series processed, or None if the input DataFrame is empty or contains no 
             numeric columns.
-        
-        Raises:
-            (Implicit): May raise an error if `sparse=True` and the necessary 'get_sparse_df' 
-            function is not available or fails due to unsuitable DataFrame structure.
-    """
+        """
+    if _is_relation(df):
+        df = _relation_chunks(df)
+    if not isinstance(df, (pd.DataFrame, pd.Series)):
+        if sparse:
+            print("❌ sparse=True needs a DataFrame, chunks cannot be pivoted.")
+            return
+        return _print_streamed_summary(df, show=show, precision=precision, extended=extended)
+
     if df.empty:
         return
     
-    total_df_count = len(df) # Calculate total count before sparse conversion
-    
-    if sparse:
-        df = get_sparse_df(df)
+    total_df_count = len(df)
 
     summary_list = []
     name_list = []
     last_summary = None
 
-    if isinstance(df, pd.Series):
+    if sparse:
+        # * per category, like a summary of get_sparse_df(df) without the pivot
+        grouped = _summarize_groups(df.to_frame() if isinstance(df, pd.Series) else df, precision=precision, extended=extended)
+        if grouped is None:
+            return
+        for name_group, summary in zip(*grouped):
+            if summary:
+                summary_list.append(summary)
+                name_list.append(name_group)
+                last_summary = summary
+
+    elif isinstance(df, pd.Series):
         name_ser = df.name if df.name else "Series"
-        last_summary = _calculate_summary_ser(ser=df, precision=precision, extended=extended, sparse=sparse)
+        frame = df.to_frame()
+        ((_, values),) = _numeric_blocks(frame, frame.columns)
+        (last_summary,) = _summarize_block(values, len(df), precision=precision, extended=extended, sparse=sparse)
         if last_summary:
             summary_list.append(last_summary)
             name_list.append(name_ser)
@@ -310,9 +647,16 @@ def print_summary(
             print("❌ DataFrame contains no numeric columns for summary calculation.")
             return
 
+        # * one sort per block of columns, blocks run on the thread pool
+        blocks = _numeric_blocks(df, numeric_cols)
+        results = _map_ordered(
+            lambda block: _summarize_block(block[1], len(df), precision=precision, extended=extended, sparse=sparse),
+            blocks,
+            workers,
+        )
+        by_col = {col: summary for (cols, _), summaries in zip(blocks, results) for col, summary in zip(cols, summaries)}
         for col_name in numeric_cols:
-            ser = df[col_name]
-            summary = _calculate_summary_ser(ser=ser, precision=precision, extended=extended, sparse=sparse)
+            summary = by_col[col_name]
             if summary:
                 summary_list.append(summary)
                 name_list.append(str(col_name))
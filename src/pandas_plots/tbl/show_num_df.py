@@ -4,7 +4,6 @@ from collections import abc
 from pathlib import Path
 from typing import Literal, Optional, get_args
 
-import dataframe_image as dfi
 import numpy as np
 from IPython.display import Markdown, display
 
@@ -354,6 +353,8 @@ def show_num_df(
         )
 
     if png_path is not None:
+        import dataframe_image as dfi
+
         # * 72dpi default is too low for high res displays
         dfi.export(obj=out, filename=png_path, dpi=150, table_conversion=png_conversion)
 